@@ -32,7 +32,8 @@ class SeriesAbstract:
 
         self.x2y = DataStruct(
             ['x', 'y'], 'x',
-            list(zip(self.x_list, self.y_list))
+            list(zip(self.x_list, self.y_list)),
+            _hash_index=True  # updateValue finds x on every mouse move
         )
         self.color = None if _color is None else QColor(_color)
 
@@ -1,7 +1,7 @@
 import typing
 from datetime import datetime
 
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, TickRecord
 
 
 class EventType:
@@ -138,7 +138,7 @@ class MarketEvent(EventAbstract):
             _market_register_key: str,
             _strategy: str,
             _symbol: str,
-            _data: typing.Union[None, DataStruct] = None
+            _data: typing.Union[None, DataStruct, TickRecord] = None
     ):
         super().__init__()
         self.type = EventType.MARKET
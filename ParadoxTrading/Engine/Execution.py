@@ -5,7 +5,7 @@ import tabulate
 
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import OrderEvent, FillEvent, DirectionType, ActionType
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, TickRecord
 from ParadoxTrading.Utils import Serializable
 
 
@@ -27,7 +27,9 @@ class ExecutionAbstract(Serializable):
     def dealOrderEvent(self, _order_event: OrderEvent):
         raise NotImplementedError('deal not implemented')
 
-    def matchMarket(self, _symbol: str, _data: DataStruct):
+    def matchMarket(
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord]
+    ):
         raise NotImplementedError('matchMarket not implemented')
 
     def addEvent(self, _fill_event: FillEvent):
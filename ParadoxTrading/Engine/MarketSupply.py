@@ -5,11 +5,13 @@ from datetime import datetime
 import ParadoxTrading.Engine
 from ParadoxTrading.Engine.Event import MarketEvent, SettlementEvent
 from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
-from ParadoxTrading.Utils import DataStruct, Serializable
+from ParadoxTrading.Utils import DataStruct, Serializable, TickRecord
 
 
 class ReturnMarket:
-    def __init__(self, _symbol: str, _data: DataStruct):
+    def __init__(
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord]
+    ):
         self.symbol = _symbol
         self.data = _data
 
@@ -72,16 +74,21 @@ class MarketSupplyAbstract(Serializable):
         return ReturnSettlement(_tradingday)
 
     def addMarketEvent(
-            self, _symbol: str, _data: DataStruct
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord],
+            _register_keys: typing.Iterable[str] = None
     ) -> ReturnMarket:
         """
         add new tick data into market register, and add event
 
         :param _symbol:
         :param _data:
+        :param _register_keys: the market registers of data,
+            default all the registers of symbol
         :return:
         """
-        for k in self.symbol_dict[_symbol]:
+        if _register_keys is None:
+            _register_keys = self.symbol_dict[_symbol]
+        for k in _register_keys:
             # add event for each strategy if necessary
             for strategy in self.register_dict[k].strategy_set:
                 self.engine.addEvent(MarketEvent(k, strategy, _symbol, _data))
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from ParadoxTrading.Engine import (MarketSupplyAbstract, ReturnMarket,
                                    ReturnSettlement)
 from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, TickRecord
 
 
 class DataGenerator:
@@ -25,12 +25,18 @@ class DataGenerator:
         fetch data according to market registers,
         and pop tick data by happentime
 
+        the data is kept in streams, by default each symbol is one stream,
+        override _get_stream_key() and _fetch_data() to change it
+
         :param _tradingday: the day to fetch
         :param _register_dict:
         :param _symbol_dict:
         """
         self.data_dict: typing.Dict[str, DataStruct] = {}
         self.index_dict: typing.Dict[str, int] = {}
+        # map stream to its symbol and market registers
+        self.stream_symbol_dict: typing.Dict[str, str] = {}
+        self.stream_register_dict: typing.Dict[str, typing.Set[str]] = {}
         self.datetime: typing.Union[str, datetime] = None
 
         # have to reset it, it is a ref to market supply's dict
@@ -43,14 +49,18 @@ class DataGenerator:
             if symbol is None:
                 continue
 
-            if symbol not in self.data_dict.keys():
+            stream = self._get_stream_key(symbol, k)
+            if stream not in self.data_dict.keys():
                 # fetch data and set index to 0 init
-                data = _fetcher.fetchData(_tradingday, _symbol=symbol)
+                data = self._fetch_data(_fetcher, _tradingday, symbol, k)
                 if data is None:
                     logging.warning('data {} not available'.format(symbol))
                     continue
-                self.data_dict[symbol] = data
-                self.index_dict[symbol] = 0
+                self.data_dict[stream] = data
+                self.index_dict[stream] = 0
+                self.stream_symbol_dict[stream] = symbol
+                self.stream_register_dict[stream] = set()
+            self.stream_register_dict[stream].add(k)
 
             # map symbol to market register key
             try:
@@ -59,11 +69,38 @@ class DataGenerator:
                 _symbol_dict[symbol] = {k}
         logging.debug('Available symbol: {}'.format(_symbol_dict.keys()))
 
-    def gen(self) -> typing.Union[None, typing.Tuple[str, DataStruct]]:
+    def _get_stream_key(self, _symbol: str, _register_key: str) -> str:
+        """
+        the stream of market register's data, the registers in one stream
+        share the data
+
+        :param _symbol:
+        :param _register_key:
+        :return:
+        """
+        return _symbol
+
+    def _fetch_data(
+            self, _fetcher: FetchAbstract, _tradingday: str,
+            _symbol: str, _register_key: str
+    ) -> typing.Union[None, DataStruct]:
+        """
+        fetch the data of one stream
+
+        :param _fetcher:
+        :param _tradingday:
+        :param _symbol:
+        :param _register_key: the first register of stream
+        :return:
+        """
+        return _fetcher.fetchData(_tradingday, _symbol=_symbol)
+
+    def gen(self) -> typing.Union[None, typing.Tuple[str, TickRecord]]:
         """
-        gen one tick data
+        gen one tick data, the tick is a TickRecord,
+        call clone() on it if you need a datastruct
 
-        :return: (symbol, one tick datastruct) or None
+        :return: (stream, one tick record) or None
         """
 
         # get latest one of each symbol
@@ -78,12 +115,12 @@ class DataGenerator:
             # get the latest market data of all
             tmp.sort(key=operator.itemgetter(1))
 
-            symbol = tmp[0][0]
+            stream = tmp[0][0]
 
-            index = self.index_dict[symbol]
-            ret: typing.Tuple[str, DataStruct] = (
-                symbol, self.data_dict[symbol].iloc[index])
-            self.index_dict[symbol] += 1  # point to next one
+            index = self.index_dict[stream]
+            ret: typing.Tuple[str, TickRecord] = (
+                stream, self.data_dict[stream].getRecord(index))
+            self.index_dict[stream] += 1  # point to next one
 
             # set cur datetime to latest tick's happentime
             self.datetime = tmp[0][1]
@@ -119,6 +156,19 @@ class BacktestMarketSupply(MarketSupplyAbstract):
         self.datetime: typing.Union[str, datetime] = None
         self.data_generator: DataGenerator = None
 
+    def _create_data_generator(self) -> DataGenerator:
+        """
+        create the data generator of cur tradingday
+
+        :return:
+        """
+        return DataGenerator(
+            _tradingday=self.tradingday,
+            _register_dict=self.register_dict,
+            _symbol_dict=self.symbol_dict,
+            _fetcher=self.fetcher
+        )
+
     def incDate(self) -> str:
         """
         inc cur date and return
@@ -142,12 +192,7 @@ class BacktestMarketSupply(MarketSupplyAbstract):
             if self.tradingday >= self.end_day:
                 return None
 
-            self.data_generator = DataGenerator(
-                _tradingday=self.tradingday,
-                _register_dict=self.register_dict,
-                _symbol_dict=self.symbol_dict,
-                _fetcher=self.fetcher
-            )
+            self.data_generator = self._create_data_generator()
             if not self.symbol_dict:
                 self.incDate()
                 self.data_generator: DataGenerator = None
@@ -164,7 +209,11 @@ class BacktestMarketSupply(MarketSupplyAbstract):
             return self.addSettlementEvent(tmp_day)
         else:
             self.datetime = self.data_generator.datetime
-            return self.addMarketEvent(*ret)
+            stream, data = ret
+            return self.addMarketEvent(
+                self.data_generator.stream_symbol_dict[stream], data,
+                self.data_generator.stream_register_dict[stream]
+            )
 
     def getTradingDay(self) -> str:
         return self.tradingday
@@ -1,5 +1,7 @@
+import typing
+
 from ParadoxTrading.Engine import ExecutionAbstract, OrderEvent, FillEvent
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, TickRecord
 
 
 class BarBacktestExecution(ExecutionAbstract):
@@ -27,15 +29,17 @@ class BarBacktestExecution(ExecutionAbstract):
         assert _order_event.index not in self.order_dict.keys()
         self.order_dict[_order_event.index] = _order_event
 
-    def matchMarket(self, _symbol: str, _data: DataStruct):
+    def matchMarket(
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord]
+    ):
         assert len(_data) == 1
 
-        time = _data.index()[0]
+        time = _data.getValue(_data.index_name)
 
         for index in sorted(self.order_dict.keys()):
             order = self.order_dict[index]
             if order.symbol == _symbol and time > order.datetime:
-                exec_price: float = _data[self.price_idx][0]
+                exec_price: float = _data.getValue(self.price_idx)
                 comm = self.commission_rate * order.quantity * exec_price
                 self.addEvent(FillEvent(
                     _index=order.index,
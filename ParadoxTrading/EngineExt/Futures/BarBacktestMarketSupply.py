@@ -0,0 +1,163 @@
+import typing
+
+from ParadoxTrading.EngineExt.Futures.BacktestMarketSupply import \
+    BacktestMarketSupply, DataGenerator
+from ParadoxTrading.Fetch import FetchAbstract, RegisterAbstract
+from ParadoxTrading.Fetch.ChineseFutures import BarCache
+from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.Split import BarAggregator, SplitAbstract, \
+    TradingSessions
+
+
+class BarDataGenerator(DataGenerator):
+    """
+    JUST FOR BACKTEST !!!
+    """
+
+    def __init__(
+            self,
+            _tradingday: str,
+            _register_dict: typing.Dict[str, RegisterAbstract],
+            _symbol_dict: typing.Dict[str, typing.Set[str]],
+            _fetcher: FetchAbstract,
+            _spliter_dict: typing.Dict[str, SplitAbstract],
+            _spliter: SplitAbstract = None,
+            _bar_cache: BarCache = None,
+            _sessions: TradingSessions = None
+    ):
+        """
+        split the ticks of market registers into bars, and pop bars
+        by the time of their last tick, so a bar is never sent before
+        the ticks in it. The registers with the same symbol and
+        spliter spec share one stream
+
+        :param _tradingday: the day to fetch
+        :param _register_dict:
+        :param _symbol_dict:
+        :param _fetcher:
+        :param _spliter_dict: map market register's key to its spliter
+        :param _spliter: the spliter of registers not in _spliter_dict
+        :param _bar_cache: get bars from cache, or build them on the fly
+        :param _sessions: trading sessions for time spliters
+        """
+        self.spliter_dict = _spliter_dict
+        self.spliter = _spliter
+        self.bar_cache = _bar_cache
+        self.sessions = _sessions
+
+        super().__init__(
+            _tradingday, _register_dict, _symbol_dict, _fetcher
+        )
+
+    def _get_spliter(self, _register_key: str) -> SplitAbstract:
+        try:
+            return self.spliter_dict[_register_key]
+        except KeyError:
+            assert self.spliter is not None, \
+                'no spliter for {}'.format(_register_key)
+            return self.spliter
+
+    def _get_stream_key(self, _symbol: str, _register_key: str) -> str:
+        return '{}|{}'.format(
+            _symbol, self._get_spliter(_register_key).toJson()
+        )
+
+    def _fetch_data(
+            self, _fetcher: FetchAbstract, _tradingday: str,
+            _symbol: str, _register_key: str
+    ) -> typing.Union[None, DataStruct]:
+        spliter = self._get_spliter(_register_key)
+        if self.bar_cache is not None:
+            bars = self.bar_cache.fetchBars(
+                _tradingday, _symbol, spliter, self.sessions
+            )
+        else:
+            data = _fetcher.fetchData(_tradingday, _symbol=_symbol)
+            if data is None or not len(data):
+                return None
+            bars = BarCache.buildBars(data, spliter, self.sessions)
+        if bars is None:
+            return None
+        return self._index_by_end(bars, spliter)
+
+    @staticmethod
+    def _index_by_end(
+            _bars: DataStruct, _spliter: SplitAbstract
+    ) -> DataStruct:
+        """
+        index bars by the time of their last tick, the begin time of bar
+        is kept as a column
+        """
+        aggregator = _spliter.aggregator
+        if aggregator is None:
+            aggregator = BarAggregator()
+        return DataStruct.fromColumns(
+            {k: _bars[k] for k in _bars.getColumnNames()},
+            aggregator.end_key, _bars.columnar
+        )
+
+
+class BarBacktestMarketSupply(BacktestMarketSupply):
+    def __init__(
+            self: 'BarBacktestMarketSupply',
+            _begin_day: str, _end_day: str,
+            _fetcher: FetchAbstract,
+            _spliter: SplitAbstract = None,
+            _spliter_dict: typing.Dict[str, SplitAbstract] = None,
+            _bar_cache: BarCache = None,
+            _sessions: TradingSessions = None
+    ):
+        """
+        market supply for backtest, which sends one market event for each
+        bar instead of each tick. The bars are OHLCV datastruct decided
+        by the aggregator of spliter (default BarAggregator()). Each bar
+        is sent when it is done: the index of bar is the time of its last
+        tick (end_key of aggregator, eg. 'endtime'), which is also the
+        datetime of engine, and the begin time is a column (idx_key of
+        aggregator, eg. 'time'). Use BarBacktestExecution
+
+        :param _begin_day: begin date of backtest, like '20170123'
+        :param _end_day: end date of backtest, like '20170131'
+        :param _fetcher: fetcher of ticks
+        :param _spliter: the spliter of registers not in _spliter_dict,
+            the bars are built day by day, so not a date spliter
+        :param _spliter_dict: map market register's key (json) to spliter
+        :param _bar_cache: get bars from cache, or build them each time
+        :param _sessions: trading sessions for time spliters
+        """
+        super().__init__(_begin_day, _end_day, _fetcher)
+
+        if _spliter is not None:
+            BarCache.checkSpliter(_spliter)
+        self.spliter: SplitAbstract = _spliter
+        self.spliter_dict: typing.Dict[str, SplitAbstract] = {}
+        if _spliter_dict is not None:
+            for spliter in _spliter_dict.values():
+                BarCache.checkSpliter(spliter)
+            self.spliter_dict.update(_spliter_dict)
+        self.bar_cache: BarCache = _bar_cache
+        self.sessions: TradingSessions = _sessions
+
+    def setSpliter(
+            self, _register_key: str, _spliter: SplitAbstract
+    ):
+        """
+        set the spliter of one market register
+
+        :param _register_key: the json of market register
+        :param _spliter: not a date spliter
+        """
+        BarCache.checkSpliter(_spliter)
+        self.spliter_dict[_register_key] = _spliter
+
+    def _create_data_generator(self) -> BarDataGenerator:
+        return BarDataGenerator(
+            _tradingday=self.tradingday,
+            _register_dict=self.register_dict,
+            _symbol_dict=self.symbol_dict,
+            _fetcher=self.fetcher,
+            _spliter_dict=self.spliter_dict,
+            _spliter=self.spliter,
+            _bar_cache=self.bar_cache,
+            _sessions=self.sessions
+        )
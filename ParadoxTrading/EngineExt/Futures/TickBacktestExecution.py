@@ -1,6 +1,8 @@
+import typing
+
 from ParadoxTrading.Engine import (DirectionType, ExecutionAbstract, FillEvent,
                                    OrderEvent, OrderType)
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, TickRecord
 
 
 class TickBacktestExecution(ExecutionAbstract):
@@ -37,11 +39,13 @@ class TickBacktestExecution(ExecutionAbstract):
             _commission=self.commission_rate * _order_event.quantity * _price
         )
 
-    def matchMarket(self, _symbol: str, _data: DataStruct):
+    def matchMarket(
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord]
+    ):
         assert len(_data) == 1
 
-        askprice: float = _data[self.askprice_idx][0]
-        bidprice: float = _data[self.bidprice_idx][0]
+        askprice: float = _data.getValue(self.askprice_idx)
+        bidprice: float = _data.getValue(self.bidprice_idx)
 
         for index in sorted(self.order_dict.keys()):
             order = self.order_dict[index]
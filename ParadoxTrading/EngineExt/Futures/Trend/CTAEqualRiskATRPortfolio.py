@@ -4,7 +4,7 @@ import typing
 from ParadoxTrading.EngineExt.Futures.InterDayPortfolio import POINT_VALUE, \
     InterDayPortfolio, InstrumentMgr
 from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase
-from ParadoxTrading.Indicator import ATR
+from ParadoxTrading.Indicator import ATR, IndicatorGraph
 from ParadoxTrading.Utils import DataStruct
 
 
@@ -19,7 +19,8 @@ class CTAEqualRiskATRPortfolio(InterDayPortfolio):
             _atr_period: int = 50,
             _leverage_limit: int = 3,
             _simulate_product_index: bool = False,
-            _settlement_price_index: str = 'closeprice'
+            _settlement_price_index: str = 'closeprice',
+            _graph: IndicatorGraph = None
     ):
         super().__init__(
             _fetcher, _init_fund, _margin_rate,
@@ -33,11 +34,25 @@ class CTAEqualRiskATRPortfolio(InterDayPortfolio):
         self.adjust_count = 0
         self.atr_period = _atr_period
         self.atr_table: typing.Dict[str, ATR] = {}
+        # share ATR with the strategies if graph is set
+        self.graph = _graph
 
         self.leverage_limit = _leverage_limit
 
         self.addPickleKey('adjust_count', 'atr_table')
 
+    def load_state_dict(
+            self, _state_dict: typing.Dict[str, typing.Any]
+    ):
+        super().load_state_dict(_state_dict)
+        if self.graph is not None:
+            # the graph is not pickled, put the loaded ATR back into it,
+            # otherwise they are never updated
+            for symbol, atr in self.atr_table.items():
+                self.atr_table[symbol] = self.graph.restore(
+                    symbol, atr, self.atr_period
+                )
+
     def _get_dict(
             self, _i_mgr: InstrumentMgr,
             _tradingday: str, _part_risk_alloc: float,
@@ -133,6 +148,13 @@ class CTAEqualRiskATRPortfolio(InterDayPortfolio):
                     i_mgr.next_instrument_dict = i_mgr.cur_instrument_dict
 
     def dealMarket(self, _symbol: str, _data: DataStruct):
+        if self.graph is not None:
+            if _symbol not in self.atr_table:
+                self.atr_table[_symbol] = self.graph.get(
+                    _symbol, ATR, self.atr_period
+                )
+            self.graph.addOne(_symbol, _data)
+            return
         try:
             self.atr_table[_symbol].addOne(_data)
         except KeyError:
@@ -1,5 +1,6 @@
 import math
 import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
 
 from ParadoxTrading.EngineExt.Futures.InterDayPortfolio import POINT_VALUE, \
     InterDayPortfolio, InstrumentMgr
@@ -21,7 +22,11 @@ class CTAEqualRiskGARCHPortfolio(InterDayPortfolio):
             _smooth_period: int = 3,
             _leverage_limit: int = 3,
             _simulate_product_index: bool = False,
-            _settlement_price_index: str = 'closeprice'
+            _settlement_price_index: str = 'closeprice',
+            _fit_window: int = None,
+            _warm_start: bool = True,
+            _fit_workers: int = 0,
+            _executor: Executor = None
     ):
         super().__init__(
             _fetcher, _init_fund, _margin_rate,
@@ -36,12 +41,42 @@ class CTAEqualRiskGARCHPortfolio(InterDayPortfolio):
         self.fit_period = _fit_period
         self.fit_begin = _fit_begin
         self.smooth_period = _smooth_period
+        self.fit_window = _fit_window
+        self.warm_start = _warm_start
+        # fit GARCH of all products in the process pool if workers > 0,
+        # which is shut down by close(), or in _executor owned by caller
+        assert _executor is None or _fit_workers == 0
+        self.executor: Executor = _executor
+        self.own_executor = False
+        if _fit_workers > 0:
+            self.executor = ProcessPoolExecutor(_fit_workers)
+            self.own_executor = True
         self.GARCH_dict: typing.Dict[str, GARCH] = {}
 
         self.leverage_limit = _leverage_limit
 
         self.addPickleKey('adjust_count', 'GARCH_dict')
 
+    def load_state_dict(
+            self, _state_dict: typing.Dict[str, typing.Any]
+    ):
+        super().load_state_dict(_state_dict)
+        # the executor is not pickled with GARCH
+        for garch in self.GARCH_dict.values():
+            garch.setExecutor(self.executor)
+
+    def close(self):
+        """
+        shut down the process pool of _fit_workers, call it when
+        the backtest is done
+        """
+        if self.own_executor:
+            self.executor.shutdown()
+            self.executor = None
+            self.own_executor = False
+            for garch in self.GARCH_dict.values():
+                garch.setExecutor(None)
+
     def _get_dict(
             self, _i_mgr: InstrumentMgr,
             _tradingday: str, _part_fund_alloc: float,
@@ -159,5 +194,8 @@ class CTAEqualRiskGARCHPortfolio(InterDayPortfolio):
                 _fit_begin=self.fit_begin,
                 _factor=252,
                 _smooth_period=self.smooth_period,
+                _fit_window=self.fit_window,
+                _warm_start=self.warm_start,
+                _executor=self.executor,
             )
             self.GARCH_dict[_symbol].addOne(_data)
@@ -3,6 +3,7 @@ from .Arbitrage import ArbitrageEqualFundSimplePortfolio, \
 from .BacktestEngine import BacktestEngine
 from .BacktestMarketSupply import BacktestMarketSupply
 from .BarBacktestExecution import BarBacktestExecution
+from .BarBacktestMarketSupply import BarBacktestMarketSupply
 from .BarPortfolio import BarPortfolio
 from .InterDayBacktestExecution import InterDayBacktestExecution
 from .InterDayOnlineEngine import InterDayOnlineEngine
@@ -0,0 +1,217 @@
+import hashlib
+import typing
+
+from diskcache import Cache
+
+from ParadoxTrading.Fetch.ChineseFutures.FetchBase import FetchBase
+from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.DataStructIO import hashColumns
+from ParadoxTrading.Utils.Split import SplitAbstract, SplitDateAbstract, \
+    SplitTimeAbstract, TradingSessions
+
+
+class BarCache:
+    def __init__(
+            self, _fetcher: FetchBase, _cache: Cache = None
+    ):
+        """
+        materialize the bars of tick days once, and keep them in a
+        persistent cache keyed by (fetcher, symbol, tradingday, spliter
+        spec). The bars of each day are built by buildBars(), which does
+        not touch the spliter and begins from the state of a new one,
+        so they do not depend on the days before.
+
+        Each entry keeps the fingerprint of ticks it was built from,
+        fetchBars(_check=True) fetches the ticks from database (not cache)
+        and rebuilds the bars if the ticks changed, and invalidate() drops
+        all the bars of one day.
+
+        :param _fetcher: fetcher of ticks, like FetchInstrumentTickData
+        :param _cache: default the cache of fetcher
+        """
+        self.fetcher: FetchBase = _fetcher
+        if _cache is None:
+            _cache = _fetcher.cache
+        self.cache: Cache = _cache
+
+        self.bar_key: str = 'Bar_{}_{}_{}_{}'
+        # the specs cached for one day, to invalidate them
+        self.spec_key: str = 'BarSpec_{}_{}_{}'
+
+    def _get_fetcher_name(self) -> str:
+        return '{}.{}'.format(
+            self.fetcher.__class__.__name__, self.fetcher.psql_dbname
+        )
+
+    @staticmethod
+    def _get_spec(
+            _spliter: SplitAbstract, _sessions: TradingSessions = None
+    ) -> str:
+        spec = _spliter.toJson()
+        if _sessions is not None:
+            spec = '{}|{}'.format(spec, _sessions.getSpec())
+        return hashlib.md5(spec.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def fingerprint(_data: typing.Union[None, DataStruct]) -> str:
+        """
+        the fingerprint of tick day, the md5 of all values, so a tick
+        corrected in the middle of day is found too
+
+        :param _data:
+        :return:
+        """
+        if _data is None or not len(_data):
+            return repr(None)
+        return hashColumns(_data.data, _data.index_name)
+
+    @staticmethod
+    def checkSpliter(_spliter: SplitAbstract):
+        """
+        the bars are built day by day, so the date spliters, whose bars
+        cover many days, are not supported
+
+        :param _spliter:
+        """
+        if isinstance(_spliter, SplitDateAbstract):
+            raise Exception(
+                '{} can not build bars of one tick day'.format(
+                    _spliter.__class__.__name__
+                )
+            )
+
+    @staticmethod
+    def buildBars(
+            _data: DataStruct, _spliter: SplitAbstract,
+            _sessions: TradingSessions = None
+    ) -> DataStruct:
+        """
+        build the bars of one day by _spliter, without cache
+
+        :param _data: ticks
+        :param _spliter: not a date spliter
+        :param _sessions: trading sessions for time spliters
+        :return:
+        """
+        BarCache.checkSpliter(_spliter)
+        if isinstance(_spliter, SplitTimeAbstract):
+            return _spliter.buildBars(_data, _sessions)
+        assert _sessions is None
+        return _spliter.buildBars(_data)
+
+    def fetchManyBars(
+            self, _tradingday: str, _symbol: str,
+            _spliter_list: typing.Sequence[SplitAbstract],
+            _sessions: TradingSessions = None,
+            _check: bool = False
+    ) -> typing.List[typing.Union[None, DataStruct]]:
+        """
+        get the bars of several spliters on one day, the ticks are
+        fetched at most once
+
+        :param _tradingday:
+        :param _symbol:
+        :param _spliter_list: spliters, not date spliters
+        :param _sessions: trading sessions for time spliters
+        :param _check: compare the fingerprint with the ticks in database,
+            and refresh the ticks cached by fetcher if they changed
+        :return: the bars of each spliter, None if no tick
+        """
+        for spliter in _spliter_list:
+            self.checkSpliter(spliter)
+
+        symbol = _symbol.lower()
+        fetcher_name = self._get_fetcher_name()
+        spec_key = self.spec_key.format(fetcher_name, symbol, _tradingday)
+
+        data = None
+        fetched = False
+        if _check:
+            data = self.fetcher.fetchData(
+                _tradingday, _symbol, _cache=False
+            )
+            fetched = True
+        fingerprint = self.fingerprint(data)
+
+        ret = []
+        refreshed = False
+        for spliter in _spliter_list:
+            spec = self._get_spec(spliter, _sessions)
+            key = self.bar_key.format(
+                fetcher_name, symbol, _tradingday, spec
+            )
+            try:
+                cached_fingerprint, bars = self.cache[key]
+                if not _check or cached_fingerprint == fingerprint:
+                    ret.append(bars)
+                    continue
+                if not refreshed:
+                    # the ticks changed, so are the ticks cached by fetcher,
+                    # the ones cached in the other mode are dropped
+                    self.fetcher.cache[self.fetcher.getMarketKey(
+                        _tradingday, symbol
+                    )] = data
+                    self.fetcher.cache.delete(self.fetcher.getMarketKey(
+                        _tradingday, symbol, not self.fetcher.columnar
+                    ))
+                    refreshed = True
+            except KeyError:
+                pass
+
+            if not fetched:
+                data = self.fetcher.fetchData(_tradingday, _symbol)
+                fetched = True
+                fingerprint = self.fingerprint(data)
+            bars = None
+            if data is not None and len(data):
+                bars = self.buildBars(data, spliter, _sessions)
+            self.cache[key] = (fingerprint, bars)
+
+            spec_set = self.cache.get(spec_key, set())
+            if spec not in spec_set:
+                spec_set.add(spec)
+                self.cache[spec_key] = spec_set
+            ret.append(bars)
+        return ret
+
+    def fetchBars(
+            self, _tradingday: str, _symbol: str,
+            _spliter: SplitAbstract,
+            _sessions: TradingSessions = None,
+            _check: bool = False
+    ) -> typing.Union[None, DataStruct]:
+        """
+        get the bars of one day, build and cache them if not cached
+
+        :param _tradingday:
+        :param _symbol:
+        :param _spliter: spliter with buildBars()
+        :param _sessions: trading sessions for time spliters
+        :param _check: compare the fingerprint with the ticks in database
+        :return: None if no tick
+        """
+        return self.fetchManyBars(
+            _tradingday, _symbol, [_spliter], _sessions, _check
+        )[0]
+
+    def invalidate(self, _tradingday: str, _symbol: str):
+        """
+        drop all the bars of one day, and the cached ticks of fetcher,
+        call it when the ticks of day are changed
+
+        :param _tradingday:
+        :param _symbol:
+        """
+        symbol = _symbol.lower()
+        fetcher_name = self._get_fetcher_name()
+        spec_key = self.spec_key.format(fetcher_name, symbol, _tradingday)
+        for spec in self.cache.get(spec_key, set()):
+            self.cache.delete(self.bar_key.format(
+                fetcher_name, symbol, _tradingday, spec
+            ))
+        self.cache.delete(spec_key)
+
+        for columnar in (False, True):
+            self.fetcher.cache.delete(
+                self.fetcher.getMarketKey(_tradingday, symbol, columnar)
+            )
@@ -135,6 +135,8 @@ class FetchBase(FetchAbstract):
         self._psql_cur: psycopg2.extensions.cursor = None
 
         self.columns: typing.List = []
+        # store fetched data in columnar DataStruct
+        self.columnar: bool = False
 
     def _get_mongo_db(self) -> pymongo.database.Database:
         if not self._mongo_db:
@@ -339,6 +341,24 @@ class FetchBase(FetchAbstract):
             self.cache[key] = data
             return data
 
+    def fetchTradingDayList(
+            self, _begin_day: str, _end_day: str = None
+    ) -> typing.List[str]:
+        """
+        get sorted tradingdays in [_begin_day, _end_day), can be used by
+        TradingDayBucket to split by trading calendar
+        """
+        cond = {'$gte': _begin_day}
+        if _end_day is not None:
+            cond['$lt'] = _end_day
+        db = self._get_mongo_db()
+        coll = db.tradingday
+        return [d['TradingDay'] for d in coll.find(
+            filter={'TradingDay': cond},
+            projection={'_id': False, 'TradingDay': True},
+            sort=[('TradingDay', pymongo.ASCENDING)]
+        )]
+
     def fetchProductInfo(
             self, _product: str, _tradingday: str
     ) -> typing.Union[None, typing.Dict]:
@@ -464,6 +484,24 @@ class FetchBase(FetchAbstract):
         else:
             raise Exception('unknown type')
 
+    def getMarketKey(
+            self, _tradingday: str, _symbol: str, _columnar: bool = None
+    ) -> str:
+        """
+        cache key of the data of one day, the list and the columnar
+        datastructs are cached apart, so a cached day is returned in the
+        mode of self.columnar
+
+        :param _tradingday:
+        :param _symbol:
+        :param _columnar: the mode of datastruct, default self.columnar
+        :return:
+        """
+        if _columnar is None:
+            _columnar = self.columnar
+        key = self.market_key.format(_symbol.lower(), _tradingday)
+        return key + '_columnar' if _columnar else key
+
     def fetchData(
             self, _tradingday: str, _symbol: str,
             _cache=True, _index='HappenTime'
@@ -479,7 +517,7 @@ class FetchBase(FetchAbstract):
         assert isinstance(_symbol, str)
         symbol = _symbol.lower()
 
-        key = self.market_key.format(symbol, _tradingday)
+        key = self.getMarketKey(_tradingday, symbol)
         if _cache:
             try:
                 return self.cache[key]
@@ -497,7 +535,10 @@ class FetchBase(FetchAbstract):
         )
         data = list(cur.fetchall())
         if len(data):
-            data = DataStruct(self.columns, _index.lower(), data)
+            # already sorted by ORDER BY
+            data = DataStruct.fromSortedRows(
+                data, self.columns, _index.lower(), self.columnar
+            )
         else:
             data = None
 
@@ -527,4 +568,50 @@ class FetchBase(FetchAbstract):
         cur.execute(query)
         data = list(cur.fetchall())
 
-        return DataStruct(self.columns, _index.lower(), data)
+        return DataStruct.fromSortedRows(
+            data, self.columns, _index.lower(), self.columnar
+        )
+
+    def iterDayData(
+            self, _begin_day: str, _end_day: str,
+            _symbol: str, _index: str = 'HappenTime',
+            _chunk_size: int = 100000
+    ) -> typing.Iterator[DataStruct]:
+        """
+        like fetchDayData, but the data is read by a server side cursor,
+        and returned chunk by chunk, so the whole range is never in memory
+
+        :param _begin_day:
+        :param _end_day: excluded
+        :param _symbol:
+        :param _index:
+        :param _chunk_size: rows of each chunk
+        :return: iterator of datastruct
+        """
+        begin_day = _begin_day
+        end_day = _end_day
+        if _end_day is None:
+            end_day = begin_day
+
+        con, _ = self._get_psql_con_cur()
+
+        query = "SELECT * FROM {} " \
+                "WHERE tradingday >= '{}' AND tradingday < '{}' " \
+                "ORDER BY {}".format(
+            _symbol.lower(), begin_day, end_day, _index.lower()
+        )
+        # named cursor is a server side cursor
+        cur = con.cursor(name='iter_{}_{}'.format(_symbol.lower(), id(self)))
+        cur.itersize = _chunk_size
+        try:
+            cur.execute(query)
+            while True:
+                data = cur.fetchmany(_chunk_size)
+                if not data:
+                    break
+                yield DataStruct.fromSortedRows(
+                    data, self.columns, _index.lower(), self.columnar
+                )
+        finally:
+            cur.close()
+            con.commit()  # end the transaction of server side cursor
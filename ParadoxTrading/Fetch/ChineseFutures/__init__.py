@@ -1,3 +1,4 @@
+from .BarCache import BarCache
 from .FetchBase import RegisterInstrument, RegisterIndex
 from .FetchDominantIndex import FetchDominantIndex
 from .FetchInstrumentDayData import FetchInstrumentDayData
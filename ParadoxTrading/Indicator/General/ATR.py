@@ -1,5 +1,8 @@
+import numpy as np
+
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
 from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.Rolling import emaCoef, emaFilter
 
 
 class ATR(IndicatorAbstract):
@@ -24,10 +27,19 @@ class ATR(IndicatorAbstract):
         )
 
         self.period = _period
+        self.coef = emaCoef(self.period)
 
         self.last_atr = None
         self.last_close_price = None
 
+    def _step(self, _tr_value: float) -> float:
+        if self.last_atr is None:
+            self.last_atr = _tr_value
+        else:
+            self.last_atr = self.coef[0] * _tr_value + \
+                self.coef[1] * self.last_atr
+        return self.last_atr
+
     def _addOne(self, _data_struct: DataStruct):
         if self.last_close_price is not None:
             index_value = _data_struct.index()[0]
@@ -36,12 +48,29 @@ class ATR(IndicatorAbstract):
             ) - min(
                 _data_struct[self.low_key][0], self.last_close_price
             )
-            if self.last_atr is None:
-                self.last_atr = tr_value
-            else:
-                self.last_atr = (tr_value - self.last_atr) / self.period + self.last_atr
             self.data.addDict({
                 self.idx_key: index_value,
-                self.ret_key: self.last_atr,
+                self.ret_key: self._step(tr_value),
             })
         self.last_close_price = _data_struct[self.close_key][0]
+
+    def _compute(self, _data: DataStruct):
+        index = self._get_values(_data, _data.index_name)
+        high = self._get_array(_data, self.high_key)
+        low = self._get_array(_data, self.low_key)
+        close = self._get_array(_data, self.close_key)
+        if self.last_close_price is None:
+            # the first bar has no tr
+            index, high, low = index[1:], high[1:], low[1:]
+            last_close = close[:-1]
+        else:
+            last_close = np.concatenate(([self.last_close_price], close[:-1]))
+        tr = np.maximum(high, last_close) - np.minimum(low, last_close)
+        if len(tr):
+            atr = emaFilter(tr, self.period, self.last_atr)
+            self.last_atr = atr[-1].item()
+            self._add_columns({
+                self.idx_key: index,
+                self.ret_key: atr.tolist(),
+            })
+        self.last_close_price = self._get_values(_data, self.close_key)[-1]
@@ -23,6 +23,8 @@ class AdaBBands(IndicatorAbstract):
         self.period = _period
         self.rate = _rate
         self.buf = []
+        # rows added, not len(self.data), which is bounded by setHistory()
+        self.count = 0
 
         self.prev_std = None
 
@@ -33,8 +35,10 @@ class AdaBBands(IndicatorAbstract):
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
         self.buf.append(_data_struct.getColumn(self.use_key)[0])
+        if len(self.buf) > max(self.period + 1, self.max_n):
+            del self.buf[0]
 
-        if len(self.data) > self.period:
+        if self.count > self.period:
             const_std = statistics.pstdev(self.buf[-self.period:])
             self.dynamic_n *= const_std / self.prev_std
             self.dynamic_n = max(self.min_n, self.dynamic_n)
@@ -52,10 +56,12 @@ class AdaBBands(IndicatorAbstract):
 
             self.prev_std = const_std
         else:
-            if len(self.data) == self.period:
+            if self.count == self.period:
                 self.prev_std = statistics.pstdev(self.buf)
 
             self.data.addRow(
                 [index_value, None, None, None],
                 self.keys
             )
+
+        self.count += 1
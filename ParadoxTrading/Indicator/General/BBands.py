@@ -1,8 +1,9 @@
-import statistics
-from collections import deque
+import typing
+
+import numpy as np
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class BBands(IndicatorAbstract):
@@ -23,13 +24,25 @@ class BBands(IndicatorAbstract):
 
         self.period = _period
         self.rate = _rate
-        self.buf = deque(maxlen=self.period)
+        self.acc = SumAccumulator(self.period)
+
+    def _step(self, _value: float) -> typing.Tuple[float, float, float]:
+        self.acc.add(_value)
+        mean = self.acc.getMean()
+        std = self.acc.getStd()
+        return mean + self.rate * std, mean, mean - self.rate * std
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        self.buf.append(_data_struct.getColumn(self.use_key)[0])
-        mean = statistics.mean(self.buf)
-        std = statistics.pstdev(self.buf, mu=mean)
-        self.data.addRow([
-            index_value, mean + self.rate * std, mean, mean - self.rate * std
-        ], self.keys)
+        self.data.addRow([index_value] + list(self._step(
+            _data_struct.getColumn(self.use_key)[0]
+        )), self.keys)
+
+    def _compute(self, _data: DataStruct):
+        mean, var = self.acc.rolling(self._get_values(_data, self.use_key))
+        std = np.sqrt(var)
+        rets = (mean + self.rate * std, mean, mean - self.rate * std)
+        columns = {self.keys[0]: self._get_values(_data, _data.index_name)}
+        for k, v in zip(self.keys[1:], rets):
+            columns[k] = v.tolist()
+        self._add_columns(columns)
@@ -1,8 +1,5 @@
-import statistics
-from collections import deque
-
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class BIAS(IndicatorAbstract):
@@ -25,14 +22,13 @@ class BIAS(IndicatorAbstract):
         )
 
         self.period = _period
-        self.buf = deque(maxlen=self.period)
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
         price = _data_struct[self.use_key][0]
 
-        self.buf.append(price)
-        price_mean = statistics.mean(self.buf)
+        price_mean = self.acc.add(price).getMean()
 
         self.data.addDict({
             self.idx_key: index_value,
@@ -1,8 +1,7 @@
-import statistics
-from collections import deque
+import numpy as np
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class CCI(IndicatorAbstract):
@@ -32,26 +31,50 @@ class CCI(IndicatorAbstract):
 
         self.period = _period
         self.constant = _constant
-        self.tp_buf = deque(maxlen=self.period)
-        self.dev_buf = deque(maxlen=self.period)
+        self.tp_acc = SumAccumulator(self.period)
+        self.dev_acc = SumAccumulator(self.period)
 
-    def _addOne(self, _data_struct: DataStruct):
-        index_value = _data_struct.index()[0]
-        close_price = _data_struct[self.close_key][0]
-        high_price = _data_struct[self.high_key][0]
-        low_price = _data_struct[self.low_key][0]
-
-        tp = (close_price + high_price + low_price) / 3
-        if len(self.tp_buf) == 0:
-            dev = high_price - low_price
+    def _step(
+            self, _close_price: float, _high_price: float, _low_price: float
+    ) -> float:
+        tp = (_close_price + _high_price + _low_price) / 3
+        if len(self.tp_acc) == 0:
+            dev = _high_price - _low_price
         else:
-            dev = abs(tp - self.tp_buf[-1])
-        self.tp_buf.append(tp)
-        self.dev_buf.append(dev)
+            dev = abs(tp - self.tp_acc.buf[-1])
+        self.tp_acc.add(tp)
+        self.dev_acc.add(dev)
 
+        return (tp - self.tp_acc.getMean()) / (
+            self.constant * self.dev_acc.getMean()
+        )
+
+    def _addOne(self, _data_struct: DataStruct):
+        index_value = _data_struct.index()[0]
         self.data.addDict({
             self.idx_key: index_value,
-            self.ret_key: (tp - statistics.mean(self.tp_buf)) / (
-                self.constant * statistics.mean(self.dev_buf)
+            self.ret_key: self._step(
+                _data_struct[self.close_key][0],
+                _data_struct[self.high_key][0],
+                _data_struct[self.low_key][0]
             ),
         })
+
+    def _compute(self, _data: DataStruct):
+        high = self._get_array(_data, self.high_key)
+        low = self._get_array(_data, self.low_key)
+        tp = (self._get_array(_data, self.close_key) + high + low) / 3
+        if len(self.tp_acc) == 0:
+            dev = np.abs(np.diff(tp, prepend=tp[0]))
+            dev[0] = high[0] - low[0]
+        else:
+            dev = np.abs(np.diff(tp, prepend=self.tp_acc.buf[-1]))
+
+        tp_mean, _ = self.tp_acc.rolling(tp)
+        dev_mean, _ = self.dev_acc.rolling(dev)
+        self._add_columns({
+            self.idx_key: self._get_values(_data, _data.index_name),
+            self.ret_key: (
+                (tp - tp_mean) / (self.constant * dev_mean)
+            ).tolist(),
+        })
@@ -1,5 +1,6 @@
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
 from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.Rolling import emaCoef, emaFilter
 
 
 class EMA(IndicatorAbstract):
@@ -18,14 +19,29 @@ class EMA(IndicatorAbstract):
         )
 
         self.period = _period
+        self.coef = emaCoef(self.period)
+        self.last_value = None
+
+    def _step(self, _value: float) -> float:
+        if self.last_value is not None:
+            _value = self.coef[0] * _value + self.coef[1] * self.last_value
+        self.last_value = _value
+        return _value
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        tmp_value = _data_struct[self.use_key][0]
-        if len(self) > 0:
-            last_ret = self.getLastData().toDict()[self.ret_key]
-            tmp_value = (tmp_value - last_ret) / self.period + last_ret
         self.data.addDict({
             self.idx_key: index_value,
-            self.ret_key: tmp_value,
+            self.ret_key: self._step(_data_struct[self.use_key][0]),
+        })
+
+    def _compute(self, _data: DataStruct):
+        ema = emaFilter(
+            self._get_values(_data, self.use_key),
+            self.period, self.last_value
+        )
+        self.last_value = ema[-1].item()
+        self._add_columns({
+            self.idx_key: self._get_values(_data, _data.index_name),
+            self.ret_key: ema.tolist(),
         })
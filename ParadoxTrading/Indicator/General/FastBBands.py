@@ -1,7 +1,6 @@
 import math
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
-from collections import deque
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class FastBBands(IndicatorAbstract):
@@ -24,32 +23,21 @@ class FastBBands(IndicatorAbstract):
         self.period = _period
         self.rate = _rate
         self.ignore_mean = _ignore_mean
-        self.buf = deque(maxlen=self.period)
-
-        self.mean = 0.0
-        self.sum_of_pow = 0.0
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         value = _data_struct[self.use_key][0]
         index = _data_struct.index()[0]
-        if len(self.buf) >= self.period:
-            last_value = self.buf.popleft()
-            self.buf.append(value)
-            self.sum_of_pow += value ** 2
-            self.sum_of_pow -= last_value ** 2
-            if not self.ignore_mean:
-                self.mean += (value - last_value) / self.period
-        else:
-            n = len(self.buf)
-            self.buf.append(value)
-            self.sum_of_pow += value ** 2
-            if not self.ignore_mean:
-                self.mean = (self.mean * n + value) / len(self.buf)
-
-        std = math.sqrt(
-            self.sum_of_pow / len(self.buf) - self.mean ** 2
-        )
+        self.acc.add(value)
+        mean = self.acc.getMean()
+        var = self.acc.getVar()
+        if self.ignore_mean:
+            # the mean of squares, deviations are from 0
+            var += mean ** 2
+            mean = 0.0
+
+        std = math.sqrt(var)
         self.data.addRow([
-            index, self.mean + self.rate * std,
-            self.mean, self.mean - self.rate * std
+            index, mean + self.rate * std,
+            mean, mean - self.rate * std
         ], self.keys)
@@ -1,7 +1,5 @@
-from collections import deque
-
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class FastMA(IndicatorAbstract):
@@ -24,22 +22,12 @@ class FastMA(IndicatorAbstract):
         )
 
         self.period = _period
-        self.buf = deque(maxlen=self.period)
-        self.mean = 0.0
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         index = _data_struct.index()[0]
         value = _data_struct[self.use_key][0]
-        if len(self.buf) >= self.period:
-            last_value = self.buf.popleft()
-            self.buf.append(value)
-            self.mean += (value - last_value) / self.period
-        else:
-            n = len(self.buf)
-            self.buf.append(value)
-            self.mean = (self.mean * n + value) / len(self.buf)
-
         self.data.addDict({
             self.idx_key: index,
-            self.ret_key: self.mean,
+            self.ret_key: self.acc.add(value).getMean(),
         })
@@ -1,8 +1,7 @@
 import math
-from collections import deque
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class FastSTD(IndicatorAbstract):
@@ -21,33 +20,19 @@ class FastSTD(IndicatorAbstract):
             self.idx_key
         )
 
-        self.sum_of_pow = 0.0
-        self.mean = 0.0
-
         self.period = _period
         self.ignore_mean = _ignore_mean
-        self.buf = deque(maxlen=self.period)
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         value = _data_struct[self.use_key][0]
         index = _data_struct.index()[0]
-        if len(self.buf) >= self.period:
-            last_value = self.buf.popleft()
-            self.buf.append(value)
-            self.sum_of_pow += value ** 2
-            self.sum_of_pow -= last_value ** 2
-            if not self.ignore_mean:
-                self.mean += (value - last_value) / self.period
-        else:
-            n = len(self.buf)
-            self.buf.append(value)
-            self.sum_of_pow += value ** 2
-            if not self.ignore_mean:
-                self.mean = (self.mean * n + value) / len(self.buf)
+        var = self.acc.add(value).getVar()
+        if self.ignore_mean:
+            # the mean of squares, deviations are from 0
+            var += self.acc.getMean() ** 2
 
         self.data.addDict({
             self.idx_key: index,
-            self.ret_key: math.sqrt(
-                self.sum_of_pow / len(self.buf) - self.mean ** 2
-            )
+            self.ret_key: math.sqrt(var)
         })
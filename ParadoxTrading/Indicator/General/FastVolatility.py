@@ -1,8 +1,7 @@
 import math
-from collections import deque
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class FastVolatility(IndicatorAbstract):
@@ -29,9 +28,7 @@ class FastVolatility(IndicatorAbstract):
         self.factor = math.sqrt(_factor)
         self.smooth = _smooth
 
-        self.buf = deque(maxlen=self.period)
-        self.mean = 0.0
-        self.sum_of_pow = 0.0
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
@@ -39,20 +36,7 @@ class FastVolatility(IndicatorAbstract):
         if self.last_price is not None:
             chg_rate = price_value / self.last_price - 1
 
-            if len(self.buf) >= self.period:
-                last_value = self.buf.popleft()
-                self.buf.append(chg_rate)
-                self.sum_of_pow += chg_rate ** 2
-                self.sum_of_pow -= last_value ** 2
-                self.mean += (chg_rate - last_value) / self.period
-            else:
-                n = len(self.buf)
-                self.buf.append(chg_rate)
-                self.sum_of_pow += chg_rate ** 2
-                self.mean = (self.mean * n + chg_rate) / len(self.buf)
-
-            var = self.sum_of_pow / len(self.buf) - self.mean ** 2
-            std_value = math.sqrt(max(0.0, var)) * self.factor
+            std_value = self.acc.add(chg_rate).getStd() * self.factor
             if self.smooth > 1 and len(self.data):
                 last_std_value = self.data[self.ret_key][-1]
                 std_value = (
@@ -1,5 +1,7 @@
 import math
 import typing
+from collections import deque
+from concurrent.futures import Executor, Future
 
 import numpy as np
 from arch import arch_model
@@ -7,8 +9,51 @@ from arch import arch_model
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
 from ParadoxTrading.Utils import DataStruct
 
+# returns are scaled before fitting, the optimizer of arch
+# hardly moves on the raw daily returns
+_SCALE = 100.0
+
+
+def _fit_garch(
+        _rates: np.ndarray, _starting_values: np.ndarray = None
+) -> typing.Tuple[np.ndarray, float]:
+    """
+    fit garch(1, 1) without mean on _rates, it is a module function,
+    so it can be sent to a process pool
+
+    :param _rates: log returns
+    :param _starting_values: (omega, alpha, beta) of raw returns
+    :return: (omega, alpha, beta) of raw returns,
+        and the conditional variance of the last return
+    """
+    if _starting_values is not None:
+        _starting_values = _starting_values.copy()
+        _starting_values[0] *= _SCALE ** 2
+    am = arch_model(_rates * _SCALE, mean='Zero')
+    res = am.fit(
+        disp='off', show_warning=False, starting_values=_starting_values
+    )
+    param = res.params.values.copy()
+    param[0] /= _SCALE ** 2
+    sigma2 = (res.conditional_volatility[-1] / _SCALE) ** 2
+    return param, sigma2
+
 
 class GARCH(IndicatorAbstract):
+    """
+    refit garch(1, 1) every _fit_period bars, and predict the volatility
+    by the params between fittings
+
+    :param _fit_period: bars between fittings
+    :param _fit_begin: min returns to begin fitting
+    :param _fit_window: fit on the last _fit_window returns only,
+        None for all returns
+    :param _warm_start: start fitting from the last params
+    :param _executor: run fittings in the executor (eg. a process pool),
+        the last params are used until the new fitting is done, so the
+        results depend on when it is done. None for fitting at once,
+        and the first fitting is always done at once
+    """
 
     def __init__(
             self,
@@ -18,13 +63,20 @@ class GARCH(IndicatorAbstract):
             _smooth_period: int = 1,
             _use_key: str = 'closeprice',
             _idx_key: str = 'time',
-            _ret_key: typing.Tuple[str] = ('estimate', 'predict')
+            _ret_key: typing.Tuple[str] = ('estimate', 'predict'),
+            _fit_window: int = None,
+            _warm_start: bool = True,
+            _executor: Executor = None
     ):
         super().__init__()
 
+        assert _fit_window is None or _fit_window >= _fit_begin
+
         self.fit_count = 0
         self.fit_period = _fit_period
         self.fit_begin = _fit_begin
+        self.fit_window = _fit_window
+        self.warm_start = _warm_start
         self.factor = math.sqrt(_factor)
         self.smooth_period = _smooth_period
 
@@ -38,10 +90,75 @@ class GARCH(IndicatorAbstract):
         )
 
         self.last_price = None
-        self.rate_buf = []
+        if self.fit_window is None:
+            self.rate_buf = []
+        else:
+            self.rate_buf = deque(maxlen=self.fit_window)
         self.param = None
         self.sigma2 = None
 
+        self.executor = _executor
+        self.future: Future = None
+        # the returns since the pending fitting submitted, to catch up,
+        # rate_buf may have dropped them if the fitting takes long
+        self.future_rates: typing.List[float] = []
+
+    def setExecutor(self, _executor: Executor) -> 'GARCH':
+        """
+        set the executor of fittings, see _executor
+
+        :param _executor:
+        :return: self
+        """
+        self.executor = _executor
+        return self
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['executor'] = None
+        if self.future is not None:
+            # drop the pending fitting, and refit at the next bar
+            state['future'] = None
+            state['future_rates'] = []
+            state['fit_count'] = self.fit_period
+        return state
+
+    def _update(self, _rate: float):
+        self.sigma2 = self.param[0] + \
+                      self.param[1] * _rate * _rate + \
+                      self.param[2] * self.sigma2
+
+    def _set_fit(
+            self, _param: np.ndarray, _sigma2: float,
+            _rates: typing.Sequence[float] = ()
+    ):
+        """
+        use the new params, and catch up the returns after
+        the last return fitted
+
+        :param _param:
+        :param _sigma2: the conditional variance of the last return fitted
+        :param _rates: the returns to catch up, from the last one fitted
+        """
+        self.param = _param
+        self.sigma2 = _sigma2
+        for rate in _rates:
+            self._update(rate)
+
+    def _fit(self):
+        rates = np.array(self.rate_buf)
+        starting_values = None
+        if self.warm_start and self.param is not None:
+            starting_values = self.param
+        if self.executor is None or self.param is None:
+            # the first fitting is done at once, there are no params to use
+            self._set_fit(*_fit_garch(rates, starting_values))
+        else:
+            self.future = self.executor.submit(
+                _fit_garch, rates, starting_values
+            )
+            self.future_rates = []
+
     def _addOne(self, _data_struct: DataStruct):
         index = _data_struct.index()[0]
         price = _data_struct[self.use_key][0]
@@ -50,23 +167,24 @@ class GARCH(IndicatorAbstract):
             rate = math.log(price / self.last_price)
             self.rate_buf.append(rate)
 
+            if self.future is not None and self.future.done():
+                future, self.future = self.future, None
+                self._set_fit(*future.result(), self.future_rates)
+                self.future_rates = []
+
             self.fit_count += 1
-            if self.fit_count > self.fit_period and \
-                    len(self.rate_buf) >= self.fit_begin:
+            if self.fit_count > self.fit_period and self.future is None \
+                    and len(self.rate_buf) >= self.fit_begin:
                 # retrain model and reset sigma2
-                rate_arr = np.array(self.rate_buf)
-                am = arch_model(rate_arr, mean='Zero')
-                res = am.fit(disp='off', show_warning=False)
-                # input(res.summary())
-                self.param = res.params.values
-                self.sigma2 = res.conditional_volatility[-1] ** 2
+                self._fit()
                 self.fit_count = 0
+            if self.future is not None:
+                # the rate of this bar is caught up from the next bar
+                self.future_rates.append(rate)
 
             if self.param is not None:
                 estimate = math.sqrt(self.sigma2) * self.factor
-                self.sigma2 = self.param[0] + \
-                              self.param[1] * rate * rate + \
-                              self.param[2] * self.sigma2
+                self._update(rate)
                 predict = math.sqrt(self.sigma2)
                 predict *= self.factor
                 if self.smooth_period > 1 and len(self.data):  # smooth
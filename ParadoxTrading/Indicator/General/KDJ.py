@@ -1,8 +1,7 @@
-import statistics
-from collections import deque
+import typing
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class KDJ(IndicatorAbstract):
@@ -30,9 +29,9 @@ class KDJ(IndicatorAbstract):
         self.idx_key = _idx_key
         self.keys = [self.idx_key] + list(_ret_key)
 
-        self.high_buf = deque(maxlen=self.k_period)
-        self.low_buf = deque(maxlen=self.k_period)
-        self.k_buf = deque(maxlen=self.d_period)
+        self.high_acc = SumAccumulator(self.k_period)
+        self.low_acc = SumAccumulator(self.k_period)
+        self.k_acc = SumAccumulator(self.d_period)
 
         self.data = DataStruct(
             self.keys, self.idx_key
@@ -40,21 +39,37 @@ class KDJ(IndicatorAbstract):
 
     def _addOne(self, _data: DataStruct):
         index_value = _data.index()[0]
-        closeprice = _data[self.close_key][0]
-        highprice = _data[self.high_key][0]
-        lowprice = _data[self.low_key][0]
-
-        self.high_buf.append(highprice)
-        self.low_buf.append(lowprice)
-
-        high_mean = statistics.mean(self.high_buf)
-        low_mean = statistics.mean(self.low_buf)
-        k = 100 * (closeprice - high_mean) / (high_mean - low_mean)
-        self.k_buf.append(k)
-        d = statistics.mean(self.k_buf)
-        j = self.j_period * k - (self.j_period - 1) * d
+        self.data.addRow([index_value] + list(self._step(
+            _data[self.close_key][0],
+            _data[self.high_key][0],
+            _data[self.low_key][0]
+        )), self.keys)
 
-        self.data.addRow(
-            [index_value, k, d, j],
-            self.keys
+    def _compute(self, _data: DataStruct):
+        high_mean, _ = self.high_acc.rolling(
+            self._get_values(_data, self.high_key)
+        )
+        low_mean, _ = self.low_acc.rolling(
+            self._get_values(_data, self.low_key)
         )
+        k = 100 * (
+            self._get_array(_data, self.close_key) - high_mean
+        ) / (high_mean - low_mean)
+        d, _ = self.k_acc.rolling(k)
+        j = self.j_period * k - (self.j_period - 1) * d
+
+        columns = {self.keys[0]: self._get_values(_data, _data.index_name)}
+        for key, v in zip(self.keys[1:], (k, d, j)):
+            columns[key] = v.tolist()
+        self._add_columns(columns)
+
+    def _step(
+            self, _closeprice: float, _highprice: float, _lowprice: float
+    ) -> typing.Tuple[float, float, float]:
+        high_mean = self.high_acc.add(_highprice).getMean()
+        low_mean = self.low_acc.add(_lowprice).getMean()
+        k = 100 * (_closeprice - high_mean) / (high_mean - low_mean)
+        d = self.k_acc.add(k).getMean()
+        j = self.j_period * k - (self.j_period - 1) * d
+
+        return k, d, j
@@ -1,12 +1,14 @@
 import math
-from collections import deque
+import typing
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
-from scipy.stats import kurtosis
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class Kurtosis(IndicatorAbstract):
+    """
+    rolling kurtosis of log returns, the same as scipy.stats.kurtosis
+    """
 
     def __init__(
             self, _period: int, _use_key: str = 'closeprice',
@@ -24,16 +26,34 @@ class Kurtosis(IndicatorAbstract):
 
         self.period = _period
         self.last_price = None
-        self.buf = deque(maxlen=self.period)
+        self.acc = MomentAccumulator(self.period, _order=4)
 
-    def _addOne(self, _data_struct: DataStruct):
-        index = _data_struct.index()[0]
-        price = _data_struct[self.use_key][0]
+    def _step(self, _price: float) -> typing.Union[None, float]:
+        ret = None
         if self.last_price:
-            self.buf.append(math.log(price / self.last_price))
-            if len(self.buf) >= self.period:
-                self.data.addDict({
-                    self.idx_key: index,
-                    self.ret_key: kurtosis(self.buf),
-                })
-        self.last_price = price
+            self.acc.add(math.log(_price / self.last_price))
+            if len(self.acc) >= self.period:
+                ret = self.acc.getKurt()
+        self.last_price = _price
+        return ret
+
+    def _addOne(self, _data_struct: DataStruct):
+        ret = self._step(_data_struct[self.use_key][0])
+        if ret is not None:
+            self.data.addDict({
+                self.idx_key: _data_struct.index()[0],
+                self.ret_key: ret,
+            })
+
+    def _compute(self, _data: DataStruct):
+        index, rets = [], []
+        for i, v in zip(
+                self._get_values(_data, _data.index_name),
+                self._get_values(_data, self.use_key)
+        ):
+            ret = self._step(v)
+            if ret is not None:
+                index.append(i)
+                rets.append(ret)
+        if rets:
+            self._add_columns({self.idx_key: index, self.ret_key: rets})
@@ -1,8 +1,5 @@
-import statistics
-from collections import deque
-
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class MA(IndicatorAbstract):
@@ -25,12 +22,21 @@ class MA(IndicatorAbstract):
         )
 
         self.period = _period
-        self.buf = deque(maxlen=self.period)
+        self.acc = SumAccumulator(self.period)
+
+    def _step(self, _value: float) -> float:
+        return self.acc.add(_value).getMean()
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        self.buf.append(_data_struct[self.use_key][0])
         self.data.addDict({
             self.idx_key: index_value,
-            self.ret_key: statistics.mean(self.buf),
+            self.ret_key: self._step(_data_struct[self.use_key][0]),
+        })
+
+    def _compute(self, _data: DataStruct):
+        mean, _ = self.acc.rolling(self._get_values(_data, self.use_key))
+        self._add_columns({
+            self.idx_key: self._get_values(_data, _data.index_name),
+            self.ret_key: mean.tolist(),
         })
@@ -1,5 +1,8 @@
+import typing
+
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
 from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils.Rolling import emaCoef, emaFilter
 
 
 class MACD(IndicatorAbstract):
@@ -17,6 +20,9 @@ class MACD(IndicatorAbstract):
         self.fast_period = _fast_period
         self.slow_period = _slow_period
         self.macd_period = _macd_period
+        self.fast_coef = emaCoef(self.fast_period)
+        self.slow_coef = emaCoef(self.slow_period)
+        self.macd_coef = emaCoef(self.macd_period)
 
         self.use_key = _use_key
         self.idx_key = _idx_key
@@ -32,22 +38,42 @@ class MACD(IndicatorAbstract):
 
     def _addOne(self, _data: DataStruct):
         index_value = _data.index()[0]
-        price = _data[self.use_key][0]
+        self.data.addRow(
+            [index_value] + list(self._step(_data[self.use_key][0])),
+            self.keys
+        )
+
+    def _compute(self, _data: DataStruct):
+        price = self._get_array(_data, self.use_key)
+        fast = emaFilter(price, self.fast_period, self.fast_value)
+        slow = emaFilter(price, self.slow_period, self.slow_value)
+        macd_value = fast - slow
+        macd_avg = emaFilter(macd_value, self.macd_period, self.macd_avg)
+        self.fast_value = fast[-1].item()
+        self.slow_value = slow[-1].item()
+        self.macd_avg = macd_avg[-1].item()
 
+        rets = (macd_value, macd_avg, macd_value - macd_avg)
+        columns = {self.keys[0]: self._get_values(_data, _data.index_name)}
+        for k, v in zip(self.keys[1:], rets):
+            columns[k] = v.tolist()
+        self._add_columns(columns)
+
+    def _step(self, _price: float) -> typing.Tuple[float, float, float]:
         if self.fast_value is None and self.slow_value is None \
                 and self.macd_avg is None:
-            self.fast_value = price
-            self.slow_value = price
+            self.fast_value = _price
+            self.slow_value = _price
             macd_value = self.fast_value - self.slow_value
             self.macd_avg = macd_value
         else:
-            self.fast_value = (price - self.fast_value) / self.fast_period + self.fast_value
-            self.slow_value = (price - self.slow_value) / self.slow_period + self.slow_value
+            self.fast_value = self.fast_coef[0] * _price + \
+                self.fast_coef[1] * self.fast_value
+            self.slow_value = self.slow_coef[0] * _price + \
+                self.slow_coef[1] * self.slow_value
             macd_value = self.fast_value - self.slow_value
-            self.macd_avg = (macd_value - self.macd_avg) / self.macd_period + self.macd_avg
+            self.macd_avg = self.macd_coef[0] * macd_value + \
+                self.macd_coef[1] * self.macd_avg
         macd_diff = macd_value - self.macd_avg
 
-        self.data.addRow(
-            [index_value, macd_value, self.macd_avg, macd_diff],
-            self.keys
-        )
+        return macd_value, self.macd_avg, macd_diff
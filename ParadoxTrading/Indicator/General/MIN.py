@@ -1,7 +1,6 @@
-from collections import deque
-
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, ExtremumAccumulator
+from ParadoxTrading.Utils.Rolling import rollingExtremum
 
 
 class MIN(IndicatorAbstract):
@@ -20,12 +19,24 @@ class MIN(IndicatorAbstract):
         )
 
         self.period = _period
-        self.buf = deque(maxlen=self.period)
+        self.acc = ExtremumAccumulator(self.period, False)
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        self.buf.append(_data_struct.getColumn(self.use_key)[0])
         self.data.addDict({
             self.idx_key: index_value,
-            self.ret_key: min(self.buf),
+            self.ret_key: self.acc.add(
+                _data_struct.getColumn(self.use_key)[0]
+            ).getValue(),
+        })
+
+    def _compute(self, _data: DataStruct):
+        values = self._get_values(_data, self.use_key)
+        extremum = rollingExtremum(
+            values, self.period, False, self.acc.getWindow()
+        )
+        self.acc.extend(values)
+        self._add_columns({
+            self.idx_key: self._get_values(_data, _data.index_name),
+            self.ret_key: extremum.tolist(),
         })
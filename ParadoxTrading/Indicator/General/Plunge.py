@@ -1,7 +1,7 @@
 from collections import deque
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, ExtremumAccumulator
 
 
 class Plunge(IndicatorAbstract):
@@ -37,16 +37,16 @@ class Plunge(IndicatorAbstract):
 
         self.atr_buf = deque(maxlen=_atr_period)
 
-        self.high_buf = deque(maxlen=_extreme_period)
-        self.low_buf = deque(maxlen=_extreme_period)
+        self.high_acc = ExtremumAccumulator(_extreme_period, True)
+        self.low_acc = ExtremumAccumulator(_extreme_period, False)
 
         self.ret_buf = deque(maxlen=_smooth_period)
 
         self.last_close_price = None
 
     def _addOne(self, _data_struct: DataStruct):
-        self.high_buf.append(_data_struct[self.high_key][0])
-        self.low_buf.append(_data_struct[self.low_key][0])
+        self.high_acc.add(_data_struct[self.high_key][0])
+        self.low_acc.add(_data_struct[self.low_key][0])
         closeprice = _data_struct[self.close_key][0]
         if self.last_close_price is not None:
             index_value = _data_struct.index()[0]
@@ -63,9 +63,9 @@ class Plunge(IndicatorAbstract):
                                   self.slow_ema_period + self.slow_ema_value
             # plunge
             if self.fast_ema_value > self.slow_ema_value:
-                plunge_value = (max(self.high_buf) - closeprice) / atr_value
+                plunge_value = (self.high_acc.getValue() - closeprice) / atr_value
             elif self.fast_ema_value < self.slow_ema_value:
-                plunge_value = (closeprice - min(self.low_buf)) / atr_value
+                plunge_value = (closeprice - self.low_acc.getValue()) / atr_value
             else:
                 plunge_value = 0.0
             self.ret_buf.append(plunge_value)
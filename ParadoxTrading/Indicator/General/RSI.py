@@ -1,8 +1,9 @@
-import statistics
-from collections import deque
+import typing
+
+import numpy as np
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class RSI(IndicatorAbstract):
@@ -21,28 +22,54 @@ class RSI(IndicatorAbstract):
         )
 
         self.period = _period
-        self.gain_buf = deque(maxlen=self.period)
-        self.loss_buf = deque(maxlen=self.period)
+        self.gain_acc = SumAccumulator(self.period)
+        self.loss_acc = SumAccumulator(self.period)
 
         self.last_price = None
 
-    def _addOne(self, _data_struct: DataStruct):
-        price = _data_struct[self.use_key][0]
+    def _step(self, _price: float) -> typing.Union[None, float]:
+        ret = None
         if self.last_price is not None:
-            price_diff = price - self.last_price
+            price_diff = _price - self.last_price
             if price_diff >= 0:
-                self.gain_buf.append(price_diff)
-                self.loss_buf.append(0)
+                self.gain_acc.add(price_diff)
+                self.loss_acc.add(0)
             else:
-                self.gain_buf.append(0)
-                self.loss_buf.append(-price_diff)
+                self.gain_acc.add(0)
+                self.loss_acc.add(-price_diff)
+
+            gain_mean = self.gain_acc.getMean()
+            loss_mean = max(self.loss_acc.getMean(), 0.01)
+            ret = 100 - 100 / (1 + gain_mean / loss_mean)
 
-            index_value = _data_struct.index()[0]
-            gain_mean = statistics.mean(self.gain_buf)
-            loss_mean = max(statistics.mean(self.loss_buf), 0.01)
+        self.last_price = _price
+        return ret
+
+    def _addOne(self, _data_struct: DataStruct):
+        ret = self._step(_data_struct[self.use_key][0])
+        if ret is not None:
             self.data.addDict({
-                self.idx_key: index_value,
-                self.ret_key: 100 - 100 / (1 + gain_mean / loss_mean),
+                self.idx_key: _data_struct.index()[0],
+                self.ret_key: ret,
             })
 
-        self.last_price = price
+    def _compute(self, _data: DataStruct):
+        index = self._get_values(_data, _data.index_name)
+        price = self._get_array(_data, self.use_key)
+        if self.last_price is None:  # the first price has no value
+            index, price_diff = index[1:], np.diff(price)
+        else:
+            price_diff = np.diff(price, prepend=self.last_price)
+        self.last_price = self._get_values(_data, self.use_key)[-1]
+        if not len(price_diff):
+            return
+
+        gain = np.where(price_diff >= 0, price_diff, 0.)
+        loss = np.where(price_diff >= 0, 0., -price_diff)
+        gain_mean, _ = self.gain_acc.rolling(gain)
+        loss_mean, _ = self.loss_acc.rolling(loss)
+        loss_mean = np.maximum(loss_mean, 0.01)
+        self._add_columns({
+            self.idx_key: index,
+            self.ret_key: (100 - 100 / (1 + gain_mean / loss_mean)).tolist(),
+        })
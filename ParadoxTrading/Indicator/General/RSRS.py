@@ -1,10 +1,9 @@
-from collections import deque
+import typing
 
 import numpy as np
-import typing
+
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
-from scipy.stats import linregress
+from ParadoxTrading.Utils import DataStruct, RegressionAccumulator
 
 
 class RSRS(IndicatorAbstract):
@@ -29,20 +28,38 @@ class RSRS(IndicatorAbstract):
 
         self.N = _N
 
-        self.high_buf = deque(maxlen=self.N)
-        self.low_buf = deque(maxlen=self.N)
+        self.high_acc = RegressionAccumulator(self.N)
+        self.low_acc = RegressionAccumulator(self.N)
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        self.high_buf.append(_data_struct[self.use_key[0]][-1])
-        self.low_buf.append(_data_struct[self.use_key[1]][-1])
-
-        if len(self.high_buf) >= self.N and len(self.low_buf) >= self.N:
-            x = np.arange(self.N)
-            high_beta = linregress(x, self.high_buf)[0]
-            low_beta = linregress(x, self.low_buf)[0]
+        self.high_acc.add(_data_struct[self.use_key[0]][-1])
+        self.low_acc.add(_data_struct[self.use_key[1]][-1])
 
+        if len(self.high_acc) >= self.N:
             self.data.addDict({
                 self.idx_key: index_value,
-                self.ret_key: high_beta - low_beta,
+                self.ret_key:
+                    self.high_acc.getSlope() - self.low_acc.getSlope(),
+            })
+
+    def _get_slopes(
+            self, _acc: RegressionAccumulator, _values: list
+    ) -> np.ndarray:
+        # only the windows of N values are returned
+        skip = max(0, self.N - 1 - _acc.count)
+        return _acc.rolling(_values)[0][skip:]
+
+    def _compute(self, _data: DataStruct):
+        index = self._get_values(_data, _data.index_name)
+        high_slope = self._get_slopes(
+            self.high_acc, self._get_values(_data, self.use_key[0])
+        )
+        low_slope = self._get_slopes(
+            self.low_acc, self._get_values(_data, self.use_key[1])
+        )
+        if len(high_slope):
+            self._add_columns({
+                self.idx_key: index[len(index) - len(high_slope):],
+                self.ret_key: (high_slope - low_slope).tolist(),
             })
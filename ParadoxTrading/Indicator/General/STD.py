@@ -1,8 +1,7 @@
-import statistics
-from collections import deque
+import numpy as np
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
 
 
 class STD(IndicatorAbstract):
@@ -21,12 +20,22 @@ class STD(IndicatorAbstract):
         )
 
         self.period = _period
-        self.buf = deque(maxlen=self.period)
+        self.acc = SumAccumulator(self.period)
+
+    def _step(self, _value: float) -> float:
+        return self.acc.add(_value).getStd()
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
-        self.buf.append(_data_struct.getColumn(self.use_key)[0])
         self.data.addDict({
             self.idx_key: index_value,
-            self.ret_key: statistics.pstdev(self.buf),
+            self.ret_key: self._step(_data_struct.getColumn(self.use_key)[0]),
+        })
+
+    def _compute(self, _data: DataStruct):
+        _, var = self.acc.rolling(self._get_values(_data, self.use_key))
+        std = np.sqrt(var)
+        self._add_columns({
+            self.idx_key: self._get_values(_data, _data.index_name),
+            self.ret_key: std.tolist(),
         })
@@ -1,9 +1,5 @@
-import math
-import statistics
-from collections import deque
-
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
 
 
 class SharpRate(IndicatorAbstract):
@@ -23,18 +19,17 @@ class SharpRate(IndicatorAbstract):
 
         self.last_price = None
         self.period = _period
-        self.buf = deque(maxlen=self.period)
+        self.acc = MomentAccumulator(self.period)
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
         price_value = _data_struct[self.use_key][0]
         if self.last_price is not None:
             chg_rate = price_value / self.last_price - 1
-            self.buf.append(chg_rate)
-            buf_std = statistics.pstdev(self.buf)
+            buf_std = self.acc.add(chg_rate).getStd()
             if buf_std != 0:
                 self.data.addDict({
                     self.idx_key: index_value,
-                    self.ret_key: statistics.mean(self.buf) / buf_std,
+                    self.ret_key: self.acc.getMean() / buf_std,
                 })
         self.last_price = price_value
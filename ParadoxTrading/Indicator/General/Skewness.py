@@ -0,0 +1,59 @@
+import math
+import typing
+
+from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
+from ParadoxTrading.Utils import DataStruct, MomentAccumulator
+
+
+class Skewness(IndicatorAbstract):
+    """
+    rolling skewness of log returns, the same as scipy.stats.skew
+    """
+
+    def __init__(
+            self, _period: int, _use_key: str = 'closeprice',
+            _idx_key: str = 'time', _ret_key: str = 'skewness'
+    ):
+        super().__init__()
+
+        self.use_key = _use_key
+        self.idx_key = _idx_key
+        self.ret_key = _ret_key
+        self.data = DataStruct(
+            [self.idx_key, self.ret_key],
+            self.idx_key
+        )
+
+        self.period = _period
+        self.last_price = None
+        self.acc = MomentAccumulator(self.period, _order=3)
+
+    def _step(self, _price: float) -> typing.Union[None, float]:
+        ret = None
+        if self.last_price:
+            self.acc.add(math.log(_price / self.last_price))
+            if len(self.acc) >= self.period:
+                ret = self.acc.getSkew()
+        self.last_price = _price
+        return ret
+
+    def _addOne(self, _data_struct: DataStruct):
+        ret = self._step(_data_struct[self.use_key][0])
+        if ret is not None:
+            self.data.addDict({
+                self.idx_key: _data_struct.index()[0],
+                self.ret_key: ret,
+            })
+
+    def _compute(self, _data: DataStruct):
+        index, rets = [], []
+        for i, v in zip(
+                self._get_values(_data, _data.index_name),
+                self._get_values(_data, self.use_key)
+        ):
+            ret = self._step(v)
+            if ret is not None:
+                index.append(i)
+                rets.append(ret)
+        if rets:
+            self._add_columns({self.idx_key: index, self.ret_key: rets})
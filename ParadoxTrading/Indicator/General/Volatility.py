@@ -1,9 +1,10 @@
 import math
-import statistics
-from collections import deque
+
+import numpy as np
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
-from ParadoxTrading.Utils import DataStruct
+from ParadoxTrading.Utils import DataStruct, SumAccumulator
+from ParadoxTrading.Utils.Rolling import emaCoef, emaFilter
 
 
 class Volatility(IndicatorAbstract):
@@ -29,24 +30,47 @@ class Volatility(IndicatorAbstract):
         self.period = _period
         self.factor = math.sqrt(_factor)
         self.smooth = _smooth
-        self.buf = deque(maxlen=self.period)
+        self.acc = SumAccumulator(self.period)
+        self.last_std_value = None
+
+    def _step(self, _chg_rate: float) -> float:
+        std_value = self.acc.add(_chg_rate).getStd() * self.factor
+        if self.smooth > 1 and self.last_std_value is not None:
+            b, c = emaCoef(self.smooth)
+            std_value = b * std_value + c * self.last_std_value
+        self.last_std_value = std_value
+        return std_value
 
     def _addOne(self, _data_struct: DataStruct):
         index_value = _data_struct.index()[0]
         price_value = _data_struct[self.use_key][0]
         if self.last_price is not None:
-            chg_rate = price_value / self.last_price - 1
-            self.buf.append(chg_rate)
-
-            std_value = statistics.pstdev(self.buf) * self.factor
-            if self.smooth > 1 and len(self.data):
-                last_std_value = self.data[self.ret_key][-1]
-                std_value = (
-                    (self.smooth - 1) * last_std_value + std_value
-                ) / self.smooth
-
             self.data.addDict({
                 self.idx_key: index_value,
-                self.ret_key: std_value,
+                self.ret_key: self._step(price_value / self.last_price - 1),
             })
         self.last_price = price_value
+
+    def _compute(self, _data: DataStruct):
+        index = self._get_values(_data, _data.index_name)
+        price = self._get_array(_data, self.use_key)
+        if self.last_price is None:
+            # the first price has no change rate
+            index, last_price, price = index[1:], price[:-1], price[1:]
+        else:
+            last_price = np.concatenate(([self.last_price], price[:-1]))
+        self.last_price = self._get_values(_data, self.use_key)[-1]
+        if not len(price):
+            return
+
+        chg_rate = price / last_price - 1
+        _, var = self.acc.rolling(chg_rate)
+        std_value = np.sqrt(var) * self.factor
+        if self.smooth > 1:
+            # the same recursion as EMA of std
+            std_value = emaFilter(std_value, self.smooth, self.last_std_value)
+        self.last_std_value = std_value[-1].item()
+        self._add_columns({
+            self.idx_key: index,
+            self.ret_key: std_value.tolist(),
+        })
@@ -27,6 +27,7 @@ from .RSRS import RSRS
 from .SAR import SAR
 from .SharpRate import SharpRate
 from .SimMA import SimMA
+from .Skewness import Skewness
 from .STD import STD
 from .Volatility import Volatility
 from .ZigZag import ZigZag
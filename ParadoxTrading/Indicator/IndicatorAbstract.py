@@ -1,6 +1,9 @@
 import typing
 
-from ParadoxTrading.Utils import DataStruct
+import numpy as np
+
+from ParadoxTrading.Utils import Column, DataStruct, DataStructView, \
+    TickRecord
 
 
 class IndicatorAbstract:
@@ -16,7 +19,21 @@ class IndicatorAbstract:
     def getAllData(self) -> DataStruct:
         return self.data
 
-    def addOne(self, _data_struct: DataStruct) -> "IndicatorAbstract":
+    def setHistory(self, _history: int) -> "IndicatorAbstract":
+        """
+        keep only the last _history rows of results in a ring buffer,
+        so the memory of long-running indicators is bounded.
+        getAllData() returns the kept rows
+
+        :param _history: rows to keep
+        :return: self
+        """
+        self.data.setMaxLen(_history)
+        return self
+
+    def addOne(
+            self, _data_struct: typing.Union[DataStruct, TickRecord]
+    ) -> "IndicatorAbstract":
         assert len(_data_struct) == 1
         self._addOne(_data_struct)
         return self
@@ -28,6 +45,67 @@ class IndicatorAbstract:
             self,
             _data_list: typing.Union[DataStruct, typing.List[DataStruct]],
     ) -> "IndicatorAbstract":
-        for data in _data_list:
-            self.addOne(data)
+        if isinstance(_data_list, (DataStruct, DataStructView)):
+            # read rows as records, instead of one-row datastructs
+            for data in _data_list.iterRows():
+                self._addOne(data)
+        else:
+            for data in _data_list:
+                self.addOne(data)
+        return self
+
+    def compute(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> "IndicatorAbstract":
+        """
+        add all rows of _data at once, and the state is kept, so addOne()
+        can go on after it. The result is bitwise the same as addMany(),
+        the vectorized calculation does the same float operations as
+        the python loop. Indicators without _compute() fall back to
+        addMany()
+
+        :param _data: sorted by index, after the data added
+        :return:
+        """
+        if len(_data):
+            self._compute(_data)
         return self
+
+    def _compute(self, _data: typing.Union[DataStruct, DataStructView]):
+        self.addMany(_data)
+
+    @staticmethod
+    def _get_values(
+            _data: typing.Union[DataStruct, DataStructView], _key: str
+    ) -> list:
+        """
+        get one column of _data as a list of python values,
+        the same values as iterRows()
+        """
+        column = _data[_key]
+        if isinstance(column, list):
+            return column
+        if isinstance(column, Column):
+            return column.tolist()
+        start, stop = column.range.start, column.range.stop
+        if isinstance(column.column, Column):
+            return column.column.values()[start:stop].tolist()
+        return column.column[start:stop]
+
+    @staticmethod
+    def _get_array(
+            _data: typing.Union[DataStruct, DataStructView], _key: str
+    ) -> np.ndarray:
+        return np.array(
+            IndicatorAbstract._get_values(_data, _key), dtype=np.float64
+        )
+
+    def _add_columns(self, _columns: typing.Dict[str, typing.Sequence]):
+        """
+        add the results of _compute() into self.data at once
+
+        :param _columns: map key to column, sorted by index
+        """
+        self.data.merge(DataStruct.fromColumns(
+            _columns, self.data.index_name, self.data.columnar
+        ))
@@ -0,0 +1,176 @@
+import inspect
+import typing
+
+from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
+from ParadoxTrading.Utils import DataStruct, TickRecord
+
+
+def _freeze(_value: typing.Any) -> typing.Any:
+    # turn lists and dicts in params into hashable values
+    if isinstance(_value, (list, tuple)):
+        return tuple(_freeze(v) for v in _value)
+    if isinstance(_value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in _value.items()))
+    return _value
+
+
+class IndicatorNode:
+    """
+    one shared indicator in graph, and the nodes fed by its results
+
+    :param _key: the key in graph
+    :param _indicator:
+    """
+
+    def __init__(self, _key: typing.Tuple, _indicator: IndicatorAbstract):
+        self.key = _key
+        self.indicator = _indicator
+        self.children: typing.List['IndicatorNode'] = []
+        # the last row added, each market event is a new object, so the
+        # rows of the same time are all added, but each only once
+        self.last_data: typing.Union[DataStruct, TickRecord] = None
+
+    def addOne(self, _data: typing.Union[DataStruct, TickRecord]):
+        """
+        add one row into indicator once, the row just added (the same
+        object) is skipped, then the new result is added into children
+
+        :param _data:
+        """
+        if _data is self.last_data:
+            return
+        self.last_data = _data
+
+        last_count = self.indicator.data.countRows()
+        self.indicator.addOne(_data)
+        if self.children and \
+                self.indicator.data.countRows() != last_count:
+            result = self.indicator.getLastData()
+            for child in self.children:
+                child.addOne(result)
+
+
+class IndicatorGraph:
+    """
+    indicators shared by strategies and portfolios. Each indicator is
+    keyed by its source (symbol, or another indicator in graph), class
+    and params, so the consumers asking for the same one get the same
+    object, and it is calculated once for each market event however many
+    consumers there are. The indicators got from graph should only be
+    updated by addOne() of graph.
+
+    :Example:
+
+    >>> graph = IndicatorGraph()
+    >>> atr = graph.get('rb', ATR, 50)  # in strategy
+    >>> graph.get('rb', ATR, _period=50) is atr  # in portfolio
+    True
+    >>> ma = graph.derive(graph.get('rb', EMA, 20), MA, 5, _use_key='ema')
+    >>> graph.addOne('rb', data)  # called by both, the second is skipped
+    """
+
+    def __init__(self):
+        self.node_dict: typing.Dict[typing.Tuple, IndicatorNode] = {}
+        # map symbol to the nodes fed by market data
+        self.symbol_dict: typing.Dict[str, typing.List[IndicatorNode]] = {}
+        # map id of indicator to its node
+        self.indicator_dict: typing.Dict[int, IndicatorNode] = {}
+
+    def __len__(self) -> int:
+        return len(self.node_dict)
+
+    @staticmethod
+    def _get_params(
+            _cls: typing.Type[IndicatorAbstract],
+            _args: tuple, _kwargs: dict
+    ) -> typing.Tuple:
+        # bind to __init__, so positional, keyword and default params
+        # of the same value are the same key
+        bound = inspect.signature(_cls.__init__).bind(
+            None, *_args, **_kwargs
+        )
+        bound.apply_defaults()
+        return _freeze(list(bound.arguments.items())[1:])
+
+    def _get_node(
+            self, _source: typing.Tuple,
+            _cls: typing.Type[IndicatorAbstract],
+            _args: tuple, _kwargs: dict
+    ) -> typing.Tuple[IndicatorNode, bool]:
+        key = (_source, _cls, self._get_params(_cls, _args, _kwargs))
+        try:
+            return self.node_dict[key], False
+        except KeyError:
+            node = IndicatorNode(key, _cls(*_args, **_kwargs))
+            self.node_dict[key] = node
+            self.indicator_dict[id(node.indicator)] = node
+            return node, True
+
+    def get(
+            self, _symbol: str,
+            _cls: typing.Type[IndicatorAbstract], *args, **kwargs
+    ) -> IndicatorAbstract:
+        """
+        get the indicator of _cls(*args, **kwargs) on the market data
+        of _symbol, it is created if not in graph
+
+        :param _symbol:
+        :param _cls: class of indicator
+        :return:
+        """
+        node, created = self._get_node((_symbol,), _cls, args, kwargs)
+        if created:
+            self.symbol_dict.setdefault(_symbol, []).append(node)
+        return node.indicator
+
+    def restore(
+            self, _symbol: str, _indicator: IndicatorAbstract,
+            *args, **kwargs
+    ) -> IndicatorAbstract:
+        """
+        the graph is not pickled, so restore the state of _indicator
+        (eg. loaded from pickle) into the indicator of
+        type(_indicator)(*args, **kwargs) on _symbol in graph. The
+        consumers holding the one in graph get the state, and it is
+        still updated by addOne()
+
+        :param _symbol:
+        :param _indicator: indicator out of graph
+        :return: the indicator in graph
+        """
+        indicator = self.get(_symbol, type(_indicator), *args, **kwargs)
+        indicator.__dict__.update(_indicator.__dict__)
+        return indicator
+
+    def derive(
+            self, _source: IndicatorAbstract,
+            _cls: typing.Type[IndicatorAbstract], *args, **kwargs
+    ) -> IndicatorAbstract:
+        """
+        get the indicator of _cls(*args, **kwargs) on the results of
+        _source, which should be got from this graph
+
+        :param _source: indicator in graph
+        :param _cls: class of indicator
+        :return:
+        """
+        parent = self.indicator_dict[id(_source)]
+        node, created = self._get_node(parent.key, _cls, args, kwargs)
+        if created:
+            parent.children.append(node)
+        return node.indicator
+
+    def addOne(
+            self, _symbol: str, _data: typing.Union[DataStruct, TickRecord]
+    ):
+        """
+        add one row of market data into the indicators on _symbol, and
+        their results into the derived ones. Each row is added once,
+        so all consumers can call it with the data of the same market
+        event, it is skipped if it is the same object as the last one
+
+        :param _symbol:
+        :param _data:
+        """
+        for node in self.symbol_dict.get(_symbol, ()):
+            node.addOne(_data)
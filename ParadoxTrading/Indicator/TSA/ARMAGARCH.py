@@ -1,13 +1,53 @@
+import hashlib
 import math
 import typing
+from concurrent.futures import Executor
 
+import numpy as np
+from diskcache import Cache
 from TorchTSA.model import ARMAIGARCHModel
 
 from ParadoxTrading.Indicator.IndicatorAbstract import IndicatorAbstract
 from ParadoxTrading.Utils import DataStruct
 
 
+def _fit_arma_garch(_returns: np.ndarray) -> typing.Tuple[float, ...]:
+    """
+    fit a new model on _returns, it is a module function,
+    so it can be sent to a process pool
+
+    :param _returns: log returns
+    :return: phi, theta, alpha, beta, const,
+        and the last info and variance
+    """
+    model = ARMAIGARCHModel(_use_mu=False)
+    model.fit(_returns.tolist())
+    return (
+        float(model.getPhis()[0]), float(model.getThetas()[0]),
+        float(model.getAlphas()[0]), float(model.getBetas()[0]),
+        float(model.getConst()[0]),
+        float(model.latent_arma_arr[-1]), float(model.latent_garch_arr[-1]),
+    )
+
+
 class ARMAGARCH(IndicatorAbstract):
+    """
+    refit arma-igarch every _fit_period returns, and predict the mean and
+    std by the params between fittings.
+
+    compute() finds all the fitting points of data first, and fits them
+    at once (in _executor if set), then predicts through the data like
+    addOne(). If _cache is set, the params of each fitting are kept by
+    _cache_key, the index of fitting point and the returns fitted,
+    so reruns load them instead of fitting again
+
+    :param _fit_period: returns between fittings
+    :param _fit_begin: min returns to begin fitting
+    :param _executor: run the fittings of compute() in the executor,
+        eg. a process pool
+    :param _cache: diskcache to keep params
+    :param _cache_key: name of data in cache, eg. the symbol
+    """
 
     def __init__(
             self,
@@ -16,15 +56,23 @@ class ARMAGARCH(IndicatorAbstract):
             _use_key: str = 'closeprice',
             _idx_key: str = 'time',
             _ret_key: typing.Tuple[str] = ('mean', 'std'),
+            _executor: Executor = None,
+            _cache: Cache = None,
+            _cache_key: str = None
     ):
         super().__init__()
 
+        assert _cache is None or _cache_key is not None
+
         # fitting control
         self.fit_count = 0
         self.fit_period = _fit_period
         self.fit_begin = _fit_begin
 
-        self.model = ARMAIGARCHModel(_use_mu=False)
+        self.executor = _executor
+        self.cache = _cache
+        self.cache_key = _cache_key
+        self.param_key: str = 'ARMAGARCH_{}_{}_{}'
 
         self.use_key = _use_key
         self.idx_key = _idx_key
@@ -47,12 +95,58 @@ class ARMAGARCH(IndicatorAbstract):
         self.new_info = None
         self.new_var = None
 
-    def _addOne(self, _data_struct: DataStruct):
-        index = _data_struct.index()[0]
-        price = _data_struct[self.use_key][0]
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the executor and the connection of cache are not pickled
+        state['executor'] = None
+        state['cache'] = None
+        return state
+
+    def _get_param_key(
+            self, _index: typing.Any, _returns: np.ndarray
+    ) -> str:
+        return self.param_key.format(
+            self.cache_key, _index,
+            hashlib.md5(_returns.tobytes()).hexdigest()
+        )
+
+    def _load_param(
+            self, _index: typing.Any, _returns: np.ndarray
+    ) -> typing.Union[None, typing.Tuple[float, ...]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self._get_param_key(_index, _returns))
+
+    def _save_param(
+            self, _index: typing.Any, _returns: np.ndarray,
+            _param: typing.Tuple[float, ...]
+    ):
+        if self.cache is not None:
+            self.cache.set(self._get_param_key(_index, _returns), _param)
 
+    def _fit(self, _index: typing.Any) -> typing.Tuple[float, ...]:
+        returns = np.array(self.return_buf)
+        param = self._load_param(_index, returns)
+        if param is None:
+            param = _fit_arma_garch(returns)
+            self._save_param(_index, returns, param)
+        return param
+
+    def _step(
+            self, _index: typing.Any, _price: float,
+            _params: typing.Dict[typing.Any, typing.Tuple[float, ...]] = None
+    ) -> typing.Union[None, typing.Tuple[float, float]]:
+        """
+        add one price, and return the predicted mean and std
+
+        :param _index:
+        :param _price:
+        :param _params: params fitted already, map index to params
+        :return: None if not fitted
+        """
+        ret = None
         if self.last_price is not None:
-            rate = math.log(price) - math.log(self.last_price)
+            rate = math.log(_price) - math.log(self.last_price)
             if self.new_mean is not None:
                 self.new_info = rate - self.new_mean
             self.return_buf.append(rate)
@@ -60,24 +154,93 @@ class ARMAGARCH(IndicatorAbstract):
             self.fit_count += 1  # retrain model
             if self.fit_count > self.fit_period and \
                     len(self.return_buf) >= self.fit_begin:
-                self.model.fit(self.return_buf)
-                self.phi = self.model.getPhis()[0]
-                self.theta = self.model.getThetas()[0]
-                self.alpha = self.model.getAlphas()[0]
-                self.beta = self.model.getBetas()[0]
-                self.const = self.model.getConst()[0]
-                self.new_info = self.model.latent_arma_arr[-1]
-                self.new_var = self.model.latent_garch_arr[-1]
+                if _params is not None and _index in _params:
+                    param = _params[_index]
+                else:
+                    param = self._fit(_index)
+                self.phi, self.theta, self.alpha, self.beta, self.const, \
+                    self.new_info, self.new_var = param
                 self.fit_count = 0
 
             if self.new_info is not None:  # predict value
                 self.new_mean = self.phi * rate + self.theta * self.new_info
                 self.new_var = self.alpha * self.new_info ** 2 + \
-                               self.beta * self.new_var + self.const
-                self.data.addDict({
-                    self.idx_key: index,
-                    self.ret_key[0]: self.new_mean,
-                    self.ret_key[1]: math.sqrt(self.new_var),
-                })
-
-        self.last_price = price
+                    self.beta * self.new_var + self.const
+                ret = self.new_mean, math.sqrt(self.new_var)
+
+        self.last_price = _price
+        return ret
+
+    def _addOne(self, _data_struct: DataStruct):
+        index = _data_struct.index()[0]
+        ret = self._step(index, _data_struct[self.use_key][0])
+        if ret is not None:
+            self.data.addDict({
+                self.idx_key: index,
+                self.ret_key[0]: ret[0],
+                self.ret_key[1]: ret[1],
+            })
+
+    def _find_fits(
+            self, _index: list
+    ) -> typing.List[typing.Tuple[typing.Any, int]]:
+        """
+        find the fitting points like _step()
+
+        :param _index: index of the prices to add
+        :return: index of fitting point, and the number of returns fitted
+        """
+        fits = []
+        fit_count = self.fit_count
+        num = len(self.return_buf)
+        # the first price has no return if there is no last price
+        for index in _index[1 if self.last_price is None else 0:]:
+            num += 1
+            fit_count += 1
+            if fit_count > self.fit_period and num >= self.fit_begin:
+                fits.append((index, num))
+                fit_count = 0
+        return fits
+
+    def _compute(self, _data: DataStruct):
+        index = self._get_values(_data, _data.index_name)
+        price = self._get_values(_data, self.use_key)
+
+        # the returns are calculated like _step(), so the same as fitted
+        prices = price if self.last_price is None \
+            else [self.last_price] + price
+        returns = np.array(self.return_buf + [
+            math.log(b) - math.log(a) for a, b in zip(prices, prices[1:])
+        ])
+
+        params = {}
+        futures = {}
+        for fit_index, num in self._find_fits(index):
+            param = self._load_param(fit_index, returns[:num])
+            if param is not None:
+                params[fit_index] = param
+            elif self.executor is not None:
+                futures[fit_index] = (num, self.executor.submit(
+                    _fit_arma_garch, returns[:num]
+                ))
+            else:
+                params[fit_index] = _fit_arma_garch(returns[:num])
+                self._save_param(fit_index, returns[:num], params[fit_index])
+        for fit_index, (num, future) in futures.items():
+            params[fit_index] = future.result()
+            self._save_param(fit_index, returns[:num], params[fit_index])
+
+        # predict between fittings like addOne()
+        ret_index, ret_mean, ret_std = [], [], []
+        for i, p in zip(index, price):
+            ret = self._step(i, p, params)
+            if ret is not None:
+                ret_index.append(i)
+                ret_mean.append(ret[0])
+                ret_std.append(ret[1])
+        if ret_index:
+            self._add_columns({
+                self.idx_key: ret_index,
+                self.ret_key[0]: ret_mean,
+                self.ret_key[1]: ret_std,
+            })
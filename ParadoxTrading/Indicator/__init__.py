@@ -2,6 +2,7 @@ from .Bar import OHLC, CloseBar, HighBar, LowBar, OpenBar, SumBar
 from .General import ATR, BIAS, CCI, EFF, EMA, GARCH, KDJ, MA, MACD, MAX, \
     MIN, RSI, RSRS, SAR, STD, AdaBBands, AdaKalman, BBands, Diff, FastBBands, \
     FastMA, FastSTD, FastVolatility, Kalman, Kurtosis, LogReturn, Plunge, \
-    ReturnRate, SharpRate, SimMA, Volatility, ZigZag
+    ReturnRate, SharpRate, SimMA, Skewness, Volatility, ZigZag
+from .IndicatorGraph import IndicatorGraph
 from .Stop import ATRConstStop, ATRTrailingStop, RateConstStop, \
     RateTrailingStop, StepDrawdownStop, VolatilityTrailingStop
@@ -0,0 +1,623 @@
+import math
+import typing
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class MomentAccumulator:
+    """
+    running mean and variance of the last _period values, each value is
+    added in O(1) by Welford's method. Removing the oldest value lets the
+    rounding error accumulate, so the moments are recomputed from the
+    window (two passes around the new mean) after every _recenter removals,
+    which is still O(1) amortized. The number of equal values at the end
+    is counted too, so a window of the same values (eg. a flat price) has
+    exactly its value as mean and 0 as variance, instead of the rounding
+    error left by the removed values.
+
+    With _order 3 or 4, the third and fourth central moments are updated
+    as well (by the add and remove formulas of Pebay), for skewness and
+    kurtosis
+
+    :param _period: length of window
+    :param _recenter: removals between recomputing, default _period
+    :param _order: the highest moment to keep, 2, 3 or 4
+    """
+
+    def __init__(
+            self, _period: int, _recenter: int = None, _order: int = 2
+    ):
+        assert _period > 0
+        if _recenter is None:
+            _recenter = _period
+        assert _recenter > 0
+        assert _order in (2, 3, 4)
+
+        self.period = _period
+        self.recenter = _recenter
+        self.order = _order
+        self.buf: typing.Deque[float] = deque(maxlen=self.period)
+
+        self.mean = 0.0
+        # sums of the 2nd, 3rd and 4th powers of deviations from mean
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.removed = 0
+        # number of the same values at the end
+        self.same = 0
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def _push(self, _value: float, _num: int):
+        # _num is the number of values after _value added
+        delta = _value - self.mean
+        delta_n = delta / _num
+        self.mean += delta_n
+        if self.order == 2:
+            self.m2 += delta * (_value - self.mean)
+            return
+        term = delta * delta_n * (_num - 1)
+        delta_n2 = delta_n * delta_n
+        if self.order == 4:
+            self.m4 += term * delta_n2 * (_num * _num - 3 * _num + 3) + \
+                6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term * delta_n * (_num - 2) - 3 * delta_n * self.m2
+        self.m2 += term
+
+    def _pop(self, _value: float, _num: int):
+        # _num is the number of values before _value removed,
+        # it is the reverse of _push()
+        if _num == 1:
+            self.mean = self.m2 = self.m3 = self.m4 = 0.0
+            return
+        self.mean -= (_value - self.mean) / (_num - 1)
+        delta = _value - self.mean
+        delta_n = delta / _num
+        term = delta * delta_n * (_num - 1)
+        delta_n2 = delta_n * delta_n
+        self.m2 -= term
+        self.m3 -= term * delta_n * (_num - 2) - 3 * delta_n * self.m2
+        if self.order == 4:
+            self.m4 -= term * delta_n2 * (_num * _num - 3 * _num + 3) + \
+                6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+
+    def add(self, _value: float) -> 'MomentAccumulator':
+        """
+        add _value, and remove the oldest one if the window is full
+
+        :param _value:
+        :return:
+        """
+        if self.buf and self.buf[-1] == _value:
+            self.same += 1
+        else:
+            self.same = 1
+        if len(self.buf) < self.period:
+            self.buf.append(_value)
+            self._push(_value, len(self.buf))
+            return self
+
+        old_value = self.buf[0]
+        self.buf.append(_value)
+        if self.order == 2:
+            # remove and add at once
+            delta = _value - old_value
+            last_mean = self.mean
+            self.mean += delta / self.period
+            self.m2 += delta * (_value - self.mean + old_value - last_mean)
+        else:
+            self._pop(old_value, self.period)
+            self._push(_value, self.period)
+
+        self.removed += 1
+        if self.removed >= self.recenter:
+            self.recompute()
+        return self
+
+    def recompute(self):
+        """
+        recompute the moments from the values in window
+        """
+        self.removed = 0
+        if not self.buf:
+            self.mean = self.m2 = self.m3 = self.m4 = 0.0
+            return
+        mean = math.fsum(self.buf) / len(self.buf)
+        self.mean = mean
+        self.m2 = math.fsum((v - mean) ** 2 for v in self.buf)
+        if self.order >= 3:
+            self.m3 = math.fsum((v - mean) ** 3 for v in self.buf)
+        if self.order == 4:
+            self.m4 = math.fsum((v - mean) ** 4 for v in self.buf)
+
+    def isConstant(self) -> bool:
+        """
+        whether the values in window are all the same
+
+        :return:
+        """
+        return 0 < len(self.buf) <= self.same
+
+    def getMean(self) -> float:
+        if self.isConstant():
+            return self.buf[-1]
+        return self.mean
+
+    def getVar(self, _ddof: int = 0) -> float:
+        """
+        variance of window, _ddof=0 is the same as statistics.pvariance
+
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        assert len(self.buf) > _ddof
+        if self.isConstant():
+            return 0.0
+        return max(self.m2, 0.0) / (len(self.buf) - _ddof)
+
+    def getStd(self, _ddof: int = 0) -> float:
+        """
+        std of window, _ddof=0 is the same as statistics.pstdev
+
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        return math.sqrt(self.getVar(_ddof))
+
+    def getSkew(self) -> float:
+        """
+        skewness of window, the same as scipy.stats.skew,
+        nan if the values are the same
+
+        :return:
+        """
+        assert self.order >= 3
+        if self.m2 <= 0 or self.isConstant():
+            return float('nan')
+        return math.sqrt(len(self.buf)) * self.m3 / self.m2 ** 1.5
+
+    def getKurt(self, _fisher: bool = True) -> float:
+        """
+        kurtosis of window, the same as scipy.stats.kurtosis,
+        nan if the values are the same
+
+        :param _fisher: subtract 3, so it is 0 for normal distribution
+        :return:
+        """
+        assert self.order == 4
+        if self.m2 <= 0 or self.isConstant():
+            return float('nan')
+        kurt = len(self.buf) * self.m4 / (self.m2 * self.m2)
+        return kurt - 3 if _fisher else kurt
+
+
+class SumAccumulator:
+    """
+    running mean and variance of the last _period values by cumulative
+    sums, which rolling() calculates at once by numpy with the same float
+    operations as add(), so compute() of indicators is bitwise the same
+    as adding the values one by one.
+
+    The values are added in blocks of _period. Each block shifts values
+    by its first value, and sums from the _period - 1 values before it,
+    so the sums stay small and do not lose precision as values drift.
+    Like MomentAccumulator, a window of the same values has exactly its
+    value as mean and 0 as variance
+
+    :param _period: length of window
+    :param _weighted: also sum the values weighted by their positions,
+        for RegressionAccumulator
+    """
+
+    def __init__(self, _period: int, _weighted: bool = False):
+        assert _period > 0
+
+        self.period = _period
+        self.weighted = _weighted
+        self.count = 0
+        self.buf: typing.Deque[float] = deque(maxlen=self.period)
+        # cumulative sums of value - shift, its square and its product
+        # with the position in block, from the values before block,
+        # the first is 0
+        self.shift = 0.0
+        self.sums: typing.List[float] = [0.0]
+        self.squares: typing.List[float] = [0.0]
+        self.weights: typing.List[float] = [0.0]
+        # number of the same values at the end
+        self.same = 0
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def _push(self, _value: float):
+        diff = _value - self.shift
+        if self.weighted:
+            pos = len(self.sums) - 1
+            self.weights.append(self.weights[-1] + pos * diff)
+        self.sums.append(self.sums[-1] + diff)
+        self.squares.append(self.squares[-1] + diff * diff)
+
+    def add(self, _value: float) -> 'SumAccumulator':
+        """
+        add _value, and remove the oldest one if the window is full
+
+        :param _value:
+        :return:
+        """
+        if self.count % self.period == 0:  # begin a new block
+            self.shift = _value
+            self.sums = [0.0]
+            self.squares = [0.0]
+            self.weights = [0.0]
+            # the values before block, which its first windows cover
+            for v in list(self.buf)[1:]:
+                self._push(v)
+        self._push(_value)
+
+        if self.buf and self.buf[-1] == _value:
+            self.same += 1
+        else:
+            self.same = 1
+        self.buf.append(_value)
+        self.count += 1
+        return self
+
+    def isConstant(self) -> bool:
+        """
+        whether the values in window are all the same
+
+        :return:
+        """
+        return 0 < len(self.buf) <= self.same
+
+    def _get_sums(self) -> typing.Tuple[float, float, float]:
+        # sums of value - shift, its square and its product with x in
+        # window, x = 0, 1, ..., n - 1
+        num = len(self.buf)
+        value_sum = self.sums[-1] - self.sums[-1 - num]
+        square_sum = self.squares[-1] - self.squares[-1 - num]
+        weight_sum = 0.0
+        if self.weighted:
+            begin = len(self.sums) - 1 - num
+            weight_sum = self.weights[-1] - self.weights[begin] - \
+                begin * value_sum
+        return value_sum, square_sum, weight_sum
+
+    def getMean(self) -> float:
+        if self.isConstant():
+            return self.buf[-1]
+        value_sum = self._get_sums()[0]
+        return value_sum / len(self.buf) + self.shift
+
+    def _get_m2(self) -> float:
+        # sum of (value - mean) ** 2
+        value_sum, square_sum, _ = self._get_sums()
+        return square_sum - value_sum * value_sum / len(self.buf)
+
+    def getVar(self, _ddof: int = 0) -> float:
+        """
+        variance of window, _ddof=0 is the same as statistics.pvariance
+
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        num = len(self.buf)
+        assert num > _ddof
+        if self.isConstant():
+            return 0.0
+        m2 = self._get_m2()
+        return (m2 if m2 > 0 else 0.0) / (num - _ddof)
+
+    def getStd(self, _ddof: int = 0) -> float:
+        """
+        std of window, _ddof=0 is the same as statistics.pstdev
+
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        return math.sqrt(self.getVar(_ddof))
+
+    def _roll(self, _values: typing.Sequence[float]) -> typing.Dict[
+        str, np.ndarray
+    ]:
+        # add _values, and return the sums of _get_sums() of the window
+        # ending at each of them, with its size, shift and whether the
+        # values are the same
+        values = np.array(_values, dtype=np.float64)
+        num = len(values)
+        period = self.period
+
+        # the values going on the current block
+        if self.count == 0:
+            first = min(period, num)
+            shift, sums, squares, weights = values[0], [0.0], [0.0], [0.0]
+        else:
+            first = min(-self.count % period, num)
+            shift, sums, squares, weights = \
+                self.shift, self.sums, self.squares, self.weights
+        diff = values[:first] - shift
+        pos = np.arange(len(sums) - 1, len(sums) - 1 + first)
+        if self.weighted:
+            weights = np.concatenate((weights, np.cumsum(
+                np.concatenate(([weights[-1]], pos * diff))
+            )[1:]))
+        sums = np.concatenate((sums, np.cumsum(
+            np.concatenate(([sums[-1]], diff))
+        )[1:]))
+        squares = np.concatenate((squares, np.cumsum(
+            np.concatenate(([squares[-1]], diff * diff))
+        )[1:]))
+        end = pos + 1
+        size = np.minimum(
+            np.arange(self.count + 1, self.count + first + 1), period
+        )
+        begin = end - size
+        value_sum = sums[end] - sums[begin]
+        square_sum = squares[end] - squares[begin]
+        weight_sum = np.zeros(first)
+        if self.weighted:
+            weight_sum = weights[end] - weights[begin] - begin * value_sum
+        shifts = np.full(first, shift)
+
+        # the new blocks, each from the period - 1 values before it
+        rest = values[first:]
+        if len(rest):
+            head = np.concatenate((
+                np.array(self.buf, dtype=np.float64), values[:first]
+            ))
+            head = head[max(0, len(head) - (period - 1)):]
+            blocks = (len(rest) + period - 1) // period
+            ext = np.concatenate((
+                head, rest, np.zeros(blocks * period - len(rest))
+            ))
+            rows = sliding_window_view(ext, 2 * period - 1)[::period]
+            block_shift = rest[::period]
+            diff = rows - block_shift[:, None]
+            pos = np.arange(2 * period - 1)
+            sums = np.zeros((blocks, 2 * period))
+            sums[:, 1:] = np.cumsum(diff, axis=1)
+            squares = np.zeros((blocks, 2 * period))
+            squares[:, 1:] = np.cumsum(diff * diff, axis=1)
+            block_sum = sums[:, period:] - sums[:, :period]
+            value_sum = np.concatenate((
+                value_sum, block_sum.ravel()[:len(rest)]
+            ))
+            square_sum = np.concatenate((
+                square_sum,
+                (squares[:, period:] - squares[:, :period]).ravel()[
+                    :len(rest)
+                ]
+            ))
+            if self.weighted:
+                weights = np.zeros((blocks, 2 * period))
+                weights[:, 1:] = np.cumsum(pos * diff, axis=1)
+                block_weight = weights[:, period:] - weights[:, :period] - \
+                    pos[:period] * block_sum
+                weight_sum = np.concatenate((
+                    weight_sum, block_weight.ravel()[:len(rest)]
+                ))
+            size = np.concatenate((size, np.full(len(rest), period)))
+            shifts = np.concatenate((
+                shifts, np.repeat(block_shift, period)[:len(rest)]
+            ))
+            # the state of the last block
+            shift = block_shift[-1]
+            last = period + len(rest) - (blocks - 1) * period
+            sums = sums[-1, :last]
+            squares = squares[-1, :last]
+            weights = weights[-1, :last] if self.weighted else [0.0]
+
+        # the number of the same values at the end of each
+        same_flag = np.empty(num, dtype=bool)
+        same_flag[0] = len(self.buf) > 0 and self.buf[-1] == values[0]
+        same_flag[1:] = values[1:] == values[:-1]
+        pos = np.arange(num)
+        changed = np.maximum.accumulate(np.where(same_flag, -1, pos))
+        same = np.where(changed >= 0, pos - changed + 1, pos + 1 + self.same)
+
+        self.shift = float(shift)
+        self.sums = np.asarray(sums).tolist()
+        self.squares = np.asarray(squares).tolist()
+        self.weights = np.asarray(weights).tolist()
+        self.same = int(same[-1])
+        self.buf.extend(values[max(0, num - period):].tolist())
+        self.count += num
+        return {
+            'values': values, 'value_sum': value_sum,
+            'square_sum': square_sum, 'weight_sum': weight_sum,
+            'size': size, 'shift': shifts, 'constant': same >= size,
+        }
+
+    def rolling(
+            self, _values: typing.Sequence[float]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        add _values, and return the mean and variance (_ddof=0) of the
+        window ending at each of them, bitwise the same as add() then
+        getMean() and getVar() one by one
+
+        :param _values:
+        :return: mean, variance
+        """
+        if not len(_values):
+            return np.zeros(0), np.zeros(0)
+        ret = self._roll(_values)
+        value_sum, size = ret['value_sum'], ret['size']
+        m2 = ret['square_sum'] - value_sum * value_sum / size
+        mean = np.where(
+            ret['constant'], ret['values'], value_sum / size + ret['shift']
+        )
+        var = np.where(
+            ret['constant'], 0.0, np.where(m2 > 0, m2, 0.0) / size
+        )
+        return mean, var
+
+
+class ExtremumAccumulator:
+    """
+    running max or min of the last _period values by a monotonic queue,
+    which only keeps the values that may become the extremum later, so
+    each value is added in O(1) amortized however long the window is.
+    The position of extremum is kept as well, like argmax and argmin
+
+    :param _period: length of window
+    :param _is_max: max if True, else min
+    """
+
+    def __init__(self, _period: int, _is_max: bool = True):
+        assert _period > 0
+
+        self.period = _period
+        self.is_max = _is_max
+        # (count when added, value), values are decreasing for max
+        self.queue: typing.Deque[typing.Tuple[int, float]] = deque()
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.period)
+
+    def add(self, _value: float) -> 'ExtremumAccumulator':
+        """
+        add _value, and remove the oldest one if the window is full
+
+        :param _value:
+        :return:
+        """
+        queue = self.queue
+        # the earliest one is kept if equal, the same as argmax
+        if self.is_max:
+            while queue and queue[-1][1] < _value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] > _value:
+                queue.pop()
+        queue.append((self.count, _value))
+        self.count += 1
+        if queue[0][0] <= self.count - 1 - self.period:
+            queue.popleft()
+        return self
+
+    def extend(
+            self, _values: typing.Sequence[float]
+    ) -> 'ExtremumAccumulator':
+        """
+        add _values in order, only the last _period of them are added,
+        because the others would be removed anyway
+
+        :param _values:
+        :return:
+        """
+        skip = max(0, len(_values) - self.period)
+        if skip:
+            self.queue.clear()
+            self.count += skip
+        for v in _values[skip:]:
+            self.add(v)
+        return self
+
+    def getWindow(self) -> typing.List[float]:
+        """
+        the values in window, the ones not in queue can never be the
+        extremum again, so they are -inf for max (inf for min), which
+        gives the same rolling extremum of the values added later
+
+        :return: oldest first
+        """
+        fill = -math.inf if self.is_max else math.inf
+        begin = self.count - len(self)
+        window = [fill] * len(self)
+        for count, value in self.queue:
+            window[count - begin] = value
+        return window
+
+    def getValue(self) -> float:
+        return self.queue[0][1]
+
+    def getArg(self) -> int:
+        """
+        position of the extremum in window, 0 is the oldest value
+
+        :return:
+        """
+        return self.queue[0][0] - max(self.count - self.period, 0)
+
+
+class RegressionAccumulator(SumAccumulator):
+    """
+    running OLS of the last _period values on x = 0, 1, ..., n - 1,
+    the x axis is fixed, so the sum of x * value is kept by cumulative
+    sums like SumAccumulator, and rolling() is bitwise the same as add()
+    then the getters one by one
+
+    :param _period: length of window
+    """
+
+    def __init__(self, _period: int):
+        super().__init__(_period, _weighted=True)
+
+    def _get_cov(self) -> float:
+        # sum of (x - mean_x) * value
+        value_sum, _, weight_sum = self._get_sums()
+        return weight_sum - (len(self.buf) - 1) / 2 * value_sum
+
+    def _get_var_x(self) -> float:
+        # sum of (x - mean_x) ** 2
+        num = len(self.buf)
+        return num * (num * num - 1) / 12
+
+    def getSlope(self) -> float:
+        assert len(self.buf) > 1
+        if self.isConstant():
+            return 0.0
+        return self._get_cov() / self._get_var_x()
+
+    def getIntercept(self) -> float:
+        return self.getMean() - self.getSlope() * (len(self.buf) - 1) / 2
+
+    def getR2(self) -> float:
+        """
+        r square of fitting, nan if the values are the same
+
+        :return:
+        """
+        assert len(self.buf) > 1
+        m2 = self._get_m2()
+        if m2 <= 0 or self.isConstant():
+            return float('nan')
+        cov = self._get_cov()
+        return min(cov * cov / (self._get_var_x() * m2), 1.0)
+
+    def rolling(
+            self, _values: typing.Sequence[float]
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        add _values, and return the slope, intercept and r square of the
+        window ending at each of them, the windows of 1 value have slope 0
+        and r square nan
+
+        :param _values:
+        :return: slope, intercept, r square
+        """
+        if not len(_values):
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        ret = self._roll(_values)
+        value_sum, size = ret['value_sum'], ret['size']
+        constant = ret['constant']
+        m2 = ret['square_sum'] - value_sum * value_sum / size
+        cov = ret['weight_sum'] - (size - 1) / 2 * value_sum
+        var_x = size * (size * size - 1) / 12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(constant, 0.0, cov / var_x)
+            r2 = np.where(
+                constant | (m2 <= 0), np.nan,
+                np.minimum(cov * cov / (var_x * m2), 1.0)
+            )
+        mean = np.where(
+            constant, ret['values'], value_sum / size + ret['shift']
+        )
+        intercept = mean - slope * (size - 1) / 2
+        return slope, intercept, r2
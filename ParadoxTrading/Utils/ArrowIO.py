@@ -0,0 +1,146 @@
+import typing
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ParadoxTrading.Utils.Column import Column
+from ParadoxTrading.Utils.DataStruct import DataStruct
+
+# the key of schema metadata to keep index name
+INDEX_META_KEY = b'paradox_index'
+
+
+def _to_arrow_array(_column: typing.Sequence) -> pa.Array:
+    if not isinstance(_column, Column):
+        _column = Column(_column)
+    values = _column.values()
+    if values.dtype.kind == 'O':
+        # str and others, let arrow infer the type
+        return pa.array(values.tolist())
+    return pa.array(values)
+
+
+def _from_arrow_array(
+        _array: typing.Union[pa.Array, pa.ChunkedArray]
+) -> np.ndarray:
+    values = _array.to_numpy(zero_copy_only=False)
+    if values.dtype.kind == 'M':
+        values = values.astype('M8[us]')
+    return values
+
+
+def toArrow(
+        _struct: DataStruct, _columns: typing.Sequence[str] = None
+) -> pa.Table:
+    """
+    turn datastruct into arrow table, the index name is kept
+    in the metadata of schema
+
+    :param _struct:
+    :param _columns: columns to export, index is always exported
+    :return:
+    """
+    names = list(_struct.data.keys()) if _columns is None else list(_columns)
+    if _struct.index_name not in names:
+        names.append(_struct.index_name)
+    table = pa.Table.from_arrays(
+        [_to_arrow_array(_struct.data[k]) for k in names], names=names
+    )
+    return table.replace_schema_metadata({
+        INDEX_META_KEY: _struct.index_name.encode('utf-8')
+    })
+
+
+def toRecordBatches(
+        _struct: DataStruct, _batch_size: int = 65536
+) -> typing.List[pa.RecordBatch]:
+    """
+    turn datastruct into arrow record batches of _batch_size rows
+
+    :param _struct:
+    :param _batch_size:
+    :return:
+    """
+    return toArrow(_struct).to_batches(max_chunksize=_batch_size)
+
+
+def fromArrow(
+        _table: typing.Union[pa.Table, pa.RecordBatch],
+        _index_name: str = None,
+        _columnar: bool = True
+) -> DataStruct:
+    """
+    create datastruct from arrow table or record batch,
+    the rows should be sorted by index
+
+    :param _table:
+    :param _index_name: if None, read from the metadata of schema
+    :param _columnar: create columnar datastruct
+    :return:
+    """
+    if _index_name is None:
+        _index_name = _table.schema.metadata[INDEX_META_KEY].decode('utf-8')
+    columns = {}
+    for name in _table.schema.names:
+        values = _from_arrow_array(_table.column(name))
+        columns[name] = values if _columnar else values.tolist()
+    return DataStruct.fromColumns(columns, _index_name, _columnar)
+
+
+def saveParquet(
+        _struct: DataStruct, _path: str,
+        _compression: str = 'zstd', _row_group_size: int = 65536
+):
+    """
+    save datastruct into parquet file, each row group has the statistics
+    of index, so loadParquet only reads the row groups in range
+
+    :param _struct:
+    :param _path:
+    :param _compression: compression codec of parquet
+    :param _row_group_size: rows of each row group
+    """
+    pq.write_table(
+        toArrow(_struct), _path,
+        compression=_compression, row_group_size=_row_group_size
+    )
+
+
+def loadParquet(
+        _path: str,
+        _begin: typing.Any = None, _end: typing.Any = None,
+        _columns: typing.Sequence[str] = None,
+        _columnar: bool = True
+) -> DataStruct:
+    """
+    load parquet file saved by saveParquet, only _columns are read,
+    and the range [_begin, _end) of index is pushed down to filter
+    row groups
+
+    :param _path:
+    :param _begin: begin index value, included
+    :param _end: end index value, excluded
+    :param _columns: columns to load, index is always loaded
+    :param _columnar: create columnar datastruct
+    :return:
+    """
+    schema = pq.read_schema(_path)
+    index_name = schema.metadata[INDEX_META_KEY].decode('utf-8')
+
+    names = _columns
+    if names is not None:
+        names = list(names)
+        if index_name not in names:
+            names.append(index_name)
+
+    filters = []
+    if _begin is not None:
+        filters.append((index_name, '>=', _begin))
+    if _end is not None:
+        filters.append((index_name, '<', _end))
+
+    table = pq.read_table(
+        _path, columns=names, filters=filters if filters else None
+    )
+    return fromArrow(table, index_name, _columnar)
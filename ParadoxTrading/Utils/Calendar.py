@@ -0,0 +1,100 @@
+import typing
+from bisect import bisect_left
+from datetime import date, timedelta
+
+
+class DateBucket:
+    """
+    find the week, month or year of tradingday 'YYYYMMDD', the boundaries
+    are calculated by integers instead of parsing strings, and memoized
+    for each tradingday, so splitting daily data only calculates once
+    per day. The shared buckets are got by DateBucket.shared(_freq)
+
+    :param _freq: WEEK, MONTH or YEAR
+    """
+
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+    _shared: typing.Dict[str, 'DateBucket'] = {}
+
+    def __init__(self, _freq: str):
+        assert _freq in (self.WEEK, self.MONTH, self.YEAR)
+        self.freq = _freq
+        self.cache: typing.Dict[str, typing.Tuple[str, str]] = {}
+
+    @staticmethod
+    def shared(_freq: str) -> 'DateBucket':
+        """
+        get the bucket of _freq shared by all date spliters
+
+        :param _freq:
+        :return:
+        """
+        try:
+            return DateBucket._shared[_freq]
+        except KeyError:
+            bucket = DateBucket(_freq)
+            DateBucket._shared[_freq] = bucket
+            return bucket
+
+    def _calc(self, _tradingday: str) -> typing.Tuple[str, str]:
+        year = int(_tradingday[:4])
+        if self.freq == self.YEAR:
+            return '{:04d}0101'.format(year), '{:04d}0101'.format(year + 1)
+        month = int(_tradingday[4:6])
+        if self.freq == self.MONTH:
+            if month == 12:
+                return '{:04d}1201'.format(year), '{:04d}0101'.format(year + 1)
+            return (
+                '{:04d}{:02d}01'.format(year, month),
+                '{:04d}{:02d}01'.format(year, month + 1)
+            )
+        cur_date = date(year, month, int(_tradingday[6:8]))
+        begin_date = cur_date - timedelta(days=cur_date.weekday())
+        end_date = begin_date + timedelta(weeks=1)
+        return begin_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')
+
+    def getBeginEnd(self, _tradingday: str) -> typing.Tuple[str, str]:
+        """
+        get the begin (included) and end (excluded) of the bucket
+
+        :param _tradingday: 'YYYYMMDD'
+        :return:
+        """
+        try:
+            return self.cache[_tradingday]
+        except KeyError:
+            ret = self._calc(_tradingday)
+            self.cache[_tradingday] = ret
+            return ret
+
+
+class TradingDayBucket(DateBucket):
+    """
+    the bucket begins at the first tradingday of week, month or year,
+    and ends at the first tradingday of the next one, so the begin time
+    of bars are always tradingdays. The tradingdays can be fetched by
+    FetchBase.fetchTradingDayList()
+
+    :param _freq: WEEK, MONTH or YEAR
+    :param _tradingday_list: sorted tradingdays 'YYYYMMDD'
+    """
+
+    def __init__(
+            self, _freq: str, _tradingday_list: typing.Sequence[str]
+    ):
+        super().__init__(_freq)
+        self.tradingday_list: typing.List[str] = list(_tradingday_list)
+
+    def _first_tradingday(self, _day: str) -> str:
+        # the first tradingday >= _day, or _day if out of the list
+        i = bisect_left(self.tradingday_list, _day)
+        if i < len(self.tradingday_list):
+            return self.tradingday_list[i]
+        return _day
+
+    def _calc(self, _tradingday: str) -> typing.Tuple[str, str]:
+        begin, end = super()._calc(_tradingday)
+        return self._first_tradingday(begin), self._first_tradingday(end)
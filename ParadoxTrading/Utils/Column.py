@@ -0,0 +1,426 @@
+import typing
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+_KIND_DTYPE = {
+    'b': np.dtype(np.bool_),
+    'i': np.dtype(np.int64),
+    'f': np.dtype(np.float64),
+    'M': np.dtype('M8[us]'),
+    'O': np.dtype(object),
+}
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+# the kinds decided by type only, to skip the isinstance checks
+_TYPE_KIND = {
+    bool: 'b', np.bool_: 'b',
+    float: 'f', np.float64: 'f', np.float32: 'f',
+    str: 'O', type(None): 'O',
+}
+
+
+def _value_kind(_value: typing.Any) -> str:
+    """
+    map one python value to the kind of column able to store it
+
+    :param _value:
+    :return: one of 'b', 'i', 'f', 'M', 'O'
+    """
+    kind = _TYPE_KIND.get(type(_value))
+    if kind is not None:
+        return kind
+    if isinstance(_value, (bool, np.bool_)):
+        return 'b'
+    if isinstance(_value, (int, np.integer)):
+        if _INT64_MIN <= _value <= _INT64_MAX:
+            return 'i'
+        return 'O'
+    if isinstance(_value, (float, np.floating)):
+        return 'f'
+    if isinstance(_value, datetime) and _value.tzinfo is None:
+        return 'M'
+    return 'O'
+
+
+def _seq_kind(_values: typing.Sequence) -> str:
+    """
+    the kind of column able to store all the values, the types are
+    collected first, so only the types not decided by themselves
+    (large int, datetime with tzinfo) need to check the values
+
+    :param _values:
+    :return:
+    """
+    kind = None
+    for t in set(map(type, _values)):
+        if issubclass(t, (bool, np.bool_)):
+            t_kind = 'b'
+        elif issubclass(t, (int, np.integer)):
+            t_kind = 'i'
+        elif issubclass(t, (float, np.floating)):
+            t_kind = 'f'
+        elif issubclass(t, datetime):
+            t_kind = 'M'
+        else:
+            return 'O'
+        kind = t_kind if kind is None else _merge_kind(kind, t_kind)
+        if kind == 'O':
+            return kind
+    if kind == 'i':
+        if not _INT64_MIN <= min(_values) <= max(_values) <= _INT64_MAX:
+            return 'O'
+    if kind == 'M':
+        if any(v.tzinfo is not None for v in _values):
+            return 'O'
+    return kind
+
+
+def _to_array(_values: typing.Sequence, _kind: str) -> np.ndarray:
+    """
+    convert python values of _kind to numpy array,
+    pandas is much faster to convert datetime
+    """
+    if _kind == 'M':
+        try:
+            return pd.DatetimeIndex(_values).values.astype('M8[us]')
+        except (ValueError, OverflowError, pd.errors.OutOfBoundsDatetime):
+            pass
+    if _kind == 'O':
+        # avoid numpy turning sequences in values into more dimensions
+        array = np.empty(len(_values), dtype=object)
+        for i, v in enumerate(_values):
+            array[i] = v
+        return array
+    return np.array(_values, dtype=_KIND_DTYPE[_kind])
+
+
+def _merge_kind(_kind_a: str, _kind_b: str) -> str:
+    """
+    the kind able to store both kinds, int is upcast to float,
+    any other mix falls back to object
+    """
+    if _kind_a == _kind_b:
+        return _kind_a
+    if {_kind_a, _kind_b} == {'i', 'f'}:
+        return 'f'
+    return 'O'
+
+
+def _array_kind(_array: np.ndarray) -> str:
+    kind = _array.dtype.kind
+    if kind == 'u':
+        return 'i' if _array.dtype.itemsize < 8 else 'O'
+    if kind in 'bifM':
+        return kind
+    return 'O'
+
+
+class Column:
+    """
+    a growable column backed by a typed numpy array, it is the storage
+    of the columnar DataStruct. Values are kept as bool, int64, float64
+    or datetime64[us] if possible, and the column is upcast to float64
+    or object when a value does not fit.
+
+    Getting one item returns a python object (float, int, datetime ...),
+    so the columnar DataStruct behaves like the list one.
+
+    :param _values: init values, a sequence or a numpy array
+    """
+
+    INIT_CAPACITY = 16
+
+    def __init__(self, _values: typing.Sequence = None):
+        self.buf: np.ndarray = None
+        self.size: int = 0
+
+        if _values is not None:
+            self.extend(_values)
+
+    @property
+    def dtype(self) -> typing.Union[None, np.dtype]:
+        return None if self.buf is None else self.buf.dtype
+
+    def values(self) -> np.ndarray:
+        """
+        return the valid part of buffer as numpy array, it is a view,
+        so do not modify it
+
+        :return:
+        """
+        if self.buf is None:
+            return np.empty(0, dtype=object)
+        return self.buf[:self.size]
+
+    def tolist(self) -> list:
+        return self.values().tolist()
+
+    def _reserve(self, _size: int):
+        """
+        make sure the capacity is enough for _size items,
+        grow the buffer by doubling
+        """
+        capacity = len(self.buf)
+        if capacity >= _size:
+            return
+        new_capacity = max(self.INIT_CAPACITY, capacity * 2, _size)
+        new_buf = np.empty(new_capacity, dtype=self.buf.dtype)
+        new_buf[:self.size] = self.buf[:self.size]
+        self.buf = new_buf
+
+    def _as_kind(self, _kind: str):
+        """
+        make sure the buffer is able to store values of _kind
+        """
+        if self.buf is None:
+            self.buf = np.empty(self.INIT_CAPACITY, dtype=_KIND_DTYPE[_kind])
+            return
+        cur_kind = self.buf.dtype.kind
+        new_kind = _merge_kind(cur_kind, _kind)
+        if new_kind == cur_kind:
+            return
+        new_buf = np.empty(len(self.buf), dtype=_KIND_DTYPE[new_kind])
+        if new_kind == 'O':
+            # keep python objects, eg. datetime instead of datetime64
+            new_buf[:self.size] = self.tolist()
+        else:
+            new_buf[:self.size] = self.buf[:self.size]
+        self.buf = new_buf
+
+    def _store(self, _index: int, _value: typing.Any, _kind: str):
+        """
+        set one value into buffer, datetime is stored as int64 microseconds
+        directly, which is much faster than numpy converting it
+        """
+        if _kind == 'M' and self.buf.dtype.kind == 'M':
+            self.buf.view(np.int64)[_index] = (_value - _EPOCH) // _MICROSECOND
+        else:
+            self.buf[_index] = _value
+
+    def append(self, _value: typing.Any):
+        kind = _value_kind(_value)
+        if self.buf is None or kind != self.buf.dtype.kind:
+            self._as_kind(kind)
+        if self.size == len(self.buf):
+            self._reserve(self.size + 1)
+        self._store(self.size, _value, kind)
+        self.size += 1
+
+    def insert(self, _index: int, _value: typing.Any):
+        if _index < 0:
+            _index = max(0, _index + self.size)
+        if _index >= self.size:
+            self.append(_value)
+            return
+        kind = _value_kind(_value)
+        self._as_kind(kind)
+        self._reserve(self.size + 1)
+        self.buf[_index + 1:self.size + 1] = self.buf[_index:self.size]
+        self._store(_index, _value, kind)
+        self.size += 1
+
+    def extend(self, _values: typing.Sequence):
+        if isinstance(_values, Column):
+            _values = _values.values()
+        if not len(_values):
+            return
+        if isinstance(_values, np.ndarray):
+            kind = _array_kind(_values)
+            if kind == 'M':
+                _values = _values.astype('M8[us]')
+        else:
+            kind = _seq_kind(_values)
+            _values = _to_array(_values, kind)
+
+        self._as_kind(kind)
+        num = len(_values)
+        self._reserve(self.size + num)
+        if isinstance(_values, np.ndarray) and self.buf.dtype.kind == 'O' \
+                and _values.dtype.kind != 'O':
+            _values = _values.tolist()
+        self.buf[self.size:self.size + num] = _values
+        self.size += num
+
+    def bisectLeft(self, _value: typing.Any) -> int:
+        return int(np.searchsorted(
+            self.values(), self._search_key(_value), 'left'
+        ))
+
+    def bisectRight(self, _value: typing.Any) -> int:
+        return int(np.searchsorted(
+            self.values(), self._search_key(_value), 'right'
+        ))
+
+    def _search_key(self, _value: typing.Any) -> typing.Any:
+        if self.buf is not None and self.buf.dtype.kind == 'M' \
+                and isinstance(_value, datetime):
+            return np.datetime64(_value, 'us')
+        return _value
+
+    def _check_index(self, _index: int) -> int:
+        if _index < 0:
+            _index += self.size
+        if not 0 <= _index < self.size:
+            raise IndexError('column index out of range')
+        return _index
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __reversed__(self):
+        return reversed(self.tolist())
+
+    def __getitem__(self, _item: typing.Union[int, slice]):
+        """
+        get one item as python object, or a copy of slice as a new column
+
+        :param _item:
+        :return:
+        """
+        if isinstance(_item, slice):
+            return Column(self.values()[_item].copy())
+        value = self.buf[self._check_index(_item)]
+        if self.buf.dtype.kind == 'O':
+            return value
+        return value.item()
+
+    def __setitem__(self, _index: int, _value: typing.Any):
+        _index = self._check_index(_index)
+        kind = _value_kind(_value)
+        self._as_kind(kind)
+        self._store(_index, _value, kind)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.values()
+        return self.values().astype(dtype)
+
+    def __getstate__(self) -> dict:
+        # do not store the unused capacity
+        return {'buf': None if self.buf is None else self.values().copy()}
+
+    def __setstate__(self, _state: dict):
+        self.buf = _state['buf']
+        self.size = 0 if self.buf is None else len(self.buf)
+
+    def __repr__(self) -> str:
+        return 'Column({})'.format(self.tolist())
+
+
+class RingColumn(Column):
+    """
+    a column keeping only the last _max_len values, the oldest values are
+    dropped when new ones are added. The valid values are kept contiguous
+    in buffer from self.begin, and moved to the front only when the end of
+    buffer is reached, the buffer is twice of _max_len when full, so adding
+    is still amortized O(1) and values() is a view like Column
+
+    :param _max_len: max number of values to keep
+    :param _values: init values, only the last _max_len are kept
+    """
+
+    def __init__(self, _max_len: int, _values: typing.Sequence = None):
+        assert _max_len > 0
+        self.max_len = _max_len
+        self.begin: int = 0
+        # number of values dropped out of _max_len
+        self.dropped: int = 0
+        super().__init__(_values)
+
+    def values(self) -> np.ndarray:
+        if self.buf is None:
+            return np.empty(0, dtype=object)
+        return self.buf[self.begin:self.begin + self.size]
+
+    def _compact(self):
+        # move the values to the front of buffer
+        if self.begin:
+            self.buf[:self.size] = self.buf[self.begin:self.begin + self.size]
+            self.begin = 0
+
+    def _trim(self):
+        # drop the oldest values out of _max_len
+        if self.size > self.max_len:
+            self.dropped += self.size - self.max_len
+            self.begin += self.size - self.max_len
+            self.size = self.max_len
+
+    def _reserve(self, _size: int):
+        if self.begin + _size <= len(self.buf):
+            return
+        self._compact()
+        if _size > self.max_len:
+            _size = max(_size, 2 * self.max_len)
+        super()._reserve(_size)
+
+    def _as_kind(self, _kind: str):
+        if self.buf is not None and self.buf.dtype.kind != _kind:
+            self._compact()
+        super()._as_kind(_kind)
+
+    def _store(self, _index: int, _value: typing.Any, _kind: str):
+        super()._store(self.begin + _index, _value, _kind)
+
+    def append(self, _value: typing.Any):
+        kind = _value_kind(_value)
+        if self.buf is None or kind != self.buf.dtype.kind:
+            self._as_kind(kind)
+        if self.begin + self.size == len(self.buf):
+            self._reserve(self.size + 1)
+        self._store(self.size, _value, kind)
+        self.size += 1
+        self._trim()
+
+    def insert(self, _index: int, _value: typing.Any):
+        if self.buf is not None:
+            self._compact()
+        super().insert(_index, _value)
+        self._trim()
+
+    def extend(self, _values: typing.Sequence):
+        if isinstance(_values, Column):
+            _values = _values.values()
+        if len(_values) >= self.max_len:
+            # the values in self are all dropped
+            self.dropped += self.size + len(_values) - self.max_len
+            _values = _values[len(_values) - self.max_len:]
+            self.begin = 0
+            self.size = 0
+        if self.buf is not None:
+            self._compact()
+        super().extend(_values)
+        self._trim()
+
+    def __getitem__(self, _item: typing.Union[int, slice]):
+        if isinstance(_item, slice):
+            return Column(self.values()[_item].copy())
+        value = self.buf[self.begin + self._check_index(_item)]
+        if self.buf.dtype.kind == 'O':
+            return value
+        return value.item()
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state['max_len'] = self.max_len
+        state['dropped'] = self.dropped
+        return state
+
+    def __setstate__(self, _state: dict):
+        super().__setstate__(_state)
+        self.max_len = _state['max_len']
+        self.begin = 0
+        self.dropped = _state.get('dropped', 0)
+
+    def __repr__(self) -> str:
+        return 'RingColumn({}, {})'.format(self.max_len, self.tolist())
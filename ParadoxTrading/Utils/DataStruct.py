@@ -2,10 +2,73 @@ import pickle
 from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import tabulate
 import typing
 
+from ParadoxTrading.Utils.Column import Column, RingColumn
+from ParadoxTrading.Utils.DataStructIO import readColumns, writeColumns
+from ParadoxTrading.Utils.Rolling import Rolling, resampleColumns
+
+
+def _to_array(_column: typing.Sequence) -> np.ndarray:
+    if isinstance(_column, Column):
+        return _column.values()
+    return np.array(_column)
+
+
+def _search_arrays(
+        _a: np.ndarray, _b: np.ndarray
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    make two index arrays comparable, datetime64 is turned into python
+    datetime if the other one is object
+    """
+    # the dtype of empty array is meaningless
+    if not len(_a):
+        return _a.astype(_b.dtype), _b
+    if not len(_b):
+        return _a, _b.astype(_a.dtype)
+    if _a.dtype != _b.dtype and 'O' in (_a.dtype.kind, _b.dtype.kind):
+        return _a.astype(object), _b.astype(object)
+    return _a, _b
+
+
+def _find_first(
+        _sorted: np.ndarray, _values: np.ndarray
+) -> np.ndarray:
+    """
+    the number of the first row of each value in _sorted, -1 if not found
+    """
+    pos = np.searchsorted(_sorted, _values, 'left')
+    if not len(_sorted):
+        return np.full(len(_values), -1, dtype=np.int64)
+    found = pos < len(_sorted)
+    found[found] = _sorted[pos[found]] == _values[found]
+    return np.where(found, pos, -1)
+
+
+def _take(
+        _column: typing.Sequence, _pos: np.ndarray, _to_list: bool = False
+) -> typing.Union[typing.List, np.ndarray]:
+    """
+    pick values from column by number, -1 means missing and becomes None.
+    If _to_list, always return a list of python values, for the list mode
+    """
+    missing = _pos < 0
+    if missing.all():
+        return [None] * len(_pos)
+    if isinstance(_column, Column):
+        if not missing.any():
+            values = _column.values()[_pos]
+            return values.tolist() if _to_list else values
+        values = _column.values()[np.where(missing, 0, _pos)].tolist()
+        for i in np.flatnonzero(missing).tolist():
+            values[i] = None
+        return values
+    return [None if i < 0 else _column[i] for i in _pos.tolist()]
+
 
 class DataStruct:
     """
@@ -15,30 +78,59 @@ class DataStruct:
     :param _index_name: the index of this datastruct
     :param _rows: init data, add as rows
     :param _dicts: init data, add as dicts
+    :param _columnar: store each column as a typed numpy array (Column)
+        instead of a python list, it uses much less memory and appending
+        is amortized O(1), the api is the same as the list mode
+    :param _hash_index: keep a hash map from index value to the number of
+        its first row, so loc by one index value is O(1). The map is built
+        when needed, and rebuilt after rows inserted before the end
+    :param _max_len: keep only the last _max_len rows, the columns are
+        ring buffers (RingColumn), so it is always columnar
 
     """
 
     EXPAND_STRICT = 'strict'
     EXPAND_INTERSECT = 'intersect'
 
+    JOIN_INNER = 'inner'
+    JOIN_OUTER = 'outer'
+    JOIN_LEFT = 'left'
+    JOIN_ASOF = 'asof'
+
     def __init__(
             self,
             _keys: typing.Sequence[str],
             _index_name: str,
             _rows: typing.Sequence[typing.Sequence] = None,
-            _dicts: typing.Sequence[dict] = None
+            _dicts: typing.Sequence[dict] = None,
+            _columnar: bool = False,
+            _hash_index: bool = False,
+            _max_len: int = None
     ):
         assert _index_name in _keys
+        assert _max_len is None or _max_len > 0
 
         self.index_name = _index_name
-        self.data: typing.Dict[str, typing.List] = {}
+        self.columnar = _columnar or _max_len is not None
+        self.hash_index = _hash_index
+        self.max_len = _max_len
+        # map index value to the number of its first row
+        self._index_map: typing.Dict[typing.Any, int] = None
+        self.data: typing.Dict[
+            str, typing.Union[typing.List, Column]
+        ] = {}
         for key in _keys:
-            self.data[key] = []
+            self.data[key] = self._new_column()
 
         # this is the slice by index value
         self.loc: Loc = Loc(self)
         # this is the slice by number
         self.iloc: ILoc = ILoc(self)
+        # read-only views referring to self, without copying data
+        self.lview: LView = LView(self)
+        self.iview: IView = IView(self)
+        # map key to position in TickRecord, shared by all records
+        self._record_pos: typing.Dict[str, int] = None
 
         if _rows is not None:
             self.addRows(_rows, _keys)
@@ -46,6 +138,106 @@ class DataStruct:
         if _dicts is not None:
             self.addDicts(_dicts)
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # accessors and cache are rebuilt when loaded
+        for k in (
+                'loc', 'iloc', 'lview', 'iview', '_record_pos', '_index_map'
+        ):
+            state.pop(k, None)
+        return state
+
+    def __setstate__(self, _state: dict):
+        self.__dict__.update(_state)
+        # the datastruct pickled by older version is list mode
+        self.__dict__.setdefault('columnar', False)
+        self.__dict__.setdefault('hash_index', False)
+        self.__dict__.setdefault('max_len', None)
+        self.loc = Loc(self)
+        self.iloc = ILoc(self)
+        self.lview = LView(self)
+        self.iview = IView(self)
+        self._record_pos = None
+        self._index_map = None
+
+    def _new_column(
+            self, _values: typing.Sequence = None
+    ) -> typing.Union[typing.List, Column]:
+        """
+        create an empty column (or from _values) according to the mode
+
+        :param _values:
+        :return:
+        """
+        if self.max_len is not None:
+            return RingColumn(self.max_len, _values)
+        if self.columnar:
+            return Column(_values)
+        return [] if _values is None else list(_values)
+
+    def _bisect_right(self, _value: typing.Any) -> int:
+        index = self.index()
+        if self.columnar:
+            return index.bisectRight(_value)
+        return bisect_right(index, _value)
+
+    def _bisect_left(self, _value: typing.Any) -> int:
+        index = self.index()
+        if self.columnar:
+            return index.bisectLeft(_value)
+        return bisect_left(index, _value)
+
+    def setHashIndex(self, _flag: bool = True) -> 'DataStruct':
+        """
+        enable or disable the hash index, see _hash_index
+
+        :param _flag:
+        :return: self
+        """
+        self.hash_index = _flag
+        self._index_map = None
+        return self
+
+    def setMaxLen(self, _max_len: int) -> 'DataStruct':
+        """
+        keep only the last _max_len rows from now on, see _max_len.
+        The rows out of _max_len are dropped at once
+
+        :param _max_len:
+        :return: self
+        """
+        assert _max_len > 0
+        self.columnar = True
+        self.max_len = _max_len
+        self._index_map = None
+        for k, v in self.data.items():
+            self.data[k] = self._new_column(v)
+        return self
+
+    def _get_index_map(self) -> typing.Dict[typing.Any, int]:
+        if self._index_map is None:
+            index = self.index()
+            num = len(index)
+            # reversed, so the first row of the same value is kept
+            self._index_map = dict(zip(
+                reversed(index), range(num - 1, -1, -1)
+            ))
+        return self._index_map
+
+    def _find(self, _value: typing.Any) -> typing.Union[None, int]:
+        """
+        find the number of the first row whose index is _value
+
+        :param _value:
+        :return: None if not found
+        """
+        if self.hash_index:
+            return self._get_index_map().get(_value)
+        n_i = self._bisect_left(_value)
+        if n_i != len(self) and _value == self.index()[n_i]:
+            return n_i
+        return None
+
     def __getitem__(self, _item: str) -> typing.List[typing.Any]:
         """
         get one column of data
@@ -66,11 +258,50 @@ class DataStruct:
 
     def __iter__(self):
         """
-        iter the row one by one
+        iter the row one by one, each row is a new datastruct,
+        iterRows() is much cheaper if rows are only read
         """
         for i in range(len(self.index())):
             yield self.iloc[i]
 
+    def _get_record_pos(self) -> typing.Dict[str, int]:
+        if self._record_pos is None:
+            self._record_pos = {
+                k: i for i, k in enumerate(self.data.keys())
+            }
+        return self._record_pos
+
+    def iterRows(
+            self, _start: int = None, _stop: int = None
+    ) -> typing.Iterator['TickRecord']:
+        """
+        iter the rows in [_start, _stop) as TickRecord,
+        all records share the same map of keys
+
+        :param _start:
+        :param _stop:
+        :return:
+        """
+        pos = self._get_record_pos()
+        index_name = self.index_name
+        item = slice(_start, _stop)
+        columns = [v[item] for v in self.data.values()]
+        for values in zip(*columns):
+            yield TickRecord(pos, index_name, values)
+
+    def iterChunks(
+            self, _size: int
+    ) -> typing.Iterator['DataStructView']:
+        """
+        iter the rows by views of _size rows, the last one may be shorter
+
+        :param _size:
+        :return:
+        """
+        assert _size > 0
+        for start in range(0, len(self), _size):
+            yield self.iview[start:start + _size]
+
     def __repr__(self):
         """
         print the data as a table by tabulate
@@ -85,6 +316,26 @@ class DataStruct:
         tmp_rows, tmp_keys = self.toRows()
         return tabulate.tabulate(tmp_rows, headers=tmp_keys)
 
+    def _is_append(self, _index_value: typing.Any) -> bool:
+        """
+        whether the index value is not less than the last index,
+        so the row can be appended to the end without bisect
+
+        :param _index_value:
+        :return:
+        """
+        index = self.index()
+        return not len(index) or index[-1] <= _index_value
+
+    def _append_index_map(self, _index_value: typing.Any):
+        # update the built map when a row is appended to the end
+        if self._index_map is not None:
+            if self.max_len is not None and len(self) >= self.max_len:
+                # the numbers of rows shift when the first row is dropped
+                self._index_map = None
+            else:
+                self._index_map.setdefault(_index_value, len(self))
+
     def addRow(
             self,
             _row: typing.Sequence[typing.Any],
@@ -96,8 +347,17 @@ class DataStruct:
         :param _row: list of data to be added
         :param _keys: list of key
         """
-        assert len(_row) == len(_keys)
-        self.addDict(dict(zip(_keys, _row)))
+        assert len(_row) == len(_keys) == len(self.data)
+        index_value = _row[_keys.index(self.index_name)]
+        if self._is_append(index_value):
+            self._append_index_map(index_value)
+            for k, v in zip(_keys, _row):
+                self.data[k].append(v)
+        else:
+            self._index_map = None
+            insert_idx = self._bisect_right(index_value)
+            for k, v in zip(_keys, _row):
+                self.data[k].insert(insert_idx, v)
 
     def addRows(
             self,
@@ -105,13 +365,36 @@ class DataStruct:
             _keys: typing.Sequence[str]
     ):
         """
-        add multi rows like addRow
+        add multi rows like addRow, if the rows are sorted by index
+        and not before the last index of self, they are transposed
+        and extended to the columns at once
 
         :param _rows:
         :param _keys:
         """
-        for row in _rows:
-            self.addRow(row, _keys)
+        if not len(_rows):
+            return
+        assert len(_keys) == len(self.data)
+        index_pos = list(_keys).index(self.index_name)
+
+        # check whether all rows can be appended
+        sorted_flag = self._is_append(_rows[0][index_pos])
+        if sorted_flag:
+            last_value = _rows[0][index_pos]
+            for row in _rows:
+                cur_value = row[index_pos]
+                if cur_value < last_value:
+                    sorted_flag = False
+                    break
+                last_value = cur_value
+
+        if sorted_flag:
+            self._index_map = None
+            for k, values in zip(_keys, zip(*_rows)):
+                self.data[k].extend(values)
+        else:
+            for row in _rows:
+                self.addRow(row, _keys)
 
     def addDict(self, _dict: typing.Dict[str, typing.Any]):
         """
@@ -121,9 +404,15 @@ class DataStruct:
         :return:
         """
         index_value = _dict[self.index_name]
-        insert_idx = bisect_right(self.index(), index_value)
-        for k in self.data.keys():
-            self.data[k].insert(insert_idx, _dict[k])
+        if self._is_append(index_value):
+            self._append_index_map(index_value)
+            for k, v in self.data.items():
+                v.append(_dict[k])
+        else:
+            self._index_map = None
+            insert_idx = self._bisect_right(index_value)
+            for k, v in self.data.items():
+                v.insert(insert_idx, _dict[k])
 
     def addDicts(self, _dicts: typing.Sequence[dict]):
         """
@@ -173,6 +462,28 @@ class DataStruct:
         row = [self.data[k][_index] for k in keys]
         return row, keys
 
+    def getValue(self, _key: str, _index: int = 0) -> typing.Any:
+        """
+        get one value by key and number, default the first line
+
+        :param _key:
+        :param _index:
+        :return:
+        """
+        return self.data[_key][_index]
+
+    def getRecord(self, _index: int = 0) -> 'TickRecord':
+        """
+        turn one row into TickRecord, default the first line
+
+        :param _index:
+        :return:
+        """
+        return TickRecord(
+            self._get_record_pos(), self.index_name,
+            tuple([v[_index] for v in self.data.values()])
+        )
+
     def toDicts(self) -> (typing.List[typing.Dict[str, typing.Any]]):
         """
         turn all the data into dicts
@@ -217,7 +528,7 @@ class DataStruct:
             keys_new.append(self.index_name)
         # create new datastruct
         datastruct = DataStruct(
-            keys_new, self.index_name
+            keys_new, self.index_name, _columnar=self.columnar
         )
 
         datastruct.addRows(*self.toRows(keys_new))
@@ -225,11 +536,112 @@ class DataStruct:
 
     def merge(self, _struct: "DataStruct"):
         """
-        merge one struct into self, and sorted by index
+        merge one struct into self, and sorted by index.
+        rows of _struct are put after the rows of self with the same index,
+        if _struct begins after the end of self, columns are just extended,
+        else the two index are merged column by column
 
         :param _struct: another datastruct
         """
-        self.addRows(*_struct.toRows())
+        assert set(self.data.keys()) == set(_struct.data.keys())
+        if not len(_struct):
+            return
+        other_index = _struct.data[self.index_name]
+        if _struct.index_name == self.index_name \
+                and self._is_append(other_index[0]):
+            self._index_map = None
+            for k, v in self.data.items():
+                v.extend(_struct.data[k])
+            return
+
+        # stable sort keeps rows of self first, and the sort of _struct
+        order = np.argsort(np.concatenate(_search_arrays(
+            _to_array(self.index()), _to_array(other_index)
+        )), kind='stable')
+        self._index_map = None
+        for k in list(self.data.keys()):
+            if self.columnar:
+                values = np.concatenate(_search_arrays(
+                    self.data[k].values(), _to_array(_struct.data[k])
+                ))
+                self.data[k] = self._new_column(values[order])
+            else:
+                values = list(self.data[k]) + list(_struct.data[k])
+                self.data[k] = [values[i] for i in order.tolist()]
+
+    def join(
+            self, _struct: "DataStruct", _type: str = 'left'
+    ) -> 'DataStruct':
+        """
+        join columns of another datastruct by index, and return a new one,
+        the columns except index should not be the same.
+        the value of missing row is None
+            - inner: rows of self whose index exists in _struct,
+                with the first row of _struct of the same index
+            - left: all rows of self, with the first row of _struct
+                of the same index
+            - outer: like left, and the rows of _struct whose index
+                does not exist in self are added
+            - asof: all rows of self, with the last row of _struct
+                whose index is not greater than the index of self
+
+        both index are sorted, so it is done by searching sorted array,
+        and the columns are picked at once
+
+        :param _struct: another datastruct
+        :param _type: join type
+        :return: new datastruct
+        """
+        assert self.index_name == _struct.index_name
+        self_names = self.getColumnNames(_include_index_name=False)
+        struct_names = _struct.getColumnNames(_include_index_name=False)
+        assert not (set(self_names) & set(struct_names))
+
+        self_index, struct_index = _search_arrays(
+            _to_array(self.index()), _to_array(_struct.index())
+        )
+        self_pos = np.arange(len(self_index))
+        if _type in (self.JOIN_INNER, self.JOIN_LEFT, self.JOIN_OUTER):
+            struct_pos = _find_first(struct_index, self_index)
+            if _type == self.JOIN_INNER:
+                self_pos = self_pos[struct_pos >= 0]
+                struct_pos = struct_pos[struct_pos >= 0]
+        elif _type == self.JOIN_ASOF:
+            struct_pos = np.searchsorted(
+                struct_index, self_index, 'right'
+            ) - 1
+        else:
+            raise Exception('unknown type!')
+
+        to_list = not self.columnar
+        index_column = _take(self.index(), self_pos, to_list)
+        if _type == self.JOIN_OUTER:
+            # rows of _struct not in self, then sort all by index
+            extra_pos = np.flatnonzero(
+                _find_first(self_index, struct_index) < 0
+            )
+            if len(extra_pos):
+                order = np.argsort(np.concatenate((
+                    self_index, struct_index[extra_pos]
+                )), kind='stable')
+                self_pos = np.concatenate((
+                    self_pos, np.full(len(extra_pos), -1, dtype=np.int64)
+                ))[order]
+                struct_pos = np.concatenate((struct_pos, extra_pos))[order]
+                index_column = _take(self.index(), self_pos, to_list)
+                extra_index = _take(_struct.index(), struct_pos, to_list)
+                for i in np.flatnonzero(self_pos < 0).tolist():
+                    index_column[i] = extra_index[i]
+
+        columns = {self.index_name: index_column}
+        for k in self_names:
+            columns[k] = _take(self.data[k], self_pos, to_list)
+        for k in struct_names:
+            columns[k] = _take(_struct.data[k], struct_pos, to_list)
+
+        return DataStruct.fromColumns(
+            columns, self.index_name, self.columnar
+        )
 
     def expand(
         self, _struct: "DataStruct", _type: str = 'strict'
@@ -240,67 +652,171 @@ class DataStruct:
                 1. two datastruct have the totally same index
                 2. names in the other datastruct don't exist in self
                 3. copy columns to self
-            - ...
+            - intersect: the index existing in both, and the first row
+                is picked if the index value is duplicated
+            - inner, left, outer, asof: see join
 
         :param _struct: another datastruct
         :param _type: expand type
         """
+        if _type in (
+                self.JOIN_INNER, self.JOIN_LEFT,
+                self.JOIN_OUTER, self.JOIN_ASOF
+        ):
+            return self.join(_struct, _type)
+
         assert self.index_name == _struct.index_name
 
         self_names = self.getColumnNames(_include_index_name=False)
         struct_names = _struct.getColumnNames(_include_index_name=False)
         assert not (set(self_names) & set(struct_names))
 
+        self_index, struct_index = _search_arrays(
+            _to_array(self.index()), _to_array(_struct.index())
+        )
         if _type == self.EXPAND_STRICT:
             assert len(self) == len(_struct)
-            for idx1, idx2 in zip(self.index(), _struct.index()):
-                assert idx1 == idx2
-            index = self.index()
+            assert (self_index == struct_index).all()
+            self_pos = np.arange(len(self_index))
+            struct_pos = self_pos
         elif _type == self.EXPAND_INTERSECT:
-            index = sorted(set(self.index()) & set(_struct.index()))
+            # the first row of each index value in self
+            self_pos = np.flatnonzero(np.concatenate((
+                [True], self_index[1:] != self_index[:-1]
+            )))[:len(self_index)]
+            struct_pos = _find_first(struct_index, self_index[self_pos])
+            self_pos = self_pos[struct_pos >= 0]
+            struct_pos = struct_pos[struct_pos >= 0]
         else:
             raise Exception('unknown type!')
 
-        new_names = self_names + struct_names
-        new_names.append(self.index_name)
-        new_struct = DataStruct(new_names, self.index_name)
+        to_list = not self.columnar
+        columns = {}
+        for k in self_names + [self.index_name]:
+            columns[k] = _take(self.data[k], self_pos, to_list)
+        for k in struct_names:
+            columns[k] = _take(_struct.data[k], struct_pos, to_list)
 
-        for i in index:
-            tmp_dict = {self.index_name: i}
-            self_dict = self.loc[i]
-            if self_dict is None:
-                self_dict = dict(self_names, [None] * len(self_names))
-            else:
-                self_dict = self_dict.toDict()
-            tmp_dict.update(self_dict)
-            struct_dict = _struct.loc[i]
-            if struct_dict is None:
-                struct_dict = dict(struct_names, [None] * len(struct_names))
-            else:
-                struct_dict = struct_dict.toDict()
-            tmp_dict.update(struct_dict)
-            new_struct.addDict(tmp_dict)
+        return DataStruct.fromColumns(
+            columns, self.index_name, self.columnar
+        )
 
-        return new_struct
+    def rolling(self, _window: int, _min_periods: int = 1) -> Rolling:
+        """
+        rolling window calculation, eg. rolling(30).mean('closeprice')
+
+        :param _window: rows of each window
+        :param _min_periods: min rows of window to get a value
+        :return:
+        """
+        return Rolling(self, _window, _min_periods)
+
+    def resample(
+            self, _freq: timedelta,
+            _agg: typing.Dict[str, typing.Union[str, typing.Callable]]
+    ) -> 'DataStruct':
+        """
+        resample by datetime index into buckets of _freq, the index of
+        return is the begin time of each bucket, eg.
+        resample(timedelta(minutes=5), {
+            'lastprice': 'last', 'volume': 'sum'
+        })
+
+        :param _freq: length of bucket
+        :param _agg: map column to first, last, max, min, sum, mean, count
+            or a function called with the numpy array of each bucket
+        :return: new datastruct with the columns in _agg
+        """
+        assert self.index_name not in _agg.keys()
+        index, columns = resampleColumns(
+            self.index(), self.data, _freq, _agg
+        )
+        columns[self.index_name] = index
+        if not self.columnar:
+            for k, v in columns.items():
+                if isinstance(v, np.ndarray):
+                    columns[k] = v.tolist()
+        return DataStruct.fromColumns(
+            columns, self.index_name, self.columnar
+        )
 
     def toPandas(self) -> pd.DataFrame:
-        df = pd.DataFrame(data=self.data, index=self.index())
+        data = {}
+        for k, v in self.data.items():
+            data[k] = v.values() if isinstance(v, Column) else v
+        df = pd.DataFrame(data=data, index=data[self.index_name])
         del df[self.index_name]
         df.index.name = self.index_name
         return df
 
     @staticmethod
-    def fromPandas(df: pd.DataFrame) -> 'DataStruct':
+    def fromPandas(
+            df: pd.DataFrame, _columnar: bool = False
+    ) -> 'DataStruct':
         columns = list(df)
         index_name = df.index.name
         columns.append(index_name)
-        datastruct = DataStruct(columns, index_name)
+        datastruct = DataStruct(columns, index_name, _columnar=_columnar)
         sorted_df = df.sort_index()
-        datastruct.data[datastruct.index_name] = sorted_df.index.tolist()
-        for column in df:
-            datastruct.data[column] = df[column].tolist()
+        if _columnar:  # copy numpy arrays directly
+            datastruct.data[index_name] = Column(sorted_df.index.values)
+            for column in df:
+                datastruct.data[column] = Column(sorted_df[column].values)
+        else:
+            datastruct.data[index_name] = sorted_df.index.tolist()
+            for column in df:
+                datastruct.data[column] = sorted_df[column].tolist()
         return datastruct
 
+    @staticmethod
+    def fromColumns(
+            _columns: typing.Dict[str, typing.Sequence[typing.Any]],
+            _index_name: str,
+            _columnar: bool = False
+    ) -> 'DataStruct':
+        """
+        create datastruct from columns directly, all columns should
+        have the same length,
+        !!! WARN !!! you should keep the sort by yourself
+
+        :param _columns: map key to column
+        :param _index_name:
+        :param _columnar:
+        :return:
+        """
+        datastruct = DataStruct(
+            list(_columns.keys()), _index_name, _columnar=_columnar
+        )
+        length = len(_columns[_index_name])
+        for k, v in _columns.items():
+            assert len(v) == length
+            datastruct.data[k] = datastruct._new_column(v)
+        return datastruct
+
+    @staticmethod
+    def fromSortedRows(
+            _rows: typing.Sequence[typing.Sequence[typing.Any]],
+            _keys: typing.Sequence[str],
+            _index_name: str,
+            _columnar: bool = False
+    ) -> 'DataStruct':
+        """
+        create datastruct from rows already sorted by index, eg. fetched
+        with ORDER BY, the rows are transposed into columns in one pass,
+        !!! WARN !!! you should keep the sort by yourself
+
+        :param _rows:
+        :param _keys: the sort of row should be kept as keys
+        :param _index_name:
+        :param _columnar:
+        :return:
+        """
+        if not len(_rows):
+            return DataStruct(_keys, _index_name, _columnar=_columnar)
+        columns = dict(zip(_keys, zip(*_rows)))
+        assert len(columns) == len(_keys)
+        return DataStruct.fromColumns(columns, _index_name, _columnar)
+
     def save(self, _path: str):
         pickle.dump(self, open(_path, 'wb'))
 
@@ -308,6 +824,41 @@ class DataStruct:
     def load(_path: str) -> 'DataStruct':
         return pickle.load(open(_path, 'rb'))
 
+    def saveBinary(self, _path: str):
+        """
+        save into the dir of _path in columnar binary format,
+        each column is a contiguous file, datetime is saved as int64 ns,
+        see DataStructIO
+
+        :param _path: dir to save
+        """
+        writeColumns(_path, self.data, self.index_name)
+
+    @staticmethod
+    def loadBinary(
+            _path: str,
+            _begin: typing.Any = None, _end: typing.Any = None,
+            _columns: typing.Sequence[str] = None,
+            _columnar: bool = True
+    ) -> 'DataStruct':
+        """
+        load the dir saved by saveBinary, the files are memory mapped,
+        so only the rows in [_begin, _end) of index value are read
+
+        :param _path: dir to load
+        :param _begin: begin index value, included
+        :param _end: end index value, excluded
+        :param _columns: columns to load, index is always loaded
+        :param _columnar: load as columnar datastruct
+        :return:
+        """
+        columns, index_name = readColumns(_path, _begin, _end, _columns)
+        if not _columnar:
+            for k, v in columns.items():
+                if isinstance(v, np.ndarray):
+                    columns[k] = v.tolist()
+        return DataStruct.fromColumns(columns, index_name, _columnar)
+
     def index(self) -> list:
         """
         return the column of index
@@ -316,6 +867,18 @@ class DataStruct:
         """
         return self.data[self.index_name]
 
+    def countRows(self) -> int:
+        """
+        number of rows added, including the ones dropped by _max_len,
+        so it changes whenever a row is added
+
+        :return:
+        """
+        index = self.index()
+        if isinstance(index, RingColumn):
+            return len(self) + index.dropped
+        return len(self)
+
     def getColumnNames(
             self, _include_index_name: bool = True
     ) -> typing.Sequence[str]:
@@ -340,7 +903,9 @@ class DataStruct:
         :return:
         """
         assert _new_index in self.data.keys()
-        tmp = DataStruct(self.getColumnNames(), _new_index)
+        tmp = DataStruct(
+            self.getColumnNames(), _new_index, _columnar=self.columnar
+        )
         tmp.merge(self)
         return tmp
 
@@ -357,6 +922,7 @@ class DataStruct:
             self.index_name = _new_name
         self.data[_new_name] = self.data[_old_name]
         del self.data[_old_name]
+        self._record_pos = None
 
     def getColumn(self, _key: str) -> list:
         """
@@ -377,6 +943,7 @@ class DataStruct:
         assert _key != self.index_name
         assert _key in self.data.keys()
         del self.data[_key]
+        self._record_pos = None
 
     def createColumn(self, _key: str, _column: typing.Sequence[typing.Any]):
         """
@@ -389,7 +956,12 @@ class DataStruct:
         """
         assert _key not in self.data.keys()
         assert len(_column) == len(self)
+        if self.max_len is not None:
+            _column = self._new_column(_column)
+        elif self.columnar and not isinstance(_column, Column):
+            _column = Column(_column)
         self.data[_key] = _column
+        self._record_pos = None
 
 
 class Loc:
@@ -411,18 +983,17 @@ class Loc:
         if isinstance(_item, slice):
             new_start = None
             if _item.start is not None:
-                new_start = bisect_left(self.struct.index(), _item.start)
+                new_start = self.struct._bisect_left(_item.start)
             new_stop = None
             if _item.stop is not None:
-                new_stop = bisect_left(self.struct.index(), _item.stop)
+                new_stop = self.struct._bisect_left(_item.stop)
             new_item = slice(new_start, new_stop)
             return self.struct.iloc.__getitem__(new_item)
         else:
-            n_i = bisect_left(self.struct.index(), _item)
-            if n_i != len(self.struct) and _item == self.struct.index()[n_i]:
-                return self.struct.iloc.__getitem__(n_i)
-            else:
+            n_i = self.struct._find(_item)
+            if n_i is None:
                 return None
+            return self.struct.iloc.__getitem__(n_i)
 
 
 class ILoc:
@@ -437,11 +1008,337 @@ class ILoc:
         :param _item:
         :return:
         """
-        ret = DataStruct(self.struct.getColumnNames(), self.struct.index_name)
+        ret = DataStruct(
+            list(self.struct.data.keys()), self.struct.index_name,
+            _columnar=self.struct.columnar
+        )
         if isinstance(_item, slice):
             for k, v in self.struct.data.items():
                 ret.data[k] = v.__getitem__(_item)
         else:
             for k, v in self.struct.data.items():
-                ret.data[k] = [v[_item]]
+                ret.data[k] = self.struct._new_column([v[_item]])
         return ret
+
+
+class ColumnView:
+    """
+    read-only view of one column in [start, stop) of parent column
+
+    :param _column: parent column
+    :param _start:
+    :param _stop:
+    """
+
+    def __init__(
+            self, _column: typing.Sequence[typing.Any],
+            _start: int, _stop: int
+    ):
+        self.column = _column
+        self.range = range(_start, _stop)
+
+    def __len__(self) -> int:
+        return len(self.range)
+
+    def __getitem__(
+            self, _item: typing.Union[int, slice]
+    ) -> typing.Union[typing.Any, typing.List[typing.Any]]:
+        """
+        get one value, or a list of values if _item is a slice
+
+        :param _item:
+        :return:
+        """
+        if isinstance(_item, slice):
+            return [self.column[i] for i in self.range[_item]]
+        return self.column[self.range[_item]]
+
+    def __iter__(self):
+        for i in self.range:
+            yield self.column[i]
+
+    def __repr__(self) -> str:
+        return 'ColumnView({})'.format(list(self))
+
+
+class DataStructView:
+    """
+    read-only view of rows in [start, stop) of a datastruct, it only
+    refers to the columns of parent, so creating it is cheap.
+    It supports the reading api of datastruct, call clone() to get a
+    datastruct copy.
+    !!! WARN !!! the view is invalid if rows are inserted into
+    or removed from the parent
+
+    :param _struct: parent datastruct
+    :param _start:
+    :param _stop:
+    """
+
+    def __init__(self, _struct: DataStruct, _start: int, _stop: int):
+        self.struct = _struct
+        self.index_name = _struct.index_name
+        self.start = _start
+        self.stop = _stop
+
+    def __getitem__(self, _item: str) -> ColumnView:
+        assert type(_item) == str
+        return ColumnView(self.struct.data[_item], self.start, self.stop)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self):
+        for i in range(self.start, self.stop):
+            yield DataStructView(self.struct, i, i + 1)
+
+    def iterRows(self) -> typing.Iterator['TickRecord']:
+        return self.struct.iterRows(self.start, self.stop)
+
+    def iterChunks(self, _size: int) -> typing.Iterator['DataStructView']:
+        assert _size > 0
+        for start in range(self.start, self.stop, _size):
+            yield DataStructView(
+                self.struct, start, min(start + _size, self.stop)
+            )
+
+    def __repr__(self):
+        return self.clone().__repr__()
+
+    def index(self) -> ColumnView:
+        return self[self.index_name]
+
+    def getColumn(self, _key: str) -> ColumnView:
+        return self[_key]
+
+    def getColumnNames(
+            self, _include_index_name: bool = True
+    ) -> typing.Sequence[str]:
+        return self.struct.getColumnNames(_include_index_name)
+
+    def toRows(
+            self, _keys=None
+    ) -> (typing.Sequence[typing.Sequence[typing.Any]], typing.List[str]):
+        keys: typing.List[str] = _keys
+        if keys is None:
+            keys = self.getColumnNames()
+        columns = [self.struct.data[k] for k in keys]
+        rows = []
+        for i in range(self.start, self.stop):
+            rows.append([c[i] for c in columns])
+        return rows, keys
+
+    def toRow(
+            self, _index: int = 0, _keys=None
+    ) -> (typing.Sequence[typing.Any], typing.List[str]):
+        keys: typing.List[str] = _keys
+        if keys is None:
+            keys = self.getColumnNames()
+        i = range(self.start, self.stop)[_index]
+        return [self.struct.data[k][i] for k in keys], keys
+
+    def getValue(self, _key: str, _index: int = 0) -> typing.Any:
+        return self.struct.data[_key][range(self.start, self.stop)[_index]]
+
+    def getRecord(self, _index: int = 0) -> 'TickRecord':
+        return self.struct.getRecord(range(self.start, self.stop)[_index])
+
+    def toDicts(self) -> (typing.List[typing.Dict[str, typing.Any]]):
+        rows, keys = self.toRows()
+        return [dict(zip(keys, d)) for d in rows]
+
+    def toDict(self, _index: int = 0) -> (typing.Dict[str, typing.Any]):
+        i = range(self.start, self.stop)[_index]
+        return {k: v[i] for k, v in self.struct.data.items()}
+
+    def clone(self, _columns: typing.List[str] = None) -> DataStruct:
+        """
+        copy the rows of view to a new datastruct
+
+        :param _columns:
+        :return:
+        """
+        datastruct = self.struct.iloc[self.start:self.stop]
+        if _columns is None:
+            return datastruct
+        return datastruct.clone(_columns)
+
+    def toPandas(self) -> pd.DataFrame:
+        return self.clone().toPandas()
+
+
+class IView:
+    def __init__(self, _struct: DataStruct):
+        self.struct = _struct
+
+    def __getitem__(self, _item: typing.Union[int, slice]) -> DataStructView:
+        """
+        create a view of one row or a range of rows by number,
+        step of slice is not supported
+
+        :param _item:
+        :return:
+        """
+        length = len(self.struct)
+        if isinstance(_item, slice):
+            assert _item.step is None or _item.step == 1
+            start, stop, _ = _item.indices(length)
+            return DataStructView(self.struct, start, max(start, stop))
+        if _item < 0:
+            _item += length
+        if not 0 <= _item < length:
+            raise IndexError('datastruct index out of range')
+        return DataStructView(self.struct, _item, _item + 1)
+
+
+class LView:
+    def __init__(self, _struct: DataStruct):
+        self.struct = _struct
+
+    def __getitem__(
+            self, _item: typing.Union[typing.Any, slice]
+    ) -> typing.Union[None, DataStructView]:
+        """
+        like loc, but return a view instead of a new datastruct
+
+        :param _item:
+        :return:
+        """
+        if isinstance(_item, slice):
+            new_start = None
+            if _item.start is not None:
+                new_start = self.struct._bisect_left(_item.start)
+            new_stop = None
+            if _item.stop is not None:
+                new_stop = self.struct._bisect_left(_item.stop)
+            return self.struct.iview[new_start:new_stop]
+        else:
+            n_i = self.struct._find(_item)
+            if n_i is None:
+                return None
+            return self.struct.iview[n_i]
+
+
+class TickRecord:
+    """
+    one row of datastruct, it is much cheaper than a one-row datastruct
+    to create and read, so it is used for each tick in backtest.
+
+    the value can be read as record.lastprice or record.getValue('lastprice'),
+    and it keeps the reading api of one-row datastruct, such as
+    record['lastprice'][0], record.index()[0] and record.toDict(),
+    so the code written for datastruct still works
+
+    :param _pos: map key to the position in _values
+    :param _index_name:
+    :param _values:
+    """
+
+    __slots__ = ('_pos', 'index_name', '_values')
+
+    def __init__(
+            self, _pos: typing.Dict[str, int],
+            _index_name: str, _values: typing.Sequence[typing.Any]
+    ):
+        self._pos = _pos
+        self.index_name = _index_name
+        self._values = _values
+
+    def __getattr__(self, _name: str) -> typing.Any:
+        # private names are never columns, and pickle / copy look for them
+        if _name.startswith('_'):
+            raise AttributeError(_name)
+        try:
+            return self._values[self._pos[_name]]
+        except KeyError:
+            raise AttributeError(_name)
+
+    def __getitem__(self, _item: str) -> typing.Tuple[typing.Any]:
+        """
+        compatible with one-row datastruct, return a column of one value
+
+        :param _item:
+        :return:
+        """
+        assert type(_item) == str
+        return self._values[self._pos[_item]],
+
+    def __len__(self) -> int:
+        return 1
+
+    def __iter__(self):
+        yield self
+
+    def __getstate__(self) -> tuple:
+        return self._pos, self.index_name, self._values
+
+    def __setstate__(self, _state: tuple):
+        self._pos, self.index_name, self._values = _state
+
+    def __repr__(self):
+        return self.clone().__repr__()
+
+    def getValue(self, _key: str, _index: int = 0) -> typing.Any:
+        assert _index in (0, -1)
+        return self._values[self._pos[_key]]
+
+    def getIndexValue(self) -> typing.Any:
+        return self._values[self._pos[self.index_name]]
+
+    def index(self) -> typing.Tuple[typing.Any]:
+        return self[self.index_name]
+
+    def getColumn(self, _key: str) -> typing.Tuple[typing.Any]:
+        return self[_key]
+
+    def getColumnNames(
+            self, _include_index_name: bool = True
+    ) -> typing.Sequence[str]:
+        if _include_index_name:
+            return sorted(self._pos.keys())
+        else:
+            tmp = {self.index_name}
+            return sorted(self._pos.keys() - tmp)
+
+    def toRow(
+            self, _index: int = 0, _keys=None
+    ) -> (typing.Sequence[typing.Any], typing.List[str]):
+        assert _index in (0, -1)
+        keys: typing.List[str] = _keys
+        if keys is None:
+            keys = self.getColumnNames()
+        return [self._values[self._pos[k]] for k in keys], keys
+
+    def toRows(
+            self, _keys=None
+    ) -> (typing.Sequence[typing.Sequence[typing.Any]], typing.List[str]):
+        row, keys = self.toRow(0, _keys)
+        return [row], keys
+
+    def toDict(self, _index: int = 0) -> (typing.Dict[str, typing.Any]):
+        assert _index in (0, -1)
+        return dict(zip(self._pos.keys(), self._values))
+
+    def toDicts(self) -> (typing.List[typing.Dict[str, typing.Any]]):
+        return [self.toDict()]
+
+    def getRecord(self, _index: int = 0) -> 'TickRecord':
+        assert _index in (0, -1)
+        return self
+
+    def clone(self, _columns: typing.List[str] = None) -> DataStruct:
+        """
+        turn the record into a one-row datastruct
+
+        :param _columns:
+        :return:
+        """
+        datastruct = DataStruct(
+            list(self._pos.keys()), self.index_name, [self._values]
+        )
+        if _columns is None:
+            return datastruct
+        return datastruct.clone(_columns)
+
+    def toPandas(self) -> pd.DataFrame:
+        return self.clone().toPandas()
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import pickle
+import typing
+from bisect import bisect_left
+from datetime import datetime
+
+import numpy as np
+
+from ParadoxTrading.Utils.Column import Column
+
+HEADER_FILE = 'header.json'
+VERSION = 1
+
+# kinds stored on disk
+KIND_BOOL = 'b'
+KIND_INT = 'i'
+KIND_FLOAT = 'f'
+KIND_DATETIME = 'M'  # int64 of nanoseconds
+KIND_BYTES = 'S'  # utf-8 str in fixed width
+KIND_PICKLE = 'O'  # anything else, pickled as a list
+
+_DISK_DTYPE = {
+    KIND_BOOL: np.dtype('|b1'),
+    KIND_INT: np.dtype('<i8'),
+    KIND_FLOAT: np.dtype('<f8'),
+    KIND_DATETIME: np.dtype('<i8'),
+}
+
+
+def _encode(
+        _values: typing.Sequence
+) -> typing.Tuple[str, typing.Union[np.ndarray, list]]:
+    """
+    turn one column into the kind and the array to write
+
+    :param _values: list or Column
+    :return: kind, array (or list for pickle)
+    """
+    if not isinstance(_values, Column):
+        _values = Column(_values)
+    array = _values.values()
+    kind = array.dtype.kind
+    if kind in (KIND_BOOL, KIND_INT, KIND_FLOAT):
+        return kind, array.astype(_DISK_DTYPE[kind])
+    if kind == KIND_DATETIME:
+        return kind, array.astype('M8[ns]').view(_DISK_DTYPE[kind])
+    values = array.tolist()
+    if len(values) and all(type(v) == str for v in values):
+        return KIND_BYTES, np.array([v.encode('utf-8') for v in values])
+    return KIND_PICKLE, values
+
+
+def _decode(
+        _kind: str, _array: typing.Union[np.ndarray, list]
+) -> typing.Union[np.ndarray, list]:
+    """
+    turn the array read from disk into the array of Column
+
+    :param _kind:
+    :param _array:
+    :return:
+    """
+    if _kind == KIND_DATETIME:
+        return _array.view('M8[ns]').astype('M8[us]')
+    if _kind == KIND_BYTES:
+        return [v.decode('utf-8') for v in _array.tolist()]
+    if _kind == KIND_PICKLE:
+        return _array
+    return np.array(_array)
+
+
+def _search_key(_kind: str, _value: typing.Any) -> typing.Any:
+    if _kind == KIND_DATETIME and isinstance(_value, datetime):
+        return np.datetime64(_value, 'ns').astype(np.int64)
+    if _kind == KIND_BYTES and isinstance(_value, str):
+        return _value.encode('utf-8')
+    return _value
+
+
+def writeColumns(
+        _path: str, _columns: typing.Dict[str, typing.Sequence],
+        _index_name: str
+):
+    """
+    write columns into the dir of _path, each column is a contiguous
+    binary file, and the header.json records names, kinds and length
+
+    :param _path: dir to save, created if not exists
+    :param _columns: map name to column, should be sorted by index
+    :param _index_name:
+    """
+    assert _index_name in _columns.keys()
+    os.makedirs(_path, exist_ok=True)
+
+    length = len(_columns[_index_name])
+    header = {
+        'version': VERSION,
+        'index_name': _index_name,
+        'length': length,
+        'columns': [],
+    }
+    for i, (name, values) in enumerate(_columns.items()):
+        assert len(values) == length
+        kind, array = _encode(values)
+        file_name = '{}.bin'.format(i)
+        with open(os.path.join(_path, file_name), 'wb') as f:
+            if kind == KIND_PICKLE:
+                pickle.dump(array, f)
+            else:
+                array.tofile(f)
+        header['columns'].append({
+            'name': name, 'kind': kind, 'file': file_name,
+            'dtype': None if kind == KIND_PICKLE else array.dtype.str,
+        })
+    # write header at last, so a broken dir has no header
+    with open(os.path.join(_path, HEADER_FILE), 'w') as f:
+        json.dump(header, f)
+
+
+def hashColumns(
+        _columns: typing.Dict[str, typing.Sequence], _index_name: str
+) -> str:
+    """
+    md5 of all values in columns, encoded like writeColumns, so the same
+    values get the same hash in list or columnar datastruct
+
+    :param _columns: map name to column
+    :param _index_name:
+    :return: hex digest
+    """
+    md5 = hashlib.md5(_index_name.encode('utf-8'))
+    for name in sorted(_columns.keys()):
+        kind, array = _encode(_columns[name])
+        md5.update('|{}|{}|'.format(name, kind).encode('utf-8'))
+        if kind == KIND_PICKLE:
+            md5.update(pickle.dumps(array))
+        else:
+            md5.update(array.dtype.str.encode('utf-8'))
+            md5.update(np.ascontiguousarray(array).tobytes())
+    return md5.hexdigest()
+
+
+def readHeader(_path: str) -> dict:
+    with open(os.path.join(_path, HEADER_FILE)) as f:
+        header = json.load(f)
+    assert header['version'] == VERSION
+    return header
+
+
+def _open_column(
+        _path: str, _info: dict, _length: int
+) -> typing.Union[np.ndarray, list]:
+    """
+    open one column file, binary columns are memory mapped,
+    so only the sliced part is read from disk
+    """
+    file_path = os.path.join(_path, _info['file'])
+    if _info['kind'] == KIND_PICKLE:
+        with open(file_path, 'rb') as f:
+            return pickle.load(f)
+    if not _length:
+        return np.empty(0, dtype=_info['dtype'])
+    return np.memmap(
+        file_path, dtype=_info['dtype'], mode='r', shape=(_length,)
+    )
+
+
+def readColumns(
+        _path: str,
+        _begin: typing.Any = None, _end: typing.Any = None,
+        _columns: typing.Sequence[str] = None
+) -> typing.Tuple[typing.Dict[str, typing.Union[np.ndarray, list]], str]:
+    """
+    read columns saved by writeColumns, the rows are picked by the range
+    of index value [_begin, _end) on the memory mapped index column
+
+    :param _path:
+    :param _begin: begin index value, included
+    :param _end: end index value, excluded
+    :param _columns: columns to read, index is always read
+    :return: map name to array (or list for pickled column), index_name
+    """
+    header = readHeader(_path)
+    index_name = header['index_name']
+    length = header['length']
+    infos = {d['name']: d for d in header['columns']}
+
+    names = list(infos.keys()) if _columns is None else list(_columns)
+    if index_name not in names:
+        names.append(index_name)
+
+    # find the range by index
+    index_info = infos[index_name]
+    index = _open_column(_path, index_info, length)
+    begin, end = 0, length
+    if isinstance(index, list):
+        if _begin is not None:
+            begin = bisect_left(index, _begin)
+        if _end is not None:
+            end = bisect_left(index, _end)
+    else:
+        if _begin is not None:
+            begin = int(np.searchsorted(
+                index, _search_key(index_info['kind'], _begin), 'left'
+            ))
+        if _end is not None:
+            end = int(np.searchsorted(
+                index, _search_key(index_info['kind'], _end), 'left'
+            ))
+    end = max(begin, end)
+
+    columns = {}
+    for name in names:
+        info = infos[name]
+        if name == index_name:
+            array = index
+        else:
+            array = _open_column(_path, info, length)
+        columns[name] = _decode(info['kind'], array[begin:end])
+    return columns, index_name
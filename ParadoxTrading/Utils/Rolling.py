@@ -0,0 +1,381 @@
+import typing
+from datetime import timedelta
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from ParadoxTrading.Utils.Column import Column
+
+
+def _to_float_array(_column: typing.Sequence) -> np.ndarray:
+    if isinstance(_column, Column):
+        return _column.values().astype(np.float64)
+    return np.array(_column, dtype=np.float64)
+
+
+def _window_extremum(
+        _values: np.ndarray, _window: int, _ufunc: np.ufunc
+) -> np.ndarray:
+    """
+    rolling max or min, the first windows are partial
+    """
+    ret = np.empty(len(_values), dtype=np.float64)
+    head = min(_window - 1, len(_values))
+    ret[:head] = _ufunc.accumulate(_values[:head])
+    if len(_values) >= _window:
+        ret[_window - 1:] = _ufunc.reduce(
+            sliding_window_view(_values, _window), axis=1
+        )
+    return ret
+
+
+def _window_var(_values: np.ndarray, _window: int) -> np.ndarray:
+    """
+    population variance of each full window, calculated on the centred
+    window, so it does not lose precision when the values drift far
+    away from each other. The windows are viewed in chunks to bound
+    the memory of temporary arrays
+
+    :return: len(_values) - _window + 1 values
+    """
+    if len(_values) < _window:
+        return np.empty(0, dtype=np.float64)
+    windows = sliding_window_view(_values, _window)
+    chunk = max(1, (1 << 20) // _window)
+    return np.concatenate([
+        windows[i:i + chunk].var(axis=1)
+        for i in range(0, len(windows), chunk)
+    ])
+
+
+def _with_head(
+        _values: typing.Sequence, _window: int, _head: typing.Sequence
+) -> typing.Tuple[np.ndarray, int]:
+    """
+    the last _window - 1 values of _head before _values, so the windows
+    of _values go on from those in an accumulator
+
+    :return: values, number of head values
+    """
+    head = _to_float_array(_head)
+    head = head[max(0, len(head) - (_window - 1)):]
+    return np.concatenate((head, _to_float_array(_values))), len(head)
+
+
+def rollingExtremum(
+        _values: typing.Sequence, _window: int, _is_max: bool = True,
+        _head: typing.Sequence = ()
+) -> np.ndarray:
+    """
+    max or min of the window ending at each of _values, the windows
+    begin with _head, and are partial until _window values, the same
+    as ExtremumAccumulator.getValue()
+
+    :param _values:
+    :param _window: rows of each window
+    :param _is_max: max if True, else min
+    :param _head: the values before _values, eg.
+        ExtremumAccumulator.getWindow()
+    :return: one extremum for each of _values
+    """
+    values, num = _with_head(_values, _window, _head)
+    return _window_extremum(
+        values, _window, np.maximum if _is_max else np.minimum
+    )[num:]
+
+
+def emaCoef(_period: float) -> typing.Tuple[float, float]:
+    """
+    the coefficients of EMA, y = b * x + c * y_last, the indicators
+    use them in both addOne() and emaFilter(), so the results are
+    bitwise the same
+
+    :param _period:
+    :return: b, c
+    """
+    alpha = 1.0 / _period
+    return alpha, 1.0 - alpha
+
+
+def emaFilter(
+        _values: typing.Sequence, _period: float, _last: float = None
+) -> np.ndarray:
+    """
+    y = b * x + c * y_last for each x of _values by scipy.signal.lfilter,
+    the coefficients are emaCoef(_period), and the first y is the first x
+    if there is no _last. lfilter does the same float operations as the
+    recursion in python
+
+    :param _values:
+    :param _period:
+    :param _last: the last y, None to begin with the first x
+    :return: one y for each of _values
+    """
+    values = _to_float_array(_values)
+    if not len(values):
+        return values
+    head = values[:0]
+    if _last is None:
+        head, values, _last = values[:1], values[1:], values[0]
+    b, c = emaCoef(_period)
+    ret, _ = lfilter([b], [1.0, -c], values, zi=[c * _last])
+    return np.concatenate((head, ret))
+
+
+def rollingOLS(
+        _values: typing.Sequence, _window: int
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    OLS of each full window of _values on x = 0, 1, ..., _window - 1,
+    like RegressionAccumulator.rolling() but without state
+
+    :param _values:
+    :param _window: rows of each window
+    :return: slope, intercept and r square of windows ending at
+        _window - 1, _window, ..., so len(_values) - _window + 1 each
+    """
+    assert _window > 1
+    values = _to_float_array(_values)
+    if len(values) < _window:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty.copy(), empty.copy()
+    # shift values by their mean, to avoid losing precision
+    shift = values.mean()
+    values = values - shift
+
+    x = np.arange(_window, dtype=np.float64) - (_window - 1) / 2
+    var_x = _window * (_window * _window - 1) / 12
+    cov = np.convolve(values, x[::-1], 'valid')
+    mean = np.convolve(values, np.ones(_window), 'valid') / _window
+    var_y = _window * _window_var(values, _window)
+
+    slope = cov / var_x
+    intercept = mean + shift - slope * (_window - 1) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.minimum(cov * cov / (var_x * var_y), 1.)
+    # the values of window are the same, like RegressionAccumulator
+    constant = _window_extremum(values, _window, np.maximum)[_window - 1:] \
+        == _window_extremum(values, _window, np.minimum)[_window - 1:]
+    r2[constant | (var_y <= 0)] = np.nan
+    return slope, intercept, r2
+
+
+class Rolling:
+    """
+    rolling window calculation on one column of datastruct, the values are
+    calculated at once by numpy. Like the indicators, the first windows
+    are partial, and the value is None if the window has fewer than
+    _min_periods rows.
+
+    each function returns a new datastruct with the index of _struct
+    and one column named _ret_key (default the same as _key)
+
+    :param _struct: datastruct to calculate
+    :param _window: rows of each window
+    :param _min_periods: min rows of window to get a value
+    """
+
+    def __init__(
+            self, _struct: typing.Any,
+            _window: int, _min_periods: int = 1
+    ):
+        assert _window > 0
+        assert 0 < _min_periods <= _window
+
+        self.struct = _struct
+        self.window = _window
+        self.min_periods = _min_periods
+
+    def _count(self, _num: int) -> np.ndarray:
+        # the number of rows in each window
+        return np.minimum(np.arange(1, _num + 1), self.window)
+
+    def _create(
+            self, _key: str, _ret_key: str, _values: np.ndarray
+    ) -> typing.Any:
+        values = _values
+        if self.min_periods > 1 and len(values):
+            values = values.tolist()
+            for i in range(min(self.min_periods - 1, len(values))):
+                values[i] = None
+        elif not self.struct.columnar:
+            values = values.tolist()
+        index_name = self.struct.index_name
+        return self.struct.fromColumns({
+            index_name: self.struct.index(),
+            _key if _ret_key is None else _ret_key: values,
+        }, index_name, self.struct.columnar)
+
+    def _sum(self, _values: np.ndarray) -> np.ndarray:
+        csum = np.concatenate(([0.], np.cumsum(_values)))
+        begin = np.maximum(np.arange(len(_values)) + 1 - self.window, 0)
+        return csum[1:] - csum[begin]
+
+    def sum(self, _key: str, _ret_key: str = None) -> typing.Any:
+        values = _to_float_array(self.struct[_key])
+        return self._create(_key, _ret_key, self._sum(values))
+
+    def mean(self, _key: str, _ret_key: str = None) -> typing.Any:
+        values = _to_float_array(self.struct[_key])
+        return self._create(
+            _key, _ret_key, self._sum(values) / self._count(len(values))
+        )
+
+    def _var(self, _values: np.ndarray, _ddof: int) -> np.ndarray:
+        # each window is centred before summing squares, a global sum of
+        # squares loses precision when the values drift
+        count = self._count(len(_values))
+        head = min(self.window - 1, len(_values))
+        var = np.concatenate((
+            [_values[:i + 1].var() for i in range(head)],
+            _window_var(_values, self.window),
+        ))
+        if _ddof:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                var = var * count / (count - _ddof)
+            var[count <= _ddof] = np.nan
+        return var
+
+    def var(
+            self, _key: str, _ret_key: str = None, _ddof: int = 0
+    ) -> typing.Any:
+        """
+        rolling variance, _ddof=0 is the same as statistics.pvariance
+
+        :param _key:
+        :param _ret_key:
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        values = _to_float_array(self.struct[_key])
+        return self._create(_key, _ret_key, self._var(values, _ddof))
+
+    def std(
+            self, _key: str, _ret_key: str = None, _ddof: int = 0
+    ) -> typing.Any:
+        """
+        rolling std, _ddof=0 is the same as statistics.pstdev
+
+        :param _key:
+        :param _ret_key:
+        :param _ddof: delta degrees of freedom
+        :return:
+        """
+        values = _to_float_array(self.struct[_key])
+        return self._create(
+            _key, _ret_key, np.sqrt(self._var(values, _ddof))
+        )
+
+    def max(self, _key: str, _ret_key: str = None) -> typing.Any:
+        values = _to_float_array(self.struct[_key])
+        return self._create(
+            _key, _ret_key,
+            _window_extremum(values, self.window, np.maximum)
+        )
+
+    def min(self, _key: str, _ret_key: str = None) -> typing.Any:
+        values = _to_float_array(self.struct[_key])
+        return self._create(
+            _key, _ret_key,
+            _window_extremum(values, self.window, np.minimum)
+        )
+
+    def apply(
+            self, _key: str,
+            _func: typing.Callable[[np.ndarray], typing.Any],
+            _ret_key: str = None
+    ) -> typing.Any:
+        """
+        call _func with the numpy array of each window
+
+        :param _key:
+        :param _func:
+        :param _ret_key:
+        :return:
+        """
+        column = self.struct[_key]
+        if isinstance(column, Column):
+            values = column.values()
+        else:
+            values = np.array(column)
+        ret = np.empty(len(values), dtype=object)
+        for i in range(len(values)):
+            ret[i] = _func(values[max(0, i + 1 - self.window):i + 1])
+        return self._create(_key, _ret_key, Column(ret.tolist()).values())
+
+
+RESAMPLE_FIRST = 'first'
+RESAMPLE_LAST = 'last'
+RESAMPLE_MAX = 'max'
+RESAMPLE_MIN = 'min'
+RESAMPLE_SUM = 'sum'
+RESAMPLE_MEAN = 'mean'
+RESAMPLE_COUNT = 'count'
+
+
+def resampleColumns(
+        _index: typing.Sequence,
+        _columns: typing.Dict[str, typing.Sequence],
+        _freq: timedelta,
+        _agg: typing.Dict[str, typing.Union[str, typing.Callable]]
+) -> typing.Tuple[np.ndarray, typing.Dict[str, np.ndarray]]:
+    """
+    group rows into buckets of _freq by datetime index, each bucket begins
+    at a multiple of _freq from 1970-01-01, like SplitIntoMinute etc.
+
+    :param _index: sorted datetime index
+    :param _columns: map name to column
+    :param _freq: length of bucket
+    :param _agg: map name to first, last, max, min, sum, mean, count,
+        or a function called with the numpy array of each bucket
+    :return: begin time of each bucket, map name to aggregated column
+    """
+    if isinstance(_index, Column):
+        index = _index.values()
+    else:
+        index = Column(_index).values()
+    if not len(index):
+        return np.empty(0, dtype='M8[us]'), {k: [] for k in _agg.keys()}
+    assert index.dtype.kind == 'M'
+
+    freq = np.timedelta64(_freq).astype('m8[us]').astype(np.int64)
+    assert freq > 0
+    bucket = index.astype('M8[us]').astype(np.int64) // freq
+    starts = np.flatnonzero(np.concatenate((
+        [True], bucket[1:] != bucket[:-1]
+    )))
+    ends = np.concatenate((starts[1:], [len(bucket)]))
+    begin_time = (bucket[starts] * freq).astype('M8[us]')
+
+    ret = {}
+    for key, agg in _agg.items():
+        column = _columns[key]
+        if isinstance(column, Column):
+            values = column.values()
+        else:
+            values = np.array(column)
+        if agg == RESAMPLE_FIRST:
+            ret[key] = values[starts]
+        elif agg == RESAMPLE_LAST:
+            ret[key] = values[ends - 1]
+        elif agg == RESAMPLE_MAX:
+            ret[key] = np.maximum.reduceat(values, starts)
+        elif agg == RESAMPLE_MIN:
+            ret[key] = np.minimum.reduceat(values, starts)
+        elif agg == RESAMPLE_SUM:
+            ret[key] = np.add.reduceat(values, starts)
+        elif agg == RESAMPLE_MEAN:
+            ret[key] = np.add.reduceat(
+                values.astype(np.float64), starts
+            ) / (ends - starts)
+        elif agg == RESAMPLE_COUNT:
+            ret[key] = ends - starts
+        elif callable(agg):
+            ret[key] = Column([
+                agg(values[b:e])
+                for b, e in zip(starts.tolist(), ends.tolist())
+            ]).values()
+        else:
+            raise Exception('unknown agg type')
+    return begin_time, ret
@@ -1,15 +1,367 @@
+import copy
+import json
 import typing
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 
-import arrow
+import numpy as np
 
-from ParadoxTrading.Utils.DataStruct import DataStruct
+from ParadoxTrading.Utils.Calendar import DateBucket
+from ParadoxTrading.Utils.Column import Column
+from ParadoxTrading.Utils.DataStruct import ColumnView, DataStruct, \
+    DataStructView, TickRecord
 
 DATETIME_TYPE = typing.Union[str, datetime]
 
+_SECOND_US = 1000000
+_MINUTE_US = 60 * _SECOND_US
+_HOUR_US = 60 * _MINUTE_US
+_DAY_US = 24 * _HOUR_US
+
+
+def _to_array(_column: typing.Sequence) -> np.ndarray:
+    if isinstance(_column, ColumnView) and \
+            isinstance(_column.column, Column):
+        r = _column.range
+        return _column.column.values()[r.start:r.stop]
+    if isinstance(_column, Column):
+        return _column.values()
+    return Column(list(_column)).values()
+
+
+def _to_us(_column: typing.Sequence) -> np.ndarray:
+    """
+    datetime column to int64 microseconds from epoch
+    """
+    values = _to_array(_column)
+    if not len(values):
+        return np.empty(0, dtype=np.int64)
+    assert values.dtype.kind == 'M'
+    return values.astype('M8[us]').view(np.int64)
+
+
+def _get_change(_value: typing.Any, _last_value: typing.Any) -> typing.Any:
+    """
+    the change of cumulative value, like volume of CTP
+    """
+    if _value < _last_value:  # reset by new tradingday
+        return _value
+    return _value - _last_value
+
+
+def _get_changes(
+        _values: np.ndarray, _last_value: typing.Any = 0
+) -> np.ndarray:
+    """
+    the vectorized version of _get_change()
+    """
+    if not len(_values):
+        return _values
+    last = np.concatenate(([_last_value], _values[:-1]))
+    return np.where(_values < last, _values, _values - last)
+
+
+def _parse_time(_time: typing.Union[str, time]) -> int:
+    """
+    'HH:MM', 'HH:MM:SS' or time to microseconds from midnight
+    """
+    if isinstance(_time, str):
+        parts = [int(d) for d in _time.split(':')]
+        parts += [0] * (3 - len(parts))
+        _time = time(*parts)
+    return (_time.hour * 3600 + _time.minute * 60 +
+            _time.second) * _SECOND_US + _time.microsecond
+
+
+class TradingSessions:
+    """
+    the trading sessions of one day, used by buildBars() so that bars
+    begin at the open of session and never cross the close of session.
+    A session closing after midnight (like the night session of
+    chinese futures, 21:00 - 02:30) belongs to the day it opens.
+
+    :param _sessions: list of (open, close), 'HH:MM' or time
+    """
+
+    def __init__(
+            self, _sessions: typing.Sequence[typing.Tuple[
+                typing.Union[str, time], typing.Union[str, time]]]
+    ):
+        self.sessions: typing.List[typing.Tuple[int, int]] = []
+        for begin, end in _sessions:
+            begin, end = _parse_time(begin), _parse_time(end)
+            if end <= begin:  # close after midnight
+                end += _DAY_US
+            self.sessions.append((begin, end))
+        assert self.sessions
+
+    def getSpec(self) -> list:
+        return [list(d) for d in self.sessions]
+
+    @staticmethod
+    def chineseFutures(
+            _night_end: typing.Union[None, str, time] = None
+    ) -> 'TradingSessions':
+        """
+        sessions of chinese futures, the night session opens at 21:00
+
+        :param _night_end: close of night session, eg. '23:00', '01:00',
+            '02:30', None means no night session
+        :return:
+        """
+        sessions = []
+        if _night_end is not None:
+            sessions.append(('21:00', _night_end))
+        sessions += [
+            ('09:00', '10:15'), ('10:30', '11:30'), ('13:30', '15:00')
+        ]
+        return TradingSessions(sessions)
+
+    def locate(
+            self, _time: np.ndarray
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        find the session of each time. The time out of sessions
+        (eg. call auction before open, the last tick after close)
+        belongs to the nearest session
+
+        :param _time: int64 microseconds from epoch
+        :return: open and close of session, int64 microseconds from epoch
+        """
+        day = _time - _time % _DAY_US
+        best = np.full(len(_time), np.iinfo(np.int64).max, dtype=np.int64)
+        begin = np.zeros(len(_time), dtype=np.int64)
+        end = np.zeros(len(_time), dtype=np.int64)
+        for s_begin, s_end in self.sessions:
+            # the session opened yesterday, today or tomorrow
+            for shift in (-_DAY_US, 0, _DAY_US):
+                b = day + shift + s_begin
+                e = day + shift + s_end
+                dist = np.maximum(np.maximum(b - _time, _time - e + 1), 0)
+                mask = dist < best
+                best[mask] = dist[mask]
+                begin[mask] = b[mask]
+                end[mask] = e[mask]
+        return begin, end
+
+
+class BarAggregator:
+    """
+    aggregate ticks into OHLCV bars on the fly, only the running values of
+    current bar are kept, so no tick is stored. The bars are in a
+    datastruct indexed by the begin time of bar, with columns
+    openprice, highprice, lowprice, closeprice, volume, (turnover,)
+    vwap, count and the time of the last tick
+
+    :param _price_key: the key of price in tick
+    :param _volume_key: the key of volume in tick
+    :param _turnover_key: the key of turnover in tick, None to skip it
+    :param _cumulative: volume and turnover of tick are cumulative
+        in the tradingday (like CTP), so the change is used
+    :param _idx_key: the index of bar datastruct
+    :param _end_key: the column of the time of last tick
+    """
+
+    def __init__(
+            self, _price_key: str = 'lastprice',
+            _volume_key: str = 'volume',
+            _turnover_key: str = None,
+            _cumulative: bool = False,
+            _idx_key: str = 'time',
+            _end_key: str = 'endtime'
+    ):
+        self.price_key = _price_key
+        self.volume_key = _volume_key
+        self.turnover_key = _turnover_key
+        self.cumulative = _cumulative
+        self.idx_key = _idx_key
+        self.end_key = _end_key
+
+        self.keys = [
+            self.idx_key, 'openprice', 'highprice', 'lowprice',
+            'closeprice', 'volume', 'vwap', 'count'
+        ]
+        if self.turnover_key is not None:
+            self.keys.append('turnover')
+        self.keys.append(self.end_key)
+        self.data = DataStruct(self.keys, self.idx_key)
+
+        # the last cumulative value
+        self.last_volume = 0
+        self.last_turnover = 0
+
+        # running values of current bar
+        self.begin_time: DATETIME_TYPE = None
+        self.end_time: DATETIME_TYPE = None
+        self.written = False  # whether current bar is in self.data
+        self.open = None
+        self.high = None
+        self.low = None
+        self.close = None
+        self.volume = 0
+        self.turnover = 0
+        self.amount = 0  # sum of price * volume
+        self.count = 0
+
+    def getSpec(self) -> dict:
+        """
+        the settings of aggregator, as part of spliter spec
+
+        :return:
+        """
+        return {
+            'price_key': self.price_key,
+            'volume_key': self.volume_key,
+            'turnover_key': self.turnover_key,
+            'cumulative': self.cumulative,
+            'idx_key': self.idx_key,
+            'end_key': self.end_key,
+        }
+
+    def _get_change(self, _value, _last_value):
+        if not self.cumulative:
+            return _value
+        return _get_change(_value, _last_value)
+
+    def _write_bar(self):
+        """
+        write current bar into self.data,
+        or update it if already written
+        """
+        row = [
+            self.begin_time, self.open, self.high, self.low, self.close,
+            self.volume,
+            self.amount / self.volume if self.volume else self.close,
+            self.count
+        ]
+        if self.turnover_key is not None:
+            row.append(self.turnover)
+        row.append(self.end_time)
+        if self.written:
+            for k, v in zip(self.keys, row):
+                self.data.data[k][-1] = v
+        else:
+            self.data.addRow(row, self.keys)
+            self.written = True
+
+    def newBar(self, _begin_time: DATETIME_TYPE):
+        """
+        finish current bar and begin a new one
+
+        :param _begin_time: index of new bar
+        """
+        if self.begin_time is not None:
+            self._write_bar()
+        self.begin_time = _begin_time
+        self.end_time = None
+        self.written = False
+        self.open = None
+        self.high = None
+        self.low = None
+        self.close = None
+        self.volume = 0
+        self.turnover = 0
+        self.amount = 0
+        self.count = 0
+
+    def addTick(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ):
+        """
+        update current bar by one tick
+
+        :param _data: one tick
+        """
+        price = _data.getValue(self.price_key)
+        volume = _data.getValue(self.volume_key)
+        change = self._get_change(volume, self.last_volume)
+        self.last_volume = volume
+
+        if self.open is None:
+            self.open = self.high = self.low = price
+        elif price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += change
+        self.amount += price * change
+        self.count += 1
+        self.end_time = _data.index()[0]
+
+        if self.turnover_key is not None:
+            turnover = _data.getValue(self.turnover_key)
+            self.turnover += self._get_change(turnover, self.last_turnover)
+            self.last_turnover = turnover
+
+    def getBarData(self) -> DataStruct:
+        """
+        get all bars, including current bar
+
+        :return:
+        """
+        if self.begin_time is not None:
+            self._write_bar()
+        return self.data
+
+    def _get_changes(self, _values: np.ndarray) -> np.ndarray:
+        if not self.cumulative:
+            return _values
+        return _get_changes(_values)
+
+    def aggregate(
+            self, _data: typing.Union[DataStruct, DataStructView],
+            _starts: np.ndarray, _begin_times: np.ndarray
+    ) -> DataStruct:
+        """
+        aggregate all ticks into bars at once, the running bar is not
+        touched, and cumulative values begin from 0
+
+        :param _data: ticks
+        :param _starts: the position of first tick of each bar
+        :param _begin_times: index of each bar
+        :return: columnar datastruct of bars, the same columns as getBarData()
+        """
+        columns = {self.idx_key: _begin_times}
+        if not len(_starts):
+            for k in self.keys[1:]:
+                columns[k] = []
+            return DataStruct.fromColumns(columns, self.idx_key, True)
+
+        ends = np.concatenate((_starts[1:], [len(_data)]))
+        price = _to_array(_data[self.price_key])
+        volume = self._get_changes(_to_array(_data[self.volume_key]))
+        close = price[ends - 1]
+        bar_volume = np.add.reduceat(volume, _starts)
+        amount = np.add.reduceat(price * volume, _starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.where(bar_volume != 0, amount / bar_volume, close)
+
+        columns['openprice'] = price[_starts]
+        columns['highprice'] = np.maximum.reduceat(price, _starts)
+        columns['lowprice'] = np.minimum.reduceat(price, _starts)
+        columns['closeprice'] = close
+        columns['volume'] = bar_volume
+        columns['vwap'] = vwap
+        columns['count'] = ends - _starts
+        if self.turnover_key is not None:
+            columns['turnover'] = np.add.reduceat(self._get_changes(
+                _to_array(_data[self.turnover_key])), _starts)
+        columns[self.end_key] = _to_array(_data.index())[ends - 1]
+        return DataStruct.fromColumns(columns, self.idx_key, True)
+
 
 class SplitAbstract:
-    def __init__(self):
+    def __init__(self, _aggregator: BarAggregator = None):
+        """
+        split ticks into bars, by default each bar is a datastruct
+        of its ticks, if _aggregator is set, ticks are aggregated into
+        OHLCV bars and not kept, see getBarData()
+
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        self.aggregator: BarAggregator = _aggregator
+        self.last_data: DataStruct = None
+
         self.cur_bar: DataStruct = None
         self.cur_bar_begin_time: DATETIME_TYPE = None
         self.cur_bar_end_time: DATETIME_TYPE = None
@@ -19,11 +371,38 @@ class SplitAbstract:
         self.bar_end_time_list: typing.List[DATETIME_TYPE] = []
 
     def __len__(self) -> len:
-        return len(self.getBarList())
+        return len(self.bar_begin_time_list)
+
+    def _get_spec(self) -> dict:
+        return {
+            'type': self.__class__.__name__,
+            'aggregator': None if self.aggregator is None
+            else self.aggregator.getSpec(),
+        }
+
+    def toJson(self) -> str:
+        """
+        the spec of spliter (type and args) as json, the spliters with the
+        same spec split the same ticks into the same bars
+
+        :return:
+        """
+        return json.dumps(self._get_spec(), sort_keys=True)
 
     def getLastData(self) -> DataStruct:
+        if self.aggregator is not None:
+            return self.last_data
         return self.cur_bar.iloc[-1]
 
+    def getBarData(self) -> DataStruct:
+        """
+        get the OHLCV bars, only available with aggregator
+
+        :return:
+        """
+        assert self.aggregator is not None
+        return self.aggregator.getBarData()
+
     def getCurBar(self) -> DataStruct:
         return self.cur_bar
 
@@ -48,13 +427,29 @@ class SplitAbstract:
         raise NotImplementedError('You need to implement _get_begin_end_time!')
 
     def _create_new_bar(self, _data: DataStruct, _cur_time: DATETIME_TYPE):
-        self.cur_bar = _data.clone()
         self.cur_bar_begin_time, self.cur_bar_end_time = \
             self._get_begin_end_time(_cur_time)
-        self.bar_list.append(self.cur_bar)
+        if self.aggregator is not None:
+            self.aggregator.newBar(self.cur_bar_begin_time)
+            self.aggregator.addTick(_data)
+            self.last_data = _data
+        else:
+            self.cur_bar = _data.clone()
+            self.bar_list.append(self.cur_bar)
         self.bar_begin_time_list.append(self.cur_bar_begin_time)
         self.bar_end_time_list.append(self.cur_bar_end_time)
 
+    def _add_to_cur_bar(self, _data: DataStruct):
+        if self.aggregator is not None:
+            self.aggregator.addTick(_data)
+            self.last_data = _data
+        else:
+            self.cur_bar.addDict(_data.toDict())
+
+    def _is_first(self) -> bool:
+        # no bar created yet
+        return not self.bar_begin_time_list
+
     def addOne(self, _data: DataStruct) -> bool:
         """
         add one tick data into spliter
@@ -68,12 +463,12 @@ class SplitAbstract:
 
         assert len(_data) == 1
         cur_time = _data.index()[0]
-        if self.cur_bar is None:
+        if self._is_first():
             self._create_new_bar(_data, cur_time)
             return True
         else:
             if cur_time < self.cur_bar_end_time:
-                self.cur_bar.addDict(_data.toDict())
+                self._add_to_cur_bar(_data)
                 return False
             else:
                 self._create_new_bar(_data, cur_time)
@@ -86,15 +481,130 @@ class SplitAbstract:
         Args:
             _data (DataStruct): continute data
         """
-        for d in _data:
-            self.addOne(d)
+        if isinstance(_data, (DataStruct, DataStructView)):
+            # read rows as records, instead of one-row datastructs
+            for d in _data.iterRows():
+                self.addOne(d)
+        else:
+            for d in _data:
+                self.addOne(d)
 
         return self
 
+    def _find_bars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        the vectorized version of addMany()
+
+        :param _data: ticks
+        :return: the position of first tick and begin time of each bar
+        """
+        raise NotImplementedError('You need to implement _find_bars!')
+
+    def buildBars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> DataStruct:
+        """
+        split all ticks (eg. one tradingday) into OHLCV bars at once by
+        numpy, the columns of bars are decided by aggregator
+        (default BarAggregator()). The bars and running bar of spliter
+        are not touched.
+
+        :param _data: ticks sorted by time
+        :return: columnar datastruct of bars
+        """
+        starts, begin_times = self._find_bars(_data)
+        return self._aggregate(_data, starts, begin_times)
 
-class SplitIntoSecond(SplitAbstract):
-    def __init__(self, _second: int = 1):
-        super().__init__()
+    def _aggregate(
+            self, _data: typing.Union[DataStruct, DataStructView],
+            _starts: np.ndarray, _begin_times: np.ndarray
+    ) -> DataStruct:
+        aggregator = self.aggregator
+        if aggregator is None:
+            aggregator = BarAggregator()
+        return aggregator.aggregate(_data, _starts, _begin_times)
+
+
+class SplitTimeAbstract(SplitAbstract):
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['bar_us'] = self._get_bar_us()
+        return spec
+
+    def _get_begin_us(self, _time: np.ndarray) -> np.ndarray:
+        """
+        the vectorized version of _get_begin_end_time(), on int64
+        microseconds from epoch
+
+        :param _time:
+        :return: begin of bar
+        """
+        raise NotImplementedError('You need to implement _get_begin_us!')
+
+    def _get_bar_us(self) -> int:
+        raise NotImplementedError('You need to implement _get_bar_us!')
+
+    def _get_period_us(self) -> int:
+        # the period in which bars are aligned, eg. one hour for minute bars
+        raise NotImplementedError('You need to implement _get_period_us!')
+
+    def buildBars(
+            self, _data: typing.Union[DataStruct, DataStructView],
+            _sessions: TradingSessions = None
+    ) -> DataStruct:
+        """
+        split all ticks (eg. one tradingday) into OHLCV bars at once, the
+        bars are found by integer arithmetic on the microseconds of time.
+        The bars and running bar of spliter are not touched, the columns
+        of bars are decided by aggregator (default BarAggregator()).
+
+        Without _sessions, the bars are the same as addMany().
+        With _sessions, bars are aligned to the open of each session and
+        cut at the close, ticks out of sessions join the nearest session.
+
+        :param _data: ticks sorted by time
+        :param _sessions: trading sessions
+        :return: columnar datastruct of bars
+        """
+        time_us = _to_us(_data.index())
+        bar_us = self._get_bar_us()
+        if _sessions is None:
+            begin = self._get_begin_us(time_us)
+            if self._get_period_us() % bar_us == 0:
+                starts = np.flatnonzero(np.concatenate((
+                    [True], begin[1:] != begin[:-1]
+                ))) if len(begin) else np.empty(0, dtype=np.int64)
+            else:
+                # the last bar of period goes into the next period,
+                # because the bar ends at begin + bar_us like addOne(),
+                # so find the next bar from the end of cur bar
+                starts = []
+                i = 0
+                while i < len(time_us):
+                    starts.append(i)
+                    i = int(np.searchsorted(
+                        time_us, begin[i] + bar_us, 'left'
+                    ))
+                starts = np.array(starts, dtype=np.int64)
+        else:
+            session_begin, session_end = _sessions.locate(time_us)
+            time_us = np.clip(time_us, session_begin, session_end - 1)
+            begin = session_begin + \
+                (time_us - session_begin) // bar_us * bar_us
+            starts = np.flatnonzero(np.concatenate((
+                [True], begin[1:] != begin[:-1]
+            ))) if len(begin) else np.empty(0, dtype=np.int64)
+
+        return self._aggregate(_data, starts, begin[starts].view('M8[us]'))
+
+
+class SplitIntoSecond(SplitTimeAbstract):
+    def __init__(
+            self, _second: int = 1, _aggregator: BarAggregator = None
+    ):
+        super().__init__(_aggregator)
         self.skip_s = _second
 
     def _get_begin_end_time(
@@ -105,10 +615,23 @@ class SplitIntoSecond(SplitAbstract):
         end_datetime = begin_datetime + timedelta(seconds=self.skip_s)
         return begin_datetime, end_datetime
 
+    def _get_begin_us(self, _time: np.ndarray) -> np.ndarray:
+        base = _time - _time % _MINUTE_US
+        return base + (_time - base) // self._get_bar_us() * \
+            self._get_bar_us()
 
-class SplitIntoMinute(SplitAbstract):
-    def __init__(self, _minute: int = 1):
-        super().__init__()
+    def _get_bar_us(self) -> int:
+        return self.skip_s * _SECOND_US
+
+    def _get_period_us(self) -> int:
+        return _MINUTE_US
+
+
+class SplitIntoMinute(SplitTimeAbstract):
+    def __init__(
+            self, _minute: int = 1, _aggregator: BarAggregator = None
+    ):
+        super().__init__(_aggregator)
         self.skip_m = _minute
 
     def _get_begin_end_time(
@@ -120,10 +643,23 @@ class SplitIntoMinute(SplitAbstract):
         end_datetime = begin_datetime + timedelta(minutes=self.skip_m)
         return begin_datetime, end_datetime
 
+    def _get_begin_us(self, _time: np.ndarray) -> np.ndarray:
+        base = _time - _time % _HOUR_US
+        return base + (_time - base) // self._get_bar_us() * \
+            self._get_bar_us()
 
-class SplitIntoHour(SplitAbstract):
-    def __init__(self, _hour: int = 1):
-        super().__init__()
+    def _get_bar_us(self) -> int:
+        return self.skip_m * _MINUTE_US
+
+    def _get_period_us(self) -> int:
+        return _HOUR_US
+
+
+class SplitIntoHour(SplitTimeAbstract):
+    def __init__(
+            self, _hour: int = 1, _aggregator: BarAggregator = None
+    ):
+        super().__init__(_aggregator)
         self.skip_h = _hour
 
     def _get_begin_end_time(
@@ -135,176 +671,756 @@ class SplitIntoHour(SplitAbstract):
         end_datetime = begin_datetime + timedelta(hours=self.skip_h)
         return begin_datetime, end_datetime
 
+    def _get_begin_us(self, _time: np.ndarray) -> np.ndarray:
+        base = _time - _time % _DAY_US
+        return base + (_time - base) // self._get_bar_us() * \
+            self._get_bar_us()
 
-class SplitIntoWeek(SplitAbstract):
-    def _get_begin_end_time(
-            self, _cur_time: DATETIME_TYPE
-    ) -> (DATETIME_TYPE, DATETIME_TYPE):
-        cur_date = datetime.strptime(_cur_time, '%Y%m%d')
-        weekday = cur_date.weekday()
-        begin_datetime: datetime = cur_date - timedelta(days=weekday)
-        end_datetime: datetime = begin_datetime + timedelta(weeks=1)
-        return (
-            begin_datetime.strftime('%Y%m%d'),
-            end_datetime.strftime('%Y%m%d')
-        )
+    def _get_bar_us(self) -> int:
+        return self.skip_h * _HOUR_US
 
+    def _get_period_us(self) -> int:
+        return _DAY_US
 
-class SplitIntoMonth(SplitAbstract):
-    def _get_begin_end_time(
-            self, _cur_time: DATETIME_TYPE
-    ) -> (DATETIME_TYPE, DATETIME_TYPE):
-        cur_date = arrow.get(_cur_time, 'YYYYMMDD')
-        begin_datetime = cur_date.replace(day=1)
-        end_datetime = begin_datetime.shift(months=1)
-        return (
-            begin_datetime.format('YYYYMMDD'),
-            end_datetime.format('YYYYMMDD')
-        )
 
+class SplitDateAbstract(SplitAbstract):
+    FREQ: str = None
+
+    def __init__(
+            self, _aggregator: BarAggregator = None,
+            _bucket: DateBucket = None
+    ):
+        """
+        split daily data by the tradingday 'YYYYMMDD' in index
+
+        :param _aggregator: aggregate ticks instead of keeping them
+        :param _bucket: the bucket to find begin and end, default the one
+            shared by all spliters, or a TradingDayBucket to begin bars
+            at tradingdays
+        """
+        super().__init__(_aggregator)
+        if _bucket is None:
+            _bucket = DateBucket.shared(self.FREQ)
+        assert _bucket.freq == self.FREQ
+        self.bucket: DateBucket = _bucket
 
-class SplitIntoYear(SplitAbstract):
     def _get_begin_end_time(
             self, _cur_time: DATETIME_TYPE
     ) -> (DATETIME_TYPE, DATETIME_TYPE):
-        cur_date = arrow.get(_cur_time, 'YYYYMMDD')
-        begin_datetime = cur_date.replace(day=1)
-        end_datetime = begin_datetime.shift(years=1)
-        return (
-            begin_datetime.format('YYYYMMDD'),
-            end_datetime.format('YYYYMMDD')
-        )
+        return self.bucket.getBeginEnd(_cur_time)
+
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['bucket'] = self.bucket.__class__.__name__
+        return spec
+
+    def _find_bars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        like addOne(), the next bar begins at the first tradingday not
+        before the end of cur bar, found by searchsorted
+        """
+        days = _to_array(_data.index())
+        starts = []
+        begin_times = []
+        i = 0
+        while i < len(days):
+            begin, end = self.bucket.getBeginEnd(days[i])
+            starts.append(i)
+            begin_times.append(begin)
+            i = max(i + 1, int(np.searchsorted(days, end, 'left')))
+        return np.array(starts, dtype=np.int64), \
+            np.array(begin_times, dtype=object)
+
+
+class SplitIntoWeek(SplitDateAbstract):
+    FREQ = DateBucket.WEEK
+
 
+class SplitIntoMonth(SplitDateAbstract):
+    FREQ = DateBucket.MONTH
+
+
+class SplitIntoYear(SplitDateAbstract):
+    FREQ = DateBucket.YEAR
+
+
+class SplitThresholdAbstract(SplitAbstract):
+    # new bar when total > threshold instead of >=
+    STRICT = False
 
-class SplitVolumeBars(SplitAbstract):
     def __init__(
-            self, _use_key='volume', _volume_size: int = 1,
+            self, _threshold: float,
+            _cumulative: bool = False,
+            _aggregator: BarAggregator = None
     ):
         """
+        begin a new bar when the sum of amount (ticks, volume, dollar ...)
+        in cur bar reaches _threshold. The sum is checked before adding
+        the new tick, so the bar is done after the tick reaching _threshold
 
-        :param _use_key: use which index to split volume
-        :param _volume_size: split ticks
+        :param _threshold: sum of amount in one bar
+        :param _cumulative: volume and turnover of tick are cumulative
+            in the tradingday (like CTP), so the change is used
+        :param _aggregator: aggregate ticks instead of keeping them
         """
-        super().__init__()
+        super().__init__(_aggregator)
 
-        self.use_key = _use_key
-        self.volume_size = _volume_size
+        self.threshold = _threshold
+        self.cumulative = _cumulative
 
-        self.total_volume = 0
+        self.total = 0  # sum of amount in cur bar
+        self.last_volume = 0
+        self.last_turnover = 0
 
     def _get_begin_end_time(
             self, _cur_time: DATETIME_TYPE
     ) -> (DATETIME_TYPE, DATETIME_TYPE):
         return _cur_time, _cur_time
 
-    def addOne(self, _data: DataStruct):
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['threshold'] = self.threshold
+        spec['cumulative'] = self.cumulative
+        return spec
+
+    def _get_amount(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ) -> float:
+        raise NotImplementedError('You need to implement _get_amount!')
+
+    def _get_amounts(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> np.ndarray:
+        # the vectorized version of _get_amount()
+        raise NotImplementedError('You need to implement _get_amounts!')
+
+    def _volume_change(self, _volume: typing.Any) -> typing.Any:
+        if not self.cumulative:
+            return _volume
+        change = _get_change(_volume, self.last_volume)
+        self.last_volume = _volume
+        return change
+
+    def _turnover_change(self, _turnover: typing.Any) -> typing.Any:
+        if not self.cumulative:
+            return _turnover
+        change = _get_change(_turnover, self.last_turnover)
+        self.last_turnover = _turnover
+        return change
+
+    def _volume_changes(self, _volumes: np.ndarray) -> np.ndarray:
+        if not self.cumulative:
+            return _volumes
+        return _get_changes(_volumes)
+
+    def _turnover_changes(self, _turnovers: np.ndarray) -> np.ndarray:
+        if not self.cumulative:
+            return _turnovers
+        return _get_changes(_turnovers)
+
+    def _is_full(self) -> bool:
+        if self.STRICT:
+            return self.total > self.threshold
+        return self.total >= self.threshold
+
+    def addOne(self, _data: DataStruct) -> bool:
         assert len(_data) == 1
         cur_time = _data.index()[0]
-        cur_volume = _data[self.use_key][0]
-        if self.cur_bar is None:  # the first tick
-            self._create_new_bar(_data, cur_time)
-            self.total_volume = cur_volume
-            return True
-
-        if self.total_volume > self.volume_size:
+        amount = self._get_amount(_data)
+        if self._is_first() or self._is_full():
             self._create_new_bar(_data, cur_time)
-            self.total_volume = cur_volume
+            self.total = amount
             return True
 
-        self.cur_bar.addDict(_data.toDict())
+        self._add_to_cur_bar(_data)
         self.cur_bar_end_time = cur_time  # override end time
         self.bar_end_time_list[-1] = cur_time
-        self.total_volume += cur_volume
+        self.total += amount
         return False
 
+    def _find_bars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        the last tick of each bar is found by searchsorted on the cumsum
+        of amounts, so it takes O(log n) for each bar. The float sum may
+        differ from addMany() by rounding when it is exactly the threshold
+        """
+        amounts = self._get_amounts(_data)
+        assert not len(amounts) or amounts.min() >= 0
+        # float64, so searchsorted does not cast the array each time
+        csum = np.cumsum(amounts, dtype=np.float64)
+        side = 'right' if self.STRICT else 'left'
+        starts = []
+        i = 0
+        while i < len(csum):
+            starts.append(i)
+            base = csum[i - 1] if i else 0
+            # the last tick of cur bar
+            j = int(np.searchsorted(csum, base + self.threshold, side))
+            i = max(i, j) + 1
+        starts = np.array(starts, dtype=np.int64)
+        return starts, _to_array(_data.index())[starts]
+
 
-class SplitTickImbalance(SplitAbstract):
+class SplitTickBars(SplitThresholdAbstract):
     def __init__(
-            self, _use_key='lastprice',
-            _period=7, _init_T=1000
+            self, _tick_size: int = 1, _aggregator: BarAggregator = None
     ):
         """
-        <Advances in Financial Machine Learning> - 2.3.2.1
+        each bar has _tick_size ticks
 
-        _use_key: use which index to calc bt
-        _init_T: the length of first bar
-        _period: period of EMA
+        :param _tick_size: ticks in one bar
+        :param _aggregator: aggregate ticks instead of keeping them
         """
-        super().__init__()
+        super().__init__(_tick_size, _aggregator=_aggregator)
+
+    def _get_amount(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ) -> float:
+        return 1
+
+    def _get_amounts(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> np.ndarray:
+        return np.ones(len(_data), dtype=np.int64)
+
+
+class SplitVolumeBars(SplitThresholdAbstract):
+    STRICT = True
+
+    def __init__(
+            self, _use_key='volume', _volume_size: int = 1,
+            _aggregator: BarAggregator = None, _cumulative: bool = False
+    ):
+        """
+        begin a new bar when the volume of cur bar is greater than
+        _volume_size
+
+        :param _use_key: use which index to split volume
+        :param _volume_size: split ticks
+        :param _aggregator: aggregate ticks instead of keeping them
+        :param _cumulative: the volume is cumulative in the tradingday
+        """
+        super().__init__(_volume_size, _cumulative, _aggregator)
 
         self.use_key = _use_key
-        self.last_value = None
+        self.volume_size = _volume_size
 
-        self.last_b = 1
-        self.sum_b = 0  # sum of b
-        self.num_b = 0  # total number of b
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['use_key'] = self.use_key
+        return spec
+
+    def _get_amount(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ) -> float:
+        return self._volume_change(_data.getValue(self.use_key))
+
+    def _get_amounts(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> np.ndarray:
+        return self._volume_changes(_to_array(_data[self.use_key]))
+
+
+class SplitDollarBars(SplitThresholdAbstract):
+    def __init__(
+            self, _dollar_size: float = 1.,
+            _price_key: str = 'lastprice', _volume_key: str = 'volume',
+            _turnover_key: str = None, _cumulative: bool = False,
+            _aggregator: BarAggregator = None
+    ):
+        """
+        begin a new bar when the turnover of cur bar reaches _dollar_size
+
+        :param _dollar_size: turnover in one bar
+        :param _price_key: the key of price in tick
+        :param _volume_key: the key of volume in tick
+        :param _turnover_key: the key of turnover in tick,
+            if None, price * volume is used
+        :param _cumulative: volume and turnover are cumulative
+            in the tradingday
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        super().__init__(_dollar_size, _cumulative, _aggregator)
 
-        self.T = _init_T  # len of Bar
-        self.P = None  # probability of b == 1
+        self.price_key = _price_key
+        self.volume_key = _volume_key
+        self.turnover_key = _turnover_key
+
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['price_key'] = self.price_key
+        spec['volume_key'] = self.volume_key
+        spec['turnover_key'] = self.turnover_key
+        return spec
+
+    def _get_amount(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ) -> float:
+        if self.turnover_key is not None:
+            return self._turnover_change(_data.getValue(self.turnover_key))
+        return _data.getValue(self.price_key) * self._volume_change(
+            _data.getValue(self.volume_key)
+        )
+
+    def _get_amounts(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> np.ndarray:
+        if self.turnover_key is not None:
+            return self._turnover_changes(
+                _to_array(_data[self.turnover_key])
+            )
+        return _to_array(_data[self.price_key]) * self._volume_changes(
+            _to_array(_data[self.volume_key])
+        )
+
+
+class SplitInformationAbstract(SplitAbstract):
+    def __init__(
+            self, _use_key: str = 'lastprice',
+            _period: int = 7, _init_T: int = 1000,
+            _aggregator: BarAggregator = None,
+            _volume_key: str = None, _cumulative: bool = False
+    ):
+        """
+        <Advances in Financial Machine Learning> - 2.3.2
+
+        the bar is done when the statistic of b (the sign of price change
+        by tick rule) in cur bar exceeds the expected value, which is
+        estimated by the EMA of previous bars. Only the sums of cur bar
+        are kept, so it is O(1) for each tick
+
+        :param _use_key: use which index to calc b
+        :param _period: period of EMA
+        :param _init_T: the length of first bar
+        :param _aggregator: aggregate ticks instead of keeping them
+        :param _volume_key: b is weighted by volume, None for ticks
+        :param _cumulative: the volume is cumulative in the tradingday
+        """
+        super().__init__(_aggregator)
+
+        self.use_key = _use_key
         self.period = _period
+        self.volume_key = _volume_key
+        self.cumulative = _cumulative
+        self.init_T = _init_T
+
+        self._init_estimates()
+
+    def _init_estimates(self):
+        # the tick rule and the estimates of a new spliter
+        self.last_volume = 0
+
+        self.last_value = None
+        self.last_b = 1
+
+        self.T = self.init_T  # expected len of bar
         self.threshold = None
+        self.num_b = 0  # number of ticks in cur bar
 
     def _get_begin_end_time(
             self, _cur_time: DATETIME_TYPE
     ) -> (DATETIME_TYPE, DATETIME_TYPE):
         return _cur_time, _cur_time
 
-    def _update_b(self, _value):
-        # update value, b and total_b
-        if _value > self.last_value:
-            self.last_b = 1
-        elif _value < self.last_value:
-            self.last_b = -1
-        else:
-            pass
+    def _get_spec(self) -> dict:
+        spec = super()._get_spec()
+        spec['use_key'] = self.use_key
+        spec['period'] = self.period
+        spec['init_T'] = self.init_T
+        spec['volume_key'] = self.volume_key
+        spec['cumulative'] = self.cumulative
+        return spec
+
+    def _get_weight(
+            self, _data: typing.Union[DataStruct, TickRecord]
+    ) -> float:
+        # the weight of b, 1 for ticks
+        if self.volume_key is None:
+            return 1
+        volume = _data.getValue(self.volume_key)
+        if not self.cumulative:
+            return volume
+        change = _get_change(volume, self.last_volume)
+        self.last_volume = volume
+        return change
+
+    def _get_weights(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> np.ndarray:
+        if self.volume_key is None:
+            return np.ones(len(_data), dtype=np.int64)
+        volumes = _to_array(_data[self.volume_key])
+        if not self.cumulative:
+            return volumes
+        return _get_changes(volumes)
+
+    def _get_b(self, _value: typing.Any) -> int:
+        # tick rule, keep the last b if price not changed
+        if self.last_value is not None:
+            if _value > self.last_value:
+                self.last_b = 1
+            elif _value < self.last_value:
+                self.last_b = -1
         self.last_value = _value
-        self.sum_b += self.last_b
-        self.num_b += 1
+        return self.last_b
 
-    def _reset_b(self):
-        self.sum_b = 0
-        self.num_b = 0
+    def _get_bs(self, _values: np.ndarray) -> np.ndarray:
+        """
+        the vectorized version of _get_b()
+        """
+        if not len(_values):
+            return np.empty(0, dtype=np.int64)
+        last_value = _values[0] if self.last_value is None \
+            else self.last_value
+        prev = np.concatenate(([last_value], _values[:-1]))
+        b = np.concatenate(([self.last_b], np.sign(_values - prev)))
+        b = b.astype(np.int64)
+        # fill 0 by the last non-zero b
+        pos = np.where(b != 0, np.arange(len(b)), 0)
+        np.maximum.accumulate(pos, out=pos)
+        b = b[pos][1:]
+        self.last_value = _values[-1].item()
+        self.last_b = int(b[-1])
+        return b
+
+    def _reset(self):
+        raise NotImplementedError('You need to implement _reset!')
+
+    def _update(self, _b: int, _weight: float):
+        # add one tick into the sums of cur bar
+        raise NotImplementedError('You need to implement _update!')
 
     def _update_threshold(self):
-        new_T = self.num_b
-        new_P = (self.sum_b + self.num_b) / 2. / self.num_b
-        self.T += (new_T - self.T) / self.period
-        if self.P is None:  # init p
-            self.P = new_P
-        else:
-            self.P += (new_P - self.P) / self.period
-        self.threshold = self.T * abs(2 * self.P - 1)
+        raise NotImplementedError('You need to implement _update_threshold!')
+
+    def _is_full(self) -> bool:
+        raise NotImplementedError('You need to implement _is_full!')
+
+    def _full(self) -> bool:
+        if self.threshold is None:  # cur is the first bar
+            return self.num_b >= self.T
+        return self._is_full()
 
     def addOne(self, _data: DataStruct) -> bool:
-        # check data
         assert len(_data) == 1
-        value = _data[self.use_key][0]
+        b = self._get_b(_data.getValue(self.use_key))
+        weight = self._get_weight(_data)
         cur_time = _data.index()[0]
 
-        if self.cur_bar is None:  # init the first bar
-            self.last_value = value
+        if self._is_first() or self._full():
+            if not self._is_first():
+                self._update_threshold()
+            self._reset()
             self._create_new_bar(_data, cur_time)
+            self._update(b, weight)
             return True
 
-        self._update_b(value)
-        print(value, self.last_b, self.sum_b, self.num_b)
+        self._add_to_cur_bar(_data)
+        self.cur_bar_end_time = cur_time  # override end time
+        self.bar_end_time_list[-1] = cur_time
+        self._update(b, weight)
+        return False
+
+    def _find_end(
+            self, _sums: typing.Tuple[np.ndarray, ...], _begin: int
+    ) -> int:
+        """
+        find the last tick of the bar beginning at _begin
+
+        :param _sums: the cumsums of arrays
+        :param _begin:
+        :return: -1 if not done
+        """
+        raise NotImplementedError('You need to implement _find_end!')
+
+    def _get_sums(
+            self, _b: np.ndarray, _weight: np.ndarray
+    ) -> typing.Tuple[np.ndarray, ...]:
+        raise NotImplementedError('You need to implement _get_sums!')
+
+    def _set_sums(
+            self, _sums: typing.Tuple[np.ndarray, ...],
+            _begin: int, _end: int
+    ):
+        # set the sums of cur bar to the ticks in [_begin, _end]
+        raise NotImplementedError('You need to implement _set_sums!')
+
+    def buildBars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> DataStruct:
+        """
+        split all ticks into OHLCV bars at once, the estimates of threshold
+        (and the tick rule) begin from those of a new spliter, so the same
+        ticks always get the same bars. The spliter is not touched, use
+        buildNextBars() to go on estimating day by day
+
+        :param _data: ticks sorted by time
+        :return: columnar datastruct of bars
+        """
+        spliter = copy.copy(self)
+        spliter._init_estimates()
+        return spliter.buildNextBars(_data)
 
-        flag = False
-        if self.P is None:  # current is the first bar
-            if self.num_b >= self.T:  # finish the first bar
-                flag = True
-        elif abs(self.sum_b) >= self.threshold:  # create new bar
-            flag = True
+    def buildNextBars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> DataStruct:
+        """
+        like buildBars(), but the estimates begin from the spliter, and
+        are kept for the next call, so days can be built one by one.
+        The bars and running bar of spliter are not touched
 
-        if flag:
+        :param _data: ticks sorted by time, after the last call
+        :return: columnar datastruct of bars
+        """
+        starts, begin_times = self._find_bars(_data)
+        return self._aggregate(_data, starts, begin_times)
+
+    def _find_bars(
+            self, _data: typing.Union[DataStruct, DataStructView]
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        the end of each bar is found by numpy on the cumsums, the estimates
+        of threshold (and the tick rule) go on from the spliter
+        """
+        b = self._get_bs(_to_array(_data[self.use_key]))
+        sums = self._get_sums(b, self._get_weights(_data))
+        starts = []
+        i = 0
+        while i < len(b):
+            starts.append(i)
+            if self.threshold is None:
+                j = i + int(np.ceil(self.T)) - 1
+                if j >= len(b):
+                    j = -1
+            else:
+                j = self._find_end(sums, i)
+            if j < 0:
+                break
+            self._set_sums(sums, i, j)
             self._update_threshold()
-            print(self.T, self.P, self.threshold)
-            input()
-            self._reset_b()
-            self._create_new_bar(_data, cur_time)
-            return True
+            i = j + 1
+        starts = np.array(starts, dtype=np.int64)
+        return starts, _to_array(_data.index())[starts]
+
+
+def _seg_sum(_csum: np.ndarray, _begin: int, _end: int) -> typing.Any:
+    # sum of [_begin, _end] by cumsum
+    return (_csum[_end] - _csum[_begin - 1] if _begin else _csum[_end]).item()
+
+
+class SplitImbalanceAbstract(SplitInformationAbstract):
+    """
+    imbalance bars, the bar is done when
+    |sum of b * weight| >= E[T] * |E[b * weight]|
+    """
+
+    def _init_estimates(self):
+        super()._init_estimates()
+        self.E = None  # expected b * weight of one tick
+        self.sum_b = 0  # sum of b * weight in cur bar
+
+    def _reset(self):
+        self.sum_b = 0
+        self.num_b = 0
+
+    def _update(self, _b: int, _weight: float):
+        self.sum_b += _b * _weight
+        self.num_b += 1
+
+    def _update_threshold(self):
+        new_E = self.sum_b / self.num_b
+        self.T += (self.num_b - self.T) / self.period
+        if self.E is None:  # init E
+            self.E = new_E
         else:
-            self.cur_bar.addDict(_data.toDict())
-            self.cur_bar_end_time = cur_time  # override end time
-            self.bar_end_time_list[-1] = cur_time
-            return False
+            self.E += (new_E - self.E) / self.period
+        self.threshold = self.T * abs(self.E)
+
+    def _is_full(self) -> bool:
+        return abs(self.sum_b) >= self.threshold
+
+    def _get_sums(
+            self, _b: np.ndarray, _weight: np.ndarray
+    ) -> typing.Tuple[np.ndarray, ...]:
+        # float64, so searchsorted does not cast the array each time
+        return np.cumsum(_b * _weight, dtype=np.float64),
+
+    def _set_sums(
+            self, _sums: typing.Tuple[np.ndarray, ...],
+            _begin: int, _end: int
+    ):
+        self.sum_b = _seg_sum(_sums[0], _begin, _end)
+        self.num_b = _end - _begin + 1
+
+    def _find_end(
+            self, _sums: typing.Tuple[np.ndarray, ...], _begin: int
+    ) -> int:
+        # |sum| is not monotonic, scan in growing blocks
+        csum = _sums[0]
+        base = csum[_begin - 1] if _begin else 0
+        size = max(int(self.T), 16)
+        i = _begin
+        while i < len(csum):
+            stop = min(len(csum), i + size)
+            hit = np.flatnonzero(
+                np.abs(csum[i:stop] - base) >= self.threshold
+            )
+            if len(hit):
+                return i + int(hit[0])
+            i = stop
+            size *= 2
+        return -1
+
+
+class SplitTickImbalance(SplitImbalanceAbstract):
+    def __init__(
+            self, _use_key='lastprice',
+            _period=7, _init_T=1000,
+            _aggregator: BarAggregator = None
+    ):
+        """
+        <Advances in Financial Machine Learning> - 2.3.2.1
+
+        :param _use_key: use which index to calc b
+        :param _period: period of EMA
+        :param _init_T: the length of first bar
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        super().__init__(_use_key, _period, _init_T, _aggregator)
+
+
+class SplitVolumeImbalance(SplitImbalanceAbstract):
+    def __init__(
+            self, _use_key='lastprice', _volume_key='volume',
+            _period=7, _init_T=1000, _cumulative: bool = False,
+            _aggregator: BarAggregator = None
+    ):
+        """
+        <Advances in Financial Machine Learning> - 2.3.2.2
+
+        :param _use_key: use which index to calc b
+        :param _volume_key: the key of volume in tick
+        :param _period: period of EMA
+        :param _init_T: the length of first bar
+        :param _cumulative: the volume is cumulative in the tradingday
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        super().__init__(
+            _use_key, _period, _init_T, _aggregator,
+            _volume_key, _cumulative
+        )
+
+
+class SplitRunsAbstract(SplitInformationAbstract):
+    """
+    runs bars, the bar is done when
+    max(sum of buy weight, sum of sell weight) >=
+    E[T] * max(E[buy weight], E[sell weight])
+    """
+
+    def _init_estimates(self):
+        super()._init_estimates()
+        self.E_buy = None  # expected buy weight of one tick
+        self.E_sell = None
+        self.sum_buy = 0  # sum of weight with b == 1 in cur bar
+        self.sum_sell = 0
+
+    def _reset(self):
+        self.sum_buy = 0
+        self.sum_sell = 0
+        self.num_b = 0
+
+    def _update(self, _b: int, _weight: float):
+        if _b > 0:
+            self.sum_buy += _weight
+        else:
+            self.sum_sell += _weight
+        self.num_b += 1
+
+    def _update_threshold(self):
+        new_buy = self.sum_buy / self.num_b
+        new_sell = self.sum_sell / self.num_b
+        self.T += (self.num_b - self.T) / self.period
+        if self.E_buy is None:
+            self.E_buy = new_buy
+            self.E_sell = new_sell
+        else:
+            self.E_buy += (new_buy - self.E_buy) / self.period
+            self.E_sell += (new_sell - self.E_sell) / self.period
+        self.threshold = self.T * max(self.E_buy, self.E_sell)
+
+    def _is_full(self) -> bool:
+        return max(self.sum_buy, self.sum_sell) >= self.threshold
+
+    def _get_sums(
+            self, _b: np.ndarray, _weight: np.ndarray
+    ) -> typing.Tuple[np.ndarray, ...]:
+        # float64, so searchsorted does not cast the array each time
+        return (
+            np.cumsum(np.where(_b > 0, _weight, 0), dtype=np.float64),
+            np.cumsum(np.where(_b > 0, 0, _weight), dtype=np.float64),
+        )
+
+    def _set_sums(
+            self, _sums: typing.Tuple[np.ndarray, ...],
+            _begin: int, _end: int
+    ):
+        self.sum_buy = _seg_sum(_sums[0], _begin, _end)
+        self.sum_sell = _seg_sum(_sums[1], _begin, _end)
+        self.num_b = _end - _begin + 1
+
+    def _find_end(
+            self, _sums: typing.Tuple[np.ndarray, ...], _begin: int
+    ) -> int:
+        # both sums are not decreasing, so searchsorted works
+        end = len(_sums[0])
+        for csum in _sums:
+            base = csum[_begin - 1] if _begin else 0
+            end = min(end, int(np.searchsorted(
+                csum, base + self.threshold, 'left'
+            )))
+        end = max(end, _begin)
+        return end if end < len(_sums[0]) else -1
+
+
+class SplitTickRuns(SplitRunsAbstract):
+    def __init__(
+            self, _use_key='lastprice',
+            _period=7, _init_T=1000,
+            _aggregator: BarAggregator = None
+    ):
+        """
+        <Advances in Financial Machine Learning> - 2.3.2.3
+
+        :param _use_key: use which index to calc b
+        :param _period: period of EMA
+        :param _init_T: the length of first bar
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        super().__init__(_use_key, _period, _init_T, _aggregator)
+
+
+class SplitVolumeRuns(SplitRunsAbstract):
+    def __init__(
+            self, _use_key='lastprice', _volume_key='volume',
+            _period=7, _init_T=1000, _cumulative: bool = False,
+            _aggregator: BarAggregator = None
+    ):
+        """
+        <Advances in Financial Machine Learning> - 2.3.2.3
+
+        :param _use_key: use which index to calc b
+        :param _volume_key: the key of volume in tick
+        :param _period: period of EMA
+        :param _init_T: the length of first bar
+        :param _cumulative: the volume is cumulative in the tradingday
+        :param _aggregator: aggregate ticks instead of keeping them
+        """
+        super().__init__(
+            _use_key, _period, _init_T, _aggregator,
+            _volume_key, _cumulative
+        )
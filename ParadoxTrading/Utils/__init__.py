@@ -1,4 +1,10 @@
-from .DataStruct import DataStruct
+from .Accumulator import ExtremumAccumulator, MomentAccumulator, \
+    RegressionAccumulator, SumAccumulator
+from .Calendar import DateBucket, TradingDayBucket
+from .Column import Column, RingColumn
+from .DataStruct import DataStruct, DataStructView, TickRecord
 from .Serializable import Serializable
-from .Split import SplitIntoHour, SplitIntoMinute, SplitIntoMonth, \
-    SplitIntoSecond, SplitIntoWeek, SplitTickImbalance, SplitVolumeBars
+from .Split import BarAggregator, SplitDollarBars, SplitIntoHour, \
+    SplitIntoMinute, SplitIntoMonth, SplitIntoSecond, SplitIntoWeek, \
+    SplitIntoYear, SplitTickBars, SplitTickImbalance, SplitTickRuns, \
+    SplitVolumeBars, SplitVolumeImbalance, SplitVolumeRuns, TradingSessions
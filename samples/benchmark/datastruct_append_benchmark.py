@@ -0,0 +1,84 @@
+import random
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from ParadoxTrading.Utils import DataStruct
+
+TICK_NUM = 100000
+KEYS = [
+    'happentime', 'tradingday', 'lastprice', 'highestprice',
+    'lowestprice', 'volume', 'openinterest', 'askprice', 'askvolume',
+    'bidprice', 'bidvolume'
+]
+
+
+def create_rows(_num: int) -> list:
+    # fake ticks of one day, sorted by happentime like ORDER BY
+    begin = datetime(2017, 1, 3, 9)
+    price = 3000.
+    volume = 0
+    rows = []
+    for i in range(_num):
+        price += random.choice((-1., 0., 1.))
+        volume += random.randint(0, 10)
+        rows.append([
+            begin + timedelta(milliseconds=500 * i), '20170103',
+            price, price + 10, price - 10, volume, 100000.,
+            price + 1, random.randint(1, 100),
+            price - 1, random.randint(1, 100),
+        ])
+    return rows
+
+
+def legacy_add_rows(_struct: DataStruct, _rows: list, _keys: list):
+    # the old path: one dict per row, bisect and list.insert
+    for row in _rows:
+        tmp_dict = dict(zip(_keys, row))
+        insert_idx = bisect_right(
+            _struct.index(), tmp_dict[_struct.index_name]
+        )
+        for k in _struct.data.keys():
+            _struct.data[k].insert(insert_idx, tmp_dict[k])
+
+
+def bench(_name: str, _func):
+    begin = time.perf_counter()
+    ret = _func()
+    print('{:<32}{:>10.4f}s'.format(_name, time.perf_counter() - begin))
+    return ret
+
+
+rows = create_rows(TICK_NUM)
+print('{} ticks'.format(TICK_NUM))
+
+legacy = DataStruct(KEYS, 'happentime')
+bench('legacy bisect + insert', lambda: legacy_add_rows(legacy, rows, KEYS))
+
+
+def add_dict_one_by_one():
+    tmp = DataStruct(KEYS, 'happentime')
+    for row in rows:
+        tmp.addDict(dict(zip(KEYS, row)))
+    return tmp
+
+
+def add_row_one_by_one(_columnar: bool):
+    tmp = DataStruct(KEYS, 'happentime', _columnar=_columnar)
+    for row in rows:
+        tmp.addRow(row, KEYS)
+    return tmp
+
+
+bench('addDict append path', add_dict_one_by_one)
+bench('addRow append path', lambda: add_row_one_by_one(False))
+bench('addRow append path (columnar)', lambda: add_row_one_by_one(True))
+bench('addRows', lambda: DataStruct(KEYS, 'happentime', rows))
+bench('fromSortedRows', lambda: DataStruct.fromSortedRows(
+    rows, KEYS, 'happentime'
+))
+struct = bench('fromSortedRows (columnar)', lambda: DataStruct.fromSortedRows(
+    rows, KEYS, 'happentime', True
+))
+
+assert struct.toRows(KEYS)[0] == legacy.toRows(KEYS)[0]
@@ -0,0 +1,162 @@
+import math
+import random
+import statistics
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.stats import linregress
+
+from ParadoxTrading.Indicator import BBands, FastSTD, KDJ, MA, MAX, RSRS, \
+    STD, Volatility
+from ParadoxTrading.Utils import DataStruct
+
+TICK_NUM = 100000
+PERIOD = 60
+LONG_PERIOD = 2000
+KEYS = ['time', 'closeprice', 'highprice', 'lowprice']
+
+
+def create_rows(_num: int) -> list:
+    # fake bars, random walk of price
+    begin = datetime(2017, 1, 3, 9)
+    price = 3000.
+    rows = []
+    for i in range(_num):
+        price += random.choice((-1., 0., 1.))
+        rows.append([
+            begin + timedelta(minutes=i), price,
+            price + random.random() * 5, price - random.random() * 5,
+        ])
+    return rows
+
+
+def legacy_mean(_values: list) -> list:
+    # the old path: statistics on the whole window each tick
+    buf = deque(maxlen=PERIOD)
+    ret = []
+    for v in _values:
+        buf.append(v)
+        ret.append(statistics.mean(buf))
+    return ret
+
+
+def legacy_pstdev(_values: list) -> list:
+    buf = deque(maxlen=PERIOD)
+    ret = []
+    for v in _values:
+        buf.append(v)
+        ret.append(statistics.pstdev(buf))
+    return ret
+
+
+def legacy_sum_of_pow(_values: list) -> list:
+    # the old fast path: running sum of squares, which drifts
+    buf = deque(maxlen=PERIOD)
+    mean = 0.
+    sum_of_pow = 0.
+    ret = []
+    for v in _values:
+        if len(buf) >= PERIOD:
+            last_value = buf.popleft()
+            buf.append(v)
+            sum_of_pow += v ** 2 - last_value ** 2
+            mean += (v - last_value) / PERIOD
+        else:
+            n = len(buf)
+            buf.append(v)
+            sum_of_pow += v ** 2
+            mean = (mean * n + v) / len(buf)
+        ret.append(math.sqrt(max(sum_of_pow / len(buf) - mean ** 2, 0.)))
+    return ret
+
+
+def legacy_max(_values: list, _period: int) -> list:
+    # the old path: max over the whole window each tick
+    buf = deque(maxlen=_period)
+    ret = []
+    for v in _values:
+        buf.append(v)
+        ret.append(max(buf))
+    return ret
+
+
+def legacy_rsrs(_high: list, _low: list, _period: int) -> list:
+    # the old path: linregress on the whole windows each tick
+    high_buf = deque(maxlen=_period)
+    low_buf = deque(maxlen=_period)
+    ret = []
+    for h, l in zip(_high, _low):
+        high_buf.append(h)
+        low_buf.append(l)
+        if len(high_buf) >= _period:
+            x = np.arange(_period)
+            ret.append(
+                linregress(x, high_buf)[0] - linregress(x, low_buf)[0]
+            )
+    return ret
+
+
+def bench(_name: str, _func):
+    begin = time.perf_counter()
+    ret = _func()
+    cost = time.perf_counter() - begin
+    print('{:<32}{:>10.4f}s{:>10.2f}us/tick'.format(
+        _name, cost, cost / TICK_NUM * 1e6
+    ))
+    return ret
+
+
+rows = create_rows(TICK_NUM)
+data = DataStruct.fromSortedRows(rows, KEYS, 'time')
+closeprice = [r[1] for r in rows]
+print('{} ticks, period {}'.format(TICK_NUM, PERIOD))
+
+bench('legacy mean', lambda: legacy_mean(closeprice))
+bench('MA addMany', lambda: MA(PERIOD).addMany(data))
+bench('MA compute', lambda: MA(PERIOD).compute(data))
+
+old_std = bench('legacy pstdev', lambda: legacy_pstdev(closeprice))
+bench('legacy sum of pow', lambda: legacy_sum_of_pow(closeprice))
+bench('STD addMany', lambda: STD(PERIOD).addMany(data))
+new_std = bench('STD compute', lambda: STD(PERIOD).compute(data))
+bench('FastSTD addMany', lambda: FastSTD(PERIOD).addMany(data))
+
+bench('BBands compute', lambda: BBands(PERIOD).compute(data))
+bench('KDJ compute', lambda: KDJ(PERIOD).compute(data))
+bench('Volatility compute', lambda: Volatility(PERIOD).compute(data))
+
+bench('legacy max', lambda: legacy_max(closeprice, PERIOD))
+bench('MAX compute', lambda: MAX(PERIOD).compute(data))
+old_max = bench('legacy max, long period', lambda: legacy_max(
+    closeprice, LONG_PERIOD
+))
+new_max = bench('MAX compute, long period', lambda: MAX(
+    LONG_PERIOD
+).compute(data))
+assert new_max.getAllData()['max'] == old_max
+
+bench('legacy rsrs', lambda: legacy_rsrs(
+    [r[2] for r in rows], [r[3] for r in rows], PERIOD
+))
+bench('RSRS addMany', lambda: RSRS(PERIOD).addMany(data))
+bench('RSRS compute', lambda: RSRS(PERIOD).compute(data))
+
+# the drift of std, on prices with a large level and small changes
+shifted = [v + 1e6 for v in closeprice]
+exact = legacy_pstdev(shifted)
+print('max relative error of std:')
+for name, values in (
+        ('legacy sum of pow', legacy_sum_of_pow(shifted)),
+        ('STD', STD(PERIOD).compute(DataStruct.fromColumns({
+            'time': data.index(), 'closeprice': shifted,
+        }, 'time')).getAllData()['std']),
+):
+    print('{:<32}{:>14.3e}'.format(name, max(
+        abs(a - b) / b for a, b in zip(values, exact) if b > 0
+    )))
+
+assert max(
+    abs(a - b) for a, b in zip(new_std.getAllData()['std'], old_std)
+) < 1e-9
@@ -1,3 +1,5 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 from TorchTSA.model import ARMAGARCHModel
 
@@ -21,7 +23,12 @@ print(
     arma_garch_model.getConst(), arma_garch_model.getMu()
 )
 
-arma_garch = ARMAGARCH().addMany(market).getAllData()
+# fit all windows at once in processes, and keep the params in cache,
+# so the second run loads them
+with ProcessPoolExecutor() as executor:
+    arma_garch = ARMAGARCH(
+        _executor=executor, _cache=fetcher.cache, _cache_key='rb'
+    ).compute(market).getAllData()
 mean_arr = np.array(arma_garch['mean'])
 std_arr = np.array(arma_garch['std'])
 print(arma_garch)
@@ -0,0 +1,44 @@
+import statistics
+from collections import deque
+
+import numpy as np
+
+from ParadoxTrading.Indicator import STD, FastSTD, SharpRate, Skewness
+from ParadoxTrading.Utils import DataStruct
+
+# the price is flat for more than a window, eg. a limit-locked contract,
+# the windows of the same values must have exactly 0 std, like statistics
+
+period = 20
+random = np.random.RandomState(0)
+price = (100 * np.exp(np.cumsum(random.normal(0, 0.01, 37)))).tolist()
+price += [price[-1]] * 40
+data = DataStruct.fromColumns({
+    'time': list(range(len(price))),
+    'closeprice': price,
+}, 'time')
+
+# SharpRate skips the windows of 0 std
+buf = deque(maxlen=period)
+index, sharp_rate = [], []
+for i, (last, cur) in enumerate(zip(price, price[1:])):
+    buf.append(cur / last - 1)
+    std = statistics.pstdev(buf)
+    if std != 0:
+        index.append(i + 1)
+        sharp_rate.append(statistics.mean(buf) / std)
+
+ret = SharpRate(period).addMany(data).getAllData()
+assert ret.index() == index, (len(ret), len(index))
+assert np.allclose(ret['sharprate'], sharp_rate)
+print('SharpRate ok', len(ret))
+
+for cls in (STD, FastSTD):
+    ret = cls(period).addMany(data).getAllData()
+    assert all(v == 0 for v in ret['std'][-(40 - period + 1):])
+    print(cls.__name__, 'ok')
+
+ret = Skewness(period).addMany(data).getAllData()
+skewness = ret['skewness'][-(40 - period + 1):]
+assert all(v != v for v in skewness)  # nan
+print('Skewness ok')
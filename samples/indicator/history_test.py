@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+from ParadoxTrading.Indicator import ATR, BIAS, CCI, EFF, EMA, GARCH, KDJ, \
+    MA, MACD, MAX, MIN, RSI, RSRS, SAR, STD, AdaBBands, AdaKalman, BBands, \
+    Diff, FastBBands, FastMA, FastSTD, FastVolatility, Kalman, Kurtosis, \
+    LogReturn, Plunge, ReturnRate, SharpRate, SimMA, Skewness, Volatility, \
+    ZigZag
+from ParadoxTrading.Utils import DataStruct
+
+# setHistory(1) only bounds the rows kept, the last row must be the same
+# as the one of an unbounded run, whatever state the indicator keeps
+
+num = 600
+random = np.random.RandomState(0)
+close = 100 * np.exp(np.cumsum(random.normal(0, 0.01, num)))
+data = DataStruct.fromColumns({
+    'time': list(range(num)),
+    'closeprice': close.tolist(),
+    'highprice': (close * (1 + random.uniform(0, 0.01, num))).tolist(),
+    'lowprice': (close * (1 - random.uniform(0, 0.01, num))).tolist(),
+}, 'time')
+
+creators = [
+    lambda: ATR(20),
+    lambda: AdaBBands(10, 'closeprice'),
+    lambda: AdaKalman(),
+    lambda: BBands(20),
+    lambda: BIAS(20),
+    lambda: CCI(20),
+    lambda: Diff('closeprice'),
+    lambda: EFF(20),
+    lambda: EMA(20),
+    lambda: FastBBands(20),
+    lambda: FastMA(20),
+    lambda: FastSTD(20),
+    lambda: FastVolatility(20, _smooth=5),
+    lambda: GARCH(_fit_period=100, _fit_begin=200),
+    lambda: KDJ(),
+    lambda: Kalman(),
+    lambda: Kurtosis(20),
+    lambda: LogReturn(),
+    lambda: MA(20),
+    lambda: MACD(),
+    lambda: MAX(20),
+    lambda: MIN(20),
+    lambda: Plunge(),
+    lambda: RSI(20),
+    lambda: RSRS(),
+    lambda: ReturnRate(_smooth_period=5),
+    lambda: SAR(),
+    lambda: STD(20),
+    lambda: SharpRate(20),
+    lambda: SimMA(20),
+    lambda: Skewness(20),
+    lambda: Volatility(20, _smooth=5),
+    lambda: ZigZag(0.02),
+]
+
+
+def same(_a, _b) -> bool:
+    if _a is None or _b is None:
+        return _a is _b
+    if isinstance(_a, float) and math.isnan(_a):
+        return isinstance(_b, float) and math.isnan(_b)
+    return _a == _b
+
+
+for creator in creators:
+    full = creator()
+    bounded = creator().setHistory(1)
+    for row in data.iterRows():
+        full.addOne(row)
+        bounded.addOne(row)
+        name = full.__class__.__name__
+        assert len(bounded.getAllData()) <= 1, name
+        if len(full.getAllData()):
+            last = full.getAllData().toDict(-1)
+            for k, v in bounded.getAllData().toDict(0).items():
+                assert same(v, last[k]), (name, k, v, last[k])
+    print(full.__class__.__name__, 'ok')
@@ -36,5 +36,6 @@ setup(
     extras_require={
         'CTP': ['PyCTP'],
         'TSA': ['TorchTSA'],
+        'Arrow': ['pyarrow'],
     },
 )